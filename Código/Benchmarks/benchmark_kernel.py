@@ -0,0 +1,103 @@
+import csv
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.kernel import actualizar_enjambre, actualizar_mejores, expandir
+
+# --- Microbenchmark del paso de PSO: versión anterior (arreglos nuevos en cada iteración)
+# contra el kernel con buffers reutilizados. No incluye la función objetivo, que es la
+# misma en los dos casos: los puntajes son fijos para medir solo la actualización.
+
+dimensiones = 5
+w, c1, c2 = 0.7, 1.5, 1.5
+limites_inf = np.array([78, 33, 27, 27, 27], dtype=float)
+limites_sup = np.array([102, 45, 45, 45, 45], dtype=float)
+
+# --- Paso como estaba en ejecutar_pso
+def paso_antes(estado, rng):
+    posiciones, velocidades, mejor_personal, puntajes_personales, mejor_global, puntaje_global, puntajes = estado
+    num_particulas = len(posiciones)
+    r1 = rng.random((num_particulas, dimensiones))
+    r2 = rng.random((num_particulas, dimensiones))
+    velocidades = w * velocidades + c1 * r1 * (mejor_personal - posiciones) + c2 * r2 * (mejor_global - posiciones)
+    posiciones += velocidades
+    for d in range(dimensiones):
+        posiciones[:, d] = np.clip(posiciones[:, d], limites_inf[d], limites_sup[d])
+
+    mejora = puntajes < puntajes_personales
+    mejor_personal[mejora] = posiciones[mejora]
+    puntajes_personales[mejora] = puntajes[mejora]
+    if np.min(puntajes) < puntaje_global[0]:
+        estado[4] = posiciones[np.argmin(puntajes)]
+        puntaje_global[0] = np.min(puntajes)
+    estado[1] = velocidades
+
+# --- Paso con el kernel (pso_paralelo/kernel.py), con los límites y el mejor global
+# expandidos a la forma del enjambre como en ejecutar_pso
+def paso_despues(estado, rng, buffers):
+    posiciones, velocidades, mejor_personal, puntajes_personales, mejor_global, puntaje_global, puntajes = estado
+    r1, r2, temporal, mejora, inferior, superior, atractor = buffers
+    rng.random(out=r1)
+    rng.random(out=r2)
+    actualizar_enjambre(posiciones, velocidades, mejor_personal, atractor, w, c1, c2, r1, r2, temporal, inferior, superior)
+    actualizar_mejores(posiciones, puntajes, mejor_personal, puntajes_personales, mejora)
+    mejor = np.argmin(puntajes)
+    if puntajes[mejor] < puntaje_global[0]:
+        mejor_global[:] = posiciones[mejor]
+        atractor[:] = mejor_global
+        puntaje_global[0] = puntajes[mejor]
+
+def nuevo_estado(num_particulas, rng):
+    posiciones = rng.uniform(limites_inf, limites_sup, (num_particulas, dimensiones))
+    return [posiciones, rng.uniform(-1, 1, posiciones.shape), posiciones.copy(),
+            np.full(num_particulas, np.inf), posiciones[0].copy(), np.array([np.inf]), rng.random(num_particulas)]
+
+# Tiempo medio por iteración (s) y memoria extra pico reservada en una iteración (bytes)
+def medir(paso, num_particulas, iteraciones):
+    rng = np.random.default_rng(0)
+    estado = nuevo_estado(num_particulas, rng)
+    forma = (num_particulas, dimensiones)
+    if paso is paso_antes:
+        argumentos = (estado, rng)
+    else:
+        buffers = (np.empty(forma), np.empty(forma), np.empty(forma), np.empty(num_particulas, dtype=bool),
+                   expandir(limites_inf, forma), expandir(limites_sup, forma), expandir(estado[4], forma))
+        argumentos = (estado, rng, buffers)
+
+    for _ in range(10):
+        paso(*argumentos)
+    t0 = time.perf_counter()
+    for _ in range(iteraciones):
+        paso(*argumentos)
+    tiempo = (time.perf_counter() - t0) / iteraciones
+
+    tracemalloc.start()
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    paso(*argumentos)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tiempo, pico - actual
+
+if __name__ == "__main__":
+    filas = []
+    print(f"{'Partículas':>10} {'Antes (µs/it)':>14} {'Después (µs/it)':>16} {'Aceleración':>11} {'Antes (KB/it)':>14} {'Después (KB/it)':>16}")
+    for num_particulas in [10, 100, 1000, 10000]:
+        iteraciones = max(50, 200000 // num_particulas)
+        t_antes, m_antes = medir(paso_antes, num_particulas, iteraciones)
+        t_despues, m_despues = medir(paso_despues, num_particulas, iteraciones)
+        filas.append([num_particulas, t_antes, t_despues, m_antes, m_despues])
+        print(f"{num_particulas:>10} {t_antes * 1e6:>14.1f} {t_despues * 1e6:>16.1f} {t_antes / t_despues:>10.2f}x "
+              f"{m_antes / 1024:>14.1f} {m_despues / 1024:>16.1f}")
+
+    nombre_csv = "benchmark_kernel.csv"
+    with open(nombre_csv, mode='w', newline='') as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow(["num_particulas", "tiempo_antes", "tiempo_despues", "memoria_antes", "memoria_despues"])
+        writer.writerows(filas)
+    print(f"\nResultados guardados en: {nombre_csv}")
@@ -0,0 +1,223 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+# --- Escalamiento de los scripts de grid y random search
+#
+# Corre un mismo script con varios números de procesos, todos con la misma semilla y sin
+# caché de ensayos (los scripts solo la usan con --cache).
+#
+#   fuerte  el mismo trabajo con cada número de procesos
+#   debil   el trabajo crece con los procesos: `por_proceso` combinaciones por proceso
+#           (--combinaciones en grid, repartidas por la grilla, que pone el tope;
+#           --muestras en random, --ensayos en tpe)
+#
+# halving, tpe y racing (solo función 3) se comparan en fuerte; no tienen backend numba.
+#
+# La columna trabajo es el que hizo de verdad cada corrida: las evaluaciones de la función
+# objetivo que informa el script (con la grilla topada o con parada temprana no es
+# proporcional a los procesos). El speed-up escalado se calcula con ella.
+#
+# Antes de medir hace corridas de
+# calentamiento (calibran el modelo de costos y cargan los módulos en memoria) y después
+# `repeticiones` rondas; en cada ronda pasa por todos los números de procesos, así una
+# deriva de la máquina afecta a todos por igual.
+#
+#   tiempo        el que mide el script (solo la búsqueda paralela)
+#   tiempo_pared  perf_counter alrededor del proceso completo (arranque, modelo de
+#                 costos, fusión de registros)
+#
+# El CSV que deja tiene una fila por corrida y las columnas de los CSV de resultados (más
+# modo y trabajo), así se grafica directamente con Gráficas/graficas.py, que ajusta Amdahl
+# (fuerte) o Gustafson (débil). Junto a él queda un .json con los
+# datos de la máquina.
+
+CODIGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SCRIPTS = {
+    ("basica", "grid"): "Funcion sin restricciones/grid_basic.py",
+    ("basica", "random"): "Funcion sin restricciones/random_basic.py",
+    ("funcion1", "grid"): "Función 1 Restricciones/grid_restriccion_funcion1.py",
+    ("funcion1", "random"): "Función 1 Restricciones/random_restriccion_funcion1.py",
+    ("funcion2", "grid"): "Función 2 Restricciones/grid_restriccion_funcion2.py",
+    ("funcion2", "random"): "Función 2 Restricciones/random_restriccion_funcion2.py",
+    ("funcion3", "grid"): "Función 3 Restricciones/grid_restriccion_funcion3.py",
+    ("funcion3", "random"): "Función 3 Restricciones/random_restriccion_funcion3.py",
+    ("funcion3", "halving"): "Función 3 Restricciones/halving_restriccion_funcion3.py",
+    ("funcion3", "tpe"): "Función 3 Restricciones/tpe_restriccion_funcion3.py",
+    ("funcion3", "racing"): "Función 3 Restricciones/racing_restriccion_funcion3.py",
+}
+
+# Opción de cada búsqueda que fija cuánto trabajo hace (modo débil)
+OPCION_TRABAJO = {"grid": "--combinaciones", "random": "--muestras", "tpe": "--ensayos"}
+
+VARIABLES_BLAS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+def modelo_cpu():
+    try:
+        with open("/proc/cpuinfo") as archivo:
+            for linea in archivo:
+                if linea.startswith("model name"):
+                    return linea.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def datos_maquina(entorno):
+    datos = {
+        "cpu": modelo_cpu(),
+        "nucleos": os.cpu_count(),
+        "nucleos_disponibles": len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count(),
+        "hilos_blas": {v: entorno.get(v) for v in VARIABLES_BLAS},
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sistema": platform.platform(),
+    }
+    try:
+        blas = np.show_config(mode="dicts")["Build Dependencies"]["blas"]
+        datos["blas"] = f"{blas.get('name')} {blas.get('version')}"
+    except Exception:
+        datos["blas"] = None
+    return datos
+
+# --- Una corrida del script; devuelve la fila que agregó a su CSV y el tiempo de pared
+def correr(script, num_procesos, semilla, carpeta, entorno, mpirun=None, extra=(), backend="numpy"):
+    salida_csv = os.path.join(carpeta, "corrida.csv")
+    if os.path.exists(salida_csv):
+        os.remove(salida_csv)
+
+    comando = [sys.executable, script, "--semilla", str(semilla), "--procesos", str(num_procesos), "--csv", salida_csv, *extra]
+    if backend != "numpy":
+        comando += ["--backend", backend]
+    if mpirun:
+        comando = shlex.split(mpirun) + ["-n", str(num_procesos)] + comando
+
+    t0 = time.perf_counter()
+    proceso = subprocess.run(comando, cwd=carpeta, env=entorno, capture_output=True, text=True)
+    tiempo_pared = time.perf_counter() - t0
+    if proceso.returncode != 0 or not os.path.exists(salida_csv):
+        print(proceso.stdout[-2000:], proceso.stderr[-2000:], sep="\n")
+        raise RuntimeError(f"Falló la corrida con {num_procesos} procesos: {' '.join(comando)}")
+
+    with open(salida_csv, newline="") as archivo:
+        fila = list(csv.DictReader(archivo))[-1]
+    return fila, tiempo_pared
+
+def resumir(filas, columna, modo="fuerte"):
+    tiempos = {}
+    trabajos = {}
+    for fila in filas:
+        tiempos.setdefault(fila["num_procesos"], []).append(float(fila[columna]))
+        if modo == "debil":
+            # Sin evaluaciones informadas (CSV de versiones anteriores) se supone proporcional a los procesos
+            trabajo = float(fila["trabajo"]) if fila["trabajo"] != "" else fila["num_procesos"]
+            trabajos.setdefault(fila["num_procesos"], []).append(trabajo)
+
+    base = min(tiempos)
+    t_base = statistics.median(tiempos[base])
+    w_base = statistics.median(trabajos[base]) if modo == "debil" else None
+    print(f"{'Procesos':>8} {'Mediana (s)':>12} {'Mín (s)':>9} {'Máx (s)':>9} {'IQR (s)':>9} {'Speed-up':>9} {'Eficiencia':>10}")
+    for n in sorted(tiempos):
+        valores = tiempos[n]
+        mediana = statistics.median(valores)
+        q1, q3 = np.percentile(valores, [25, 75])
+        # Sin corrida con un proceso el speed-up se toma respecto al menor número medido.
+        # En débil es el escalado: el trabajo hecho (relativo al de la base) en el tiempo medido
+        escala = 1.0 if modo == "fuerte" else statistics.median(trabajos[n]) / w_base
+        speed_up = base * escala * t_base / mediana
+        print(f"{n:>8} {mediana:>12.3f} {min(valores):>9.3f} {max(valores):>9.3f} {q3 - q1:>9.3f} {speed_up:>9.2f} {speed_up / n:>10.2f}")
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Escalamiento fuerte o débil de un script de búsqueda")
+    argumentos.add_argument("--funcion", choices=["basica", "funcion1", "funcion2", "funcion3"], default="funcion3")
+    argumentos.add_argument("--busqueda", choices=["grid", "random", "halving", "tpe", "racing"], default="grid")
+    argumentos.add_argument("--modo", choices=["fuerte", "debil"], default="fuerte")
+    argumentos.add_argument("--por-proceso", type=int, default=50, help="combinaciones por proceso en modo débil")
+    argumentos.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 6])
+    argumentos.add_argument("--repeticiones", type=int, default=5)
+    argumentos.add_argument("--calentamiento", type=int, default=1, help="corridas sin medir antes de empezar")
+    argumentos.add_argument("--semilla", type=int, default=12345)
+    argumentos.add_argument("--backend", choices=["numpy", "numba"], default="numpy", help="backend de PSO de los scripts")
+    argumentos.add_argument("--hilos-blas", type=int, default=1, help="hilos de BLAS/OpenMP por proceso (0 = no tocar el entorno)")
+    argumentos.add_argument("--mpirun", default=None, help='lanzar con MPI, por ejemplo "mpirun --oversubscribe"')
+    argumentos.add_argument("--carpeta", default=None, help="carpeta de trabajo de las corridas")
+    args = argumentos.parse_args()
+    if (args.funcion, args.busqueda) not in SCRIPTS:
+        argumentos.error(f"no hay script de {args.busqueda} para {args.funcion}")
+    if args.modo == "debil" and args.busqueda not in OPCION_TRABAJO:
+        argumentos.error(f"el modo débil necesita {', '.join(OPCION_TRABAJO)}")
+    if (args.backend != "numpy" or args.mpirun) and args.busqueda not in ("grid", "random"):
+        argumentos.error("el backend numba y MPI son solo para grid y random")
+
+    script = os.path.abspath(os.path.join(CODIGO, SCRIPTS[(args.funcion, args.busqueda)]))
+    nombre = f"escalamiento_{args.modo}_{args.funcion}_{args.busqueda}"
+    carpeta = os.path.abspath(args.carpeta or f"{nombre}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(carpeta, exist_ok=True)
+
+    # Los procesos de la búsqueda ya reparten el trabajo: un hilo de BLAS por proceso
+    # evita sobresuscribir los núcleos
+    entorno = dict(os.environ)
+    if args.hilos_blas > 0:
+        for variable in VARIABLES_BLAS:
+            entorno[variable] = str(args.hilos_blas)
+
+    meta = datos_maquina(entorno)
+    meta.update({"script": SCRIPTS[(args.funcion, args.busqueda)], "procesos": args.procesos, "repeticiones": args.repeticiones,
+                 "calentamiento": args.calentamiento, "modo": args.modo, "backend": args.backend,
+                 "por_proceso": args.por_proceso if args.modo == "debil" else None, "semilla": args.semilla, "mpirun": args.mpirun,
+                 "fecha": datetime.now().isoformat(timespec="seconds")})
+    with open(os.path.join(carpeta, f"{nombre}.json"), "w") as archivo:
+        json.dump(meta, archivo, indent=2, ensure_ascii=False)
+    print(f"{meta['cpu']} ({meta['nucleos_disponibles']} de {meta['nucleos']} núcleos disponibles), BLAS: {meta['blas']}")
+
+    # Argumentos extra del script para cada número de procesos
+    def trabajo(num_procesos):
+        if args.modo == "fuerte":
+            return ()
+        return (OPCION_TRABAJO[args.busqueda], str(args.por_proceso * num_procesos))
+
+    for k in range(args.calentamiento):
+        print(f"Calentamiento {k + 1}/{args.calentamiento} con {args.procesos[0]} procesos...")
+        correr(script, args.procesos[0], args.semilla, carpeta, entorno, args.mpirun, trabajo(args.procesos[0]), args.backend)
+
+    filas = []
+    for repeticion in range(args.repeticiones):
+        for num_procesos in args.procesos:
+            fila, tiempo_pared = correr(script, num_procesos, args.semilla, carpeta, entorno, args.mpirun, trabajo(num_procesos), args.backend)
+            fila = {"num_procesos": num_procesos, "tiempo": float(fila["tiempo"]), "tiempo_pared": round(tiempo_pared, 4),
+                    "repeticion": repeticion, "semilla": args.semilla, "modo": args.modo, "backend": args.backend,
+                    "trabajo": fila.get("evaluaciones") or "",
+                    **{c: v for c, v in fila.items() if c not in ("num_procesos", "tiempo")}}
+            filas.append(fila)
+            print(f"[{repeticion + 1}/{args.repeticiones}] {num_procesos} procesos: {fila['tiempo']:.3f} s "
+                  f"(pared {tiempo_pared:.3f} s), puntaje {fila['puntaje']}")
+
+    # En fuerte todas las corridas hacen el mismo trabajo: el mejor puntaje tiene que coincidir
+    if args.modo == "fuerte" and len({fila["puntaje"] for fila in filas}) > 1:
+        print("Atención: el mejor puntaje cambió entre corridas")
+
+    for temporal in ("corrida.csv", "corrida_fases.csv"):
+        if os.path.exists(os.path.join(carpeta, temporal)):
+            os.remove(os.path.join(carpeta, temporal))
+    nombre_csv = os.path.join(carpeta, f"{nombre}.csv")
+    with open(nombre_csv, mode="w", newline="") as archivo:
+        writer = csv.DictWriter(archivo, fieldnames=list(filas[0]))
+        writer.writeheader()
+        writer.writerows(filas)
+
+    print("\nTiempo de búsqueda:")
+    resumir(filas, "tiempo", args.modo)
+    print("\nTiempo de pared (proceso completo):")
+    resumir(filas, "tiempo_pared", args.modo)
+    print(f"\nResultados guardados en: {nombre_csv}")
+    print(f"Para graficar: python Gráficas/graficas.py {nombre_csv}")
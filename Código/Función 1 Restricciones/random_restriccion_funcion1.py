@@ -1,10 +1,28 @@
-from multiprocessing import Process, Lock, Value, Manager
+from multiprocessing import Process, Lock, Value
 import numpy as np
+import argparse
 import time
 import itertools
 import random
 import csv
+from datetime import datetime
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.motor import ejecutar_pso_multiconfig
+from pso_paralelo.planificador import ColaTareas
+from pso_paralelo.costos import obtener_modelo_costos
+from pso_paralelo.tablero import TableroMejor
+from pso_paralelo.registro import RegistroEnsayos, fusionar_registros, extender_csv
+from pso_paralelo.parada import CriteriosParada
+from pso_paralelo.semillas import semilla_raiz, generador_parametros, generadores_parametros
+from pso_paralelo.kernel import actualizar_enjambre, actualizar_mejores, expandir
+from pso_paralelo.jit import compilar, ejecutar_pso_jit, preparar_backend
+from pso_paralelo.mpi import comunicador, ColaMPI, TableroMPI, correr_rango, terminar_rango
+from pso_paralelo.punto_control import PuntoControl, leer_semilla
+from pso_paralelo.cache import CacheEnsayos, identificador_objetivo
+from pso_paralelo.fases import TiemposFases, FasesProceso
 
 # --- Función objetivo de dos variables
 def funcion_objetivo_con_restriccion(x, r=1e5):
@@ -19,64 +37,158 @@ def funcion_objetivo_con_restriccion(x, r=1e5):
     penalizacion = r * (h1**2 + h2**2)
     return f + penalizacion
 
+# --- Versión por lotes: recibe (num_particulas, dimensiones) y devuelve (num_particulas,)
+def funcion_objetivo_con_restriccion_lote(posiciones, r=1e5):
+    x = posiciones.T
+    f = 1000 - x[0]**2 - 2*x[1]**2 - x[2]**2 - x[0]*x[1] - x[0]*x[2]
+    h1 = x[0]**2 + x[1]**2 + x[2]**2 - 25
+    h2 = 8*x[0] + 14*x[1] + 7*x[2] - 56
+    penalizacion = r * (h1**2 + h2**2)
+    return f + penalizacion
+
+funcion_objetivo_con_restriccion.lote = funcion_objetivo_con_restriccion_lote
+# Versión compilada para el backend Numba (None si Numba no está instalado)
+funcion_objetivo_con_restriccion.jit = compilar(funcion_objetivo_con_restriccion)
+
 # --- Algoritmo PSO
-def ejecutar_pso(funcion, limite_inferior, limite_superior, dimensiones, parametros, max_iteraciones=50):
+def ejecutar_pso(funcion, limite_inferior, limite_superior, dimensiones, parametros, max_iteraciones=50, parada=None, rng=None, backend="numpy"):
+    # Backend Numba: todo el ciclo compilado junto con la función objetivo (ver pso_paralelo/jit.py)
+    if backend == "numba" and getattr(funcion, "jit", None) is not None:
+        return ejecutar_pso_jit(funcion.jit, limite_inferior, limite_superior, dimensiones, parametros, max_iteraciones, parada, rng)
+
     num_particulas, w, c1, c2 = parametros
     num_particulas = int(num_particulas)
 
-    posiciones = np.random.uniform(limite_inferior, limite_superior, (num_particulas, dimensiones))
-    velocidades = np.random.uniform(-1, 1, (num_particulas, dimensiones))
+    # Usa la versión por lotes de la función si existe
+    evaluar = getattr(funcion, "lote", None)
+    if evaluar is None:
+        evaluar = lambda X: np.array([funcion(p) for p in X])
+
+    # Generador propio del ensayo (ver pso_paralelo/semillas.py)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    posiciones = rng.uniform(limite_inferior, limite_superior, (num_particulas, dimensiones))
+    velocidades = rng.uniform(-1, 1, (num_particulas, dimensiones))
 
     mejor_personal = posiciones.copy()
-    puntajes_personales = np.array([funcion(p) for p in posiciones])
-    mejor_global = mejor_personal[np.argmin(puntajes_personales)]
+    puntajes_personales = evaluar(posiciones)
+    # Copia: si fuera una vista, mejor_global cambiaría al moverse las partículas
+    mejor_global = mejor_personal[np.argmin(puntajes_personales)].copy()
     puntaje_global = np.min(puntajes_personales)
 
-    for _ in range(max_iteraciones):
-        r1 = np.random.rand(num_particulas, dimensiones)
-        r2 = np.random.rand(num_particulas, dimensiones)
+    # Buffers que se reutilizan en todas las iteraciones (ver pso_paralelo/kernel.py)
+    r1 = np.empty((num_particulas, dimensiones))
+    r2 = np.empty((num_particulas, dimensiones))
+    temporal = np.empty((num_particulas, dimensiones))
+    mejora = np.empty(num_particulas, dtype=bool)
+    # Límites y mejor global con la forma del enjambre, así el paso no reserva memoria
+    inferior = expandir(limite_inferior, (num_particulas, dimensiones))
+    superior = expandir(limite_superior, (num_particulas, dimensiones))
+    atractor = expandir(mejor_global, (num_particulas, dimensiones))
+
+    # Parada temprana opcional (ver pso_paralelo/parada.py)
+    seguimiento = parada.seguimiento(np.array([puntaje_global])) if parada is not None else None
+    motivo = "max_iteraciones"
+    iteraciones = 0
 
-        velocidades = w * velocidades + c1 * r1 * (mejor_personal - posiciones) + c2 * r2 * (mejor_global - posiciones)
-        posiciones += velocidades
-        posiciones = np.clip(posiciones, limite_inferior, limite_superior)
+    for iteraciones in range(1, max_iteraciones + 1):
+        rng.random(out=r1)
+        rng.random(out=r2)
+        actualizar_enjambre(posiciones, velocidades, mejor_personal, atractor, w, c1, c2, r1, r2, temporal, inferior, superior)
 
-        nuevos_puntajes = np.array([funcion(p) for p in posiciones])
-        mejora = nuevos_puntajes < puntajes_personales
-        mejor_personal[mejora] = posiciones[mejora]
-        puntajes_personales[mejora] = nuevos_puntajes[mejora]
+        nuevos_puntajes = evaluar(posiciones)
+        actualizar_mejores(posiciones, nuevos_puntajes, mejor_personal, puntajes_personales, mejora)
 
-        if np.min(nuevos_puntajes) < puntaje_global:
-            mejor_global = posiciones[np.argmin(nuevos_puntajes)]
-            puntaje_global = np.min(nuevos_puntajes)
+        mejor = np.argmin(nuevos_puntajes)
+        if nuevos_puntajes[mejor] < puntaje_global:
+            mejor_global[:] = posiciones[mejor]
+            atractor[:] = mejor_global
+            puntaje_global = nuevos_puntajes[mejor]
 
-    return puntaje_global, mejor_global
+        if seguimiento is not None:
+            motivo_parada = seguimiento.revisar(np.array([puntaje_global]), posiciones[None])[0]
+            if motivo_parada:
+                motivo = motivo_parada
+                break
+
+    return puntaje_global, mejor_global, motivo, iteraciones
 
 # --- Función que corre en cada proceso
-def busqueda_aleatoria(lock, id_proceso, combinaciones, mejor_puntaje, mejores_parametros, mejor_solucion, dimensiones, limites, contador):
-    print(f"[Proceso {id_proceso}] Evaluando {len(combinaciones)} combinaciones aleatorias...")
+def busqueda_aleatoria(lock, id_proceso, cola, tablero, dimensiones, limites, contador, carpeta_ensayos, semilla, parada=None, motor="multiconfig", backend="numpy", control=None, fases=None):
+    print(f"[Proceso {id_proceso}] Tomando combinaciones de la cola...")
     resultados = []
+    registro = RegistroEnsayos(carpeta_ensayos, id_proceso)
+    max_iteraciones = 50
+    iteraciones_usadas = 0
+
+    # Tiempos por fase (ver pso_paralelo/fases.py): la función objetivo va cronometrada
+    medidor = FasesProceso(fases, id_proceso)
+    objetivo_lote = medidor.cronometrar(funcion_objetivo_con_restriccion_lote)
+    objetivo = medidor.cronometrar(funcion_objetivo_con_restriccion)
+
+    # Toma bloques de la cola compartida hasta que se vacía
+    for indices, combinaciones in cola.bloques(id_proceso):
+        medidor.tomar_bloque()
+        if motor == "multiconfig":
+            # Todas las combinaciones del bloque avanzan juntas como un solo tensor
+            try:
+                # Punto de control: el bloque sigue desde su estado guardado (si lo hay) y lo va guardando
+                reanudacion = control.bloque(id_proceso, indices) if control is not None else {}
+                t0 = time.perf_counter()
+                puntajes, soluciones, motivos, iteraciones = ejecutar_pso_multiconfig(objetivo_lote, limites[0][0], limites[0][1], dimensiones, combinaciones, max_iteraciones=max_iteraciones, parada=parada, generadores=generadores_parametros(semilla, combinaciones), **reanudacion)
+                duracion = time.perf_counter() - t0
+                resultados.extend(zip(puntajes, combinaciones, soluciones, indices))
+
+                # El bloque corre como un solo tensor: su tiempo se reparte según las evaluaciones de cada combinación
+                evaluaciones = [int(params[0]) * (it + 1) for params, it in zip(combinaciones, iteraciones)]
+                medidor.bloque(indices, combinaciones, t0, duracion, sum(evaluaciones), int(np.sum(iteraciones)))
+                for indice, params, puntaje, solucion, ev, it, motivo in zip(indices, combinaciones, puntajes, soluciones, evaluaciones, iteraciones, motivos):
+                    registro.agregar(indice, params, puntaje, solucion, duracion * ev / sum(evaluaciones), ev, it, motivo)
+                iteraciones_usadas += int(np.sum(iteraciones))
+            except Exception as e:
+                print(f"[Proceso {id_proceso}] Error en el motor multiconfiguración: {e}")
+        else:
+            for indice, params in zip(indices, combinaciones):
+                try:
+                    t0 = time.perf_counter()
+                    score, solucion, motivo, it = ejecutar_pso(objetivo, limites[0][0], limites[0][1], dimensiones, params, max_iteraciones, parada, generador_parametros(semilla, params), backend)
+                    duracion = time.perf_counter() - t0
+                    medidor.ensayo(indice, params, t0, duracion, int(params[0]) * (it + 1), it)
+                    registro.agregar(indice, params, score, solucion, duracion, int(params[0]) * (it + 1), it, motivo)
+                    iteraciones_usadas += it
+                    resultados.append((score, params, solucion, indice))
+                except Exception as e:
+                    print(f"[Proceso {id_proceso}] Error con parámetros {params}: {e}")
 
-    for params in combinaciones:
-        try:
-            score, solucion = ejecutar_pso(funcion_objetivo_con_restriccion, limites[0][0], limites[0][1], dimensiones, params)
-            resultados.append((score, params, solucion))
-        except Exception as e:
-            print(f"[Proceso {id_proceso}] Error con parámetros {params}: {e}")
+    registro.cerrar()
+    if control is not None:
+        control.terminar(id_proceso)
 
     if resultados:
-        mejor_local = min(resultados, key=lambda x: x[0])
-        with lock:
+        # Empates: el de menor índice, igual que el tablero
+        mejor_local = min(resultados, key=lambda x: (x[0], x[3]))
+        medidor.publicar(tablero, *mejor_local)
+        uso = iteraciones_usadas / (len(resultados) * max_iteraciones)
+        with medidor.candado(lock):
             contador.value += 1
-            print(f"[Proceso {id_proceso}] Finalizado. Procesos terminados: {contador.value}")
-            if mejor_local[0] < mejor_puntaje.value:
-                mejor_puntaje.value = mejor_local[0]
-                for i in range(len(mejores_parametros)):
-                    mejores_parametros[i] = str(mejor_local[1][i])
-                for i in range(dimensiones):
-                    mejor_solucion[i] = mejor_local[2][i]
+            print(f"[Proceso {id_proceso}] Finalizado ({len(resultados)} combinaciones, {uso:.0%} de las iteraciones). Procesos terminados: {contador.value}")
+    medidor.cerrar()
 
 # --- Programa principal
 if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser()
+    argumentos.add_argument("--reanudar", "--resume", metavar="CARPETA", help="carpeta de ensayos de una corrida interrumpida")
+    argumentos.add_argument("--semilla", type=int, default=None, help="semilla raíz (por defecto una nueva)")
+    argumentos.add_argument("--cache", action="store_true", help="reusar los ensayos guardados en cache_ensayos.sqlite (no sirve para medir tiempos)")
+    argumentos.add_argument("--procesos", type=int, default=8, help="número de procesos (con mpirun, el tamaño del comunicador)")
+    argumentos.add_argument("--csv", default="resultados_pso_randomsearch.csv", help="archivo CSV al que se agrega el resultado")
+    argumentos.add_argument("--backend", choices=["numpy", "numba"], default="numpy", help="numba: ciclo de PSO compilado (si Numba está instalado)")
+    argumentos.add_argument("--parada", action="store_true", help="parada temprana de cada ensayo (enjambre colapsado, estancamiento)")
+    argumentos.add_argument("--traza", metavar="ARCHIVO", help="guardar la línea de tiempo de la búsqueda (JSON de Chrome Trace, para Perfetto)")
+    argumentos.add_argument("--muestras", type=int, default=300, help="número de combinaciones aleatorias")
+    args = argumentos.parse_args()
+
     dimensiones = 3
     limites = [(0, 10)] * dimensiones  
 
@@ -96,51 +208,129 @@ if __name__ == "__main__":
         espacio_parametros['c2']
     ))
 
-    num_muestras = 300
-    combinaciones_aleatorias = random.sample(todas, min(num_muestras, len(todas)))
+    # --- Semilla raíz: fija la muestra y cada ensayo saca su propio generador de ella y de
+    # sus hiperparámetros, así el resultado no depende de num_procesos ni del reparto (None = semilla nueva)
+    semilla = semilla_raiz(args.semilla)
+    # Al reanudar, la misma de la corrida interrumpida (guardada en su carpeta)
+    if args.reanudar:
+        semilla = leer_semilla(args.reanudar)
+
+    # --- Con mpirun cada rango corre este programa y todos usan la semilla del rango 0
+    # (ver pso_paralelo/mpi.py); fuera de MPI comm es None
+    comm = comunicador()
+    if comm is not None:
+        semilla = comm.bcast(semilla, root=0)
+
+    num_muestras = args.muestras
+    combinaciones_aleatorias = random.Random(semilla).sample(todas, min(num_muestras, len(todas)))
+
+    num_procesos = args.procesos if comm is None else comm.size
 
-    num_procesos = 8
+    # --- Costo estimado de cada combinación con un modelo medido (se calibra una vez y se guarda)
+    # (con MPI lo calibra solo el rango 0, que es quien arma los bloques)
+    if comm is None or comm.rank == 0:
+        modelo_costos = obtener_modelo_costos(
+            "modelo_costos_funcion1.json",
+            lambda params, iteraciones: ejecutar_pso_multiconfig(funcion_objetivo_con_restriccion_lote, limites[0][0], limites[0][1], dimensiones, [params], max_iteraciones=iteraciones),
+            espacio_parametros['num_particulas'], 50)
+        costos = [modelo_costos.estimar(params, 50) for params in combinaciones_aleatorias]
+    else:
+        costos = None
 
-    combinaciones_con_peso = [(params, int(params[0]) ** 2) for params in combinaciones_aleatorias]
-    cargas = [[] for _ in range(num_procesos)]
-    pesos_cargas = [0 for _ in range(num_procesos)]
-    combinaciones_ordenadas = sorted(combinaciones_con_peso, key=lambda x: -x[1])
-    for combinacion, peso in combinaciones_ordenadas:
-        idx = pesos_cargas.index(min(pesos_cargas))
-        cargas[idx].append(combinacion)
-        pesos_cargas[idx] += peso
+    # --- Parada temprana (con --parada): enjambre colapsado o 10 iteraciones sin mejorar
+    # (sin la opción cada ensayo corre todas sus iteraciones)
+    parada = CriteriosParada(tol_diametro=1e-10, ventana_estancamiento=10, tol_estancamiento=1e-12) if args.parada else None
 
-    for i in range(num_procesos):
-        total_peso = sum(int(c[0]) for c in cargas[i])
-        print(f"Proceso {i}: {len(cargas[i])} combinaciones, peso total estimado: {total_peso}")
+    # --- Backend de ejecutar_pso (--backend): "numpy" o "numba" (ciclo compilado junto con la
+    # función objetivo; si Numba no está instalado se queda en numpy)
+    backend = preparar_backend(args.backend, funcion_objetivo_con_restriccion, dimensiones)
+
+    # "multiconfig" avanza cada bloque de la cola como un tensor; "secuencial" llama a ejecutar_pso por combinación
+    # (con el backend numba siempre se usa el secuencial)
+    motor = "multiconfig" if backend == "numpy" else "secuencial"
 
     # Variables compartidas entre procesos
     lock = Lock()
     procesos = []
-    mejor_puntaje = Value('d', float('inf'))
-    manager = Manager()
-    mejores_parametros = manager.list([""] * 4)
-    mejor_solucion = manager.list([0.0] * dimensiones)
+    tablero = TableroMejor(dimensiones) if comm is None else TableroMPI(comm, dimensiones)
     contador = Value('i', 0)
 
+    # --- Cada proceso registra todos sus ensayos en fragmentos .npz; al final se fusionan
+    carpeta_ensayos = args.reanudar or f"ensayos_pso_randomsearch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if comm is not None:
+        carpeta_ensayos = comm.bcast(carpeta_ensayos, root=0)
+
+    # --- Puntos de control: los fragmentos de ensayos y el estado de los bloques a medio
+    # correr quedan en la carpeta; al reanudar se saltan los ensayos terminados y el mejor
+    # global se reconstruye a partir de ellos (ver pso_paralelo/punto_control.py)
+    control = PuntoControl(carpeta_ensayos, semilla)
+    control.publicar_mejor(tablero)
+
+    # --- Caché de ensayos (con --cache, ver pso_paralelo/cache.py): con la misma semilla, una
+    # búsqueda repetida o extendida solo corre los ensayos que no están guardados. Los que
+    # salen de la caché no cuestan tiempo: la fila del CSV los cuenta en ensayos_cache
+    cache = CacheEnsayos("cache_ensayos.sqlite", identificador_objetivo(funcion_objetivo_con_restriccion_lote, [limites[0]] * dimensiones, parada, backend, motor), semilla, 50) if args.cache else None
+
+    # --- Cola compartida: los procesos toman bloques guiados por costo (cada vez más pequeños,
+    # de la combinación más cara a la más barata) hasta vaciarla
+    cola = ColaTareas(num_procesos) if comm is None else ColaMPI(comm)
+    grupos = control.pendientes(len(combinaciones_aleatorias))
+    if cache is not None:
+        grupos = cache.aplicar(combinaciones_aleatorias, grupos, tablero, carpeta_ensayos, num_procesos, escribir=comm is None or comm.rank == 0)
+    for grupo in grupos:
+        cola.encolar(combinaciones_aleatorias, costos, grupo)
+    cola.cerrar()
+
+    # Tiempos por fase de cada proceso (el arranque cuenta desde aquí) y, con --traza, sus eventos
+    fases = TiemposFases(num_procesos, carpeta_ensayos if args.traza else None)
+
     print("Iniciando búsqueda aleatoria de hiperparámetros con PSO en paralelo...\n")
     inicio = time.time()
 
-    for n in range(num_procesos):
-        p = Process(target=busqueda_aleatoria,
-                    args=(lock, n, list(cargas[n]), mejor_puntaje, mejores_parametros, mejor_solucion, dimensiones, limites, contador))
-        p.start()
-        procesos.append(p)
+    if comm is None:
+        for n in range(num_procesos):
+            p = Process(target=busqueda_aleatoria,
+                        args=(lock, n, cola, tablero, dimensiones, limites, contador, carpeta_ensayos, semilla, parada, motor, backend, control, fases))
+            p.start()
+            procesos.append(p)
 
-    for p in procesos:
-        p.join()
+        for p in procesos:
+            p.join()
+    else:
+        correr_rango(cola, busqueda_aleatoria, (lock, comm.rank, cola, tablero, dimensiones, limites, contador, carpeta_ensayos, semilla, parada, motor, backend, control, fases))
 
     fin = time.time()
+
+    # Con MPI solo sigue el rango 0, con el mejor resultado y las estadísticas de todos los rangos
+    if comm is not None:
+        fases.juntar(comm)
+    if comm is not None and not terminar_rango(cola, tablero):
+        sys.exit()
+
+    cola.imprimir_resumen(inicio, fin)
+    fases.imprimir_resumen()
+    if args.traza:
+        print(f"Traza guardada en: {fases.escribir_traza(args.traza)}")
+
+    mejor_puntaje, mejores_parametros, mejor_solucion = tablero.leer()
+    mejores_parametros[0] = int(mejores_parametros[0])
+    tablero.liberar()
+    control.limpiar()
+    ruta_ensayos = fusionar_registros(carpeta_ensayos, carpeta_ensayos + ".npz",
+                                      num_procesos=num_procesos, semilla=str(semilla), funcion="funcion1", busqueda="random")
+    if cache is not None:
+        cache.guardar(ruta_ensayos)
+        cache.imprimir_resumen()
+        cache.cerrar()
     duracion = round(fin - inicio, 4)
+    evaluaciones, iteraciones = fases.totales()
+    por_segundo = evaluaciones / duracion if duracion > 0 else 0.0
 
     print("\nResultados finales:")
     print(f"Tiempo total: {duracion:.2f} segundos")
-    print(f"Mejor puntaje obtenido: {mejor_puntaje.value}")
+    print(f"Evaluaciones de la función objetivo: {evaluaciones} ({por_segundo:.0f} por segundo), iteraciones: {iteraciones}")
+    print(f"Mejor puntaje obtenido: {mejor_puntaje}")
+    print(f"Semilla: {semilla}")
     print("Mejores hiperparámetros encontrados:")
     for i, p in enumerate(mejores_parametros):
         print(f"  Parámetro {i+1}: {p}")
@@ -149,22 +339,36 @@ if __name__ == "__main__":
         print(f"  x{i+1} = {val}")
 
     # --- Guardar en CSV acumulativo ---
-    nombre_csv = "resultados_pso_randomsearch.csv"
+    nombre_csv = args.csv
+    encabezado = [
+        "num_procesos", "tiempo", "puntaje",
+        "param_num_particulas", "param_w", "param_c1", "param_c2",
+        "x1", "x2",
+        "evaluaciones", "iteraciones", "evaluaciones_por_segundo", "ensayos_cache"
+    ]
+    # Un CSV de una versión anterior se completa con las columnas nuevas
+    extender_csv(nombre_csv, encabezado)
     existe = os.path.exists(nombre_csv)
 
     with open(nombre_csv, mode='a', newline='') as archivo:
         writer = csv.writer(archivo)
         if not existe:
-            writer.writerow([
-                "num_procesos", "tiempo", "puntaje", 
-                "param_num_particulas", "param_w", "param_c1", "param_c2", 
-                "x1", "x2"
-            ])
+            writer.writerow(encabezado)
         writer.writerow([
             num_procesos,
             round(duracion, 4),
-            mejor_puntaje.value,
+            mejor_puntaje,
             *mejores_parametros,
             mejor_solucion[0],
-            mejor_solucion[1]
+            mejor_solucion[1],
+            evaluaciones,
+            iteraciones,
+            round(por_segundo, 1),
+            cache.aciertos if cache is not None else 0
         ])
+
+    ruta_fases = fases.guardar(nombre_csv, carpeta_ensayos)
+
+    print(f"\nResultado agregado a: {nombre_csv}")
+    print(f"Tiempos por fase en: {ruta_fases}")
+    print(f"Ensayos guardados en: {ruta_ensayos}")
@@ -0,0 +1,99 @@
+from functools import partial
+import numpy as np
+import argparse
+import time
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.asincrono import PoolEvaluacion, ejecutar_pso_distribuido
+from pso_paralelo.semillas import semilla_raiz, generador_ensayo
+
+# La función objetivo es la del grid search (mismo directorio)
+from grid_restriccion_funcion3 import funcion_objetivo_con_restricciones
+
+# --- Costo simulado: cada evaluación tarda entre 0.5 y 1.5 veces `RETARDO` segundos, como
+# una función cara (un simulador) con tiempos desiguales entre partículas
+RETARDO = 0.002
+
+# Cada evaluador sortea sus retardos con su propio flujo, clave (proceso, 1); las corridas
+# usan (repetición,). Con el generador global todos heredarían el mismo estado al
+# lanzarse y tardarían lo mismo en cada evaluación.
+_retardos = None
+
+def sembrar_retardos(semilla, id_proceso):
+    global _retardos
+    _retardos = generador_ensayo(semilla, id_proceso, 1)
+
+def funcion_costosa(x):
+    time.sleep(RETARDO * _retardos.uniform(0.5, 1.5))
+    return funcion_objetivo_con_restricciones(x)
+
+# --- Programa principal
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser()
+    argumentos.add_argument("--semilla", type=int, default=None, help="semilla raíz (por defecto una nueva)")
+    argumentos.add_argument("--procesos", type=int, default=6, help="número de procesos")
+    argumentos.add_argument("--repeticiones", type=int, default=3)
+    argumentos.add_argument("--csv", default="resultados_pso_asincrono_funcion3.csv", help="archivo CSV al que se agrega el resultado")
+    args = argumentos.parse_args()
+
+    dimensiones = 5
+    limites = [
+    (78, 102),  # x1
+    (33, 45),   # x2
+    (27, 45),   # x3
+    (27, 45),   # x4
+    (27, 45)    # x5
+]
+    limites_inf = [lim[0] for lim in limites]
+    limites_sup = [lim[1] for lim in limites]
+
+    # Una sola corrida de PSO con hiperparámetros fijos; lo que se compara es el motor
+    parametros = (40, 0.3, 1.5, 2.0)
+    max_evaluaciones = 40 * 500
+    valor_objetivo = -30665.0
+    repeticiones = args.repeticiones
+    num_procesos = args.procesos
+    semilla = semilla_raiz(args.semilla)
+
+    print(f"PSO síncrono contra asíncrono, evaluaciones en {num_procesos} procesos "
+          f"(retardo simulado {RETARDO * 1000:.1f} ms por evaluación)\n")
+
+    pool = PoolEvaluacion(funcion_costosa, num_procesos, partial(sembrar_retardos, semilla))
+    filas = []
+    for repeticion in range(repeticiones):
+        for modo in ("sincrono", "asincrono"):
+            # Mismo generador para los dos modos en cada repetición: mismo enjambre inicial
+            r = ejecutar_pso_distribuido(pool, limites_inf, limites_sup, dimensiones, parametros, max_evaluaciones,
+                                         asincrono=(modo == "asincrono"), valor_objetivo=valor_objetivo,
+                                         rng=generador_ensayo(semilla, repeticion))
+            filas.append([modo, repeticion, num_procesos, r["evaluaciones"], round(r["tiempo"], 4),
+                          round(r["evaluaciones_por_segundo"], 1),
+                          round(r["tiempo_objetivo"], 4) if r["tiempo_objetivo"] is not None else "", r["puntaje"]])
+            objetivo_txt = f"{r['tiempo_objetivo']:.2f} s" if r["tiempo_objetivo"] is not None else "no se alcanzó"
+            print(f"  {modo:>9} #{repeticion + 1}: {r['evaluaciones']} evaluaciones, {r['evaluaciones_por_segundo']:.0f} eval/s, "
+                  f"objetivo {valor_objetivo}: {objetivo_txt}, mejor puntaje {r['puntaje']}")
+    pool.cerrar()
+
+    print("\nMedianas:")
+    for modo in ("sincrono", "asincrono"):
+        del_modo = [f for f in filas if f[0] == modo]
+        tiempos = [f[6] for f in del_modo if f[6] != ""]
+        print(f"  {modo:>9}: {np.median([f[5] for f in del_modo]):.0f} eval/s, "
+              f"tiempo al objetivo {np.median(tiempos) if tiempos else float('nan'):.2f} s "
+              f"({len(tiempos)}/{len(del_modo)} corridas lo alcanzaron)")
+    print(f"Semilla: {semilla}")
+
+    # --- Guardar en CSV ---
+    nombre_csv = args.csv
+    existe = os.path.exists(nombre_csv)
+
+    with open(nombre_csv, mode='a', newline='') as archivo:
+        writer = csv.writer(archivo)
+        if not existe:
+            writer.writerow(["modo", "repeticion", "num_procesos", "evaluaciones", "tiempo", "evaluaciones_por_segundo", "tiempo_objetivo", "puntaje"])
+        writer.writerows(filas)
+
+    print(f"\nResultado agregado a: {nombre_csv}")
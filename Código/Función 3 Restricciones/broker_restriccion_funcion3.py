@@ -0,0 +1,157 @@
+from multiprocessing import Process
+import argparse
+import itertools
+import socket
+import time
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.broker import coordinar, trabajar, resolver_clave
+from pso_paralelo.parada import CriteriosParada
+from pso_paralelo.semillas import semilla_raiz, generador_parametros
+
+# La función objetivo y el PSO son los del grid search (mismo directorio)
+from grid_restriccion_funcion3 import funcion_objetivo_con_restricciones, ejecutar_pso
+
+dimensiones = 5
+limites = [
+    (78, 102),  # x1
+    (33, 45),   # x2
+    (27, 45),   # x3
+    (27, 45),   # x4
+    (27, 45)    # x5
+]
+max_iteraciones = 500
+
+# --- Una tarea del coordinador: (indice, parámetros, semilla, parada). El generador sale de
+# la semilla y de los parámetros, como en grid_restriccion_funcion3.py: el resultado no
+# depende de qué trabajador la corra
+def correr_ensayo(tarea):
+    indice, params, semilla, parada = tarea
+    limites_inf = [lim[0] for lim in limites]
+    limites_sup = [lim[1] for lim in limites]
+    score, solucion, _, _ = ejecutar_pso(funcion_objetivo_con_restricciones, limites_inf, limites_sup, dimensiones, params,
+                                         max_iteraciones, parada, generador_parametros(semilla, params))
+    return float(score), solucion
+
+# --- Cada proceso trabajador se identifica con la máquina y su pid
+def trabajador(host, puerto, clave, plazo):
+    nombre = f"{socket.gethostname()}-{os.getpid()}"
+    print(f"[Trabajador {nombre}] Conectando a {host}:{puerto}...")
+    hechas = trabajar(correr_ensayo, nombre, clave, host, puerto, plazo)
+    print(f"[Trabajador {nombre}] Finalizado ({hechas} combinaciones)")
+
+def lanzar_trabajadores(num_procesos, host, puerto, clave, plazo):
+    procesos = [Process(target=trabajador, args=(host, puerto, clave, plazo)) for _ in range(num_procesos)]
+    for p in procesos:
+        p.start()
+    return procesos
+
+# --- Programa principal
+#
+#   coordinador   sirve las combinaciones del grid y escribe el CSV al terminar
+#   trabajador    se conecta al coordinador con --procesos procesos (en esta u otra máquina)
+#   local         coordinador y --procesos trabajadores en 127.0.0.1
+#
+# Fuera de 127.0.0.1 la clave es obligatoria (--clave o PSO_CLAVE, ver pso_paralelo/broker.py).
+# Ejemplo en dos máquinas de la misma red privada (el tráfico no va cifrado: para salir de
+# ella, un túnel SSH hacia 127.0.0.1):
+#   export PSO_CLAVE=$(python -c "import secrets; print(secrets.token_hex(16))")
+#   python broker_restriccion_funcion3.py coordinador --host <ip privada del coordinador>
+#   python broker_restriccion_funcion3.py trabajador --host <ip privada del coordinador> --procesos 8
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Grid search de PSO repartido por TCP")
+    argumentos.add_argument("modo", choices=["coordinador", "trabajador", "local"])
+    argumentos.add_argument("--host", default="127.0.0.1")
+    argumentos.add_argument("--puerto", type=int, default=50000)
+    argumentos.add_argument("--clave", default=None, help="clave de la conexión (por defecto PSO_CLAVE; en 127.0.0.1 se genera una)")
+    argumentos.add_argument("--procesos", type=int, default=6)
+    argumentos.add_argument("--plazo", type=float, default=10.0, help="segundos sin latido para dar a un trabajador por caído")
+    argumentos.add_argument("--semilla", type=int, default=None)
+    argumentos.add_argument("--csv", default="resultados_pso_broker_funcion3.csv", help="archivo CSV al que se agrega el resultado (coordinador)")
+    argumentos.add_argument("--parada", action="store_true", help="parada temprana de cada ensayo (enjambre colapsado, estancamiento)")
+    args = argumentos.parse_args()
+    # Los trabajadores no pueden adivinar una clave generada: la necesitan siempre
+    try:
+        clave = resolver_clave(args.clave, args.host, generar=args.modo != "trabajador")
+    except ValueError as e:
+        sys.exit(str(e))
+
+    if args.modo == "trabajador":
+        for p in lanzar_trabajadores(args.procesos, args.host, args.puerto, clave, args.plazo):
+            p.join()
+        sys.exit()
+
+    # Espacio de búsqueda (grid search)
+    espacio_parametros = {
+        'num_particulas': [10, 20, 30, 40, 50],
+        'w': [0.1, 0.3, 0.5, 0.7, 0.9],
+        'c1': [0.5, 1.0, 1.5, 2.0, 2.5],
+        'c2': [0.5, 1.0, 1.5, 2.0, 2.5]
+    }
+
+    todas_combinaciones = list(itertools.product(
+        espacio_parametros['num_particulas'],
+        espacio_parametros['w'],
+        espacio_parametros['c1'],
+        espacio_parametros['c2']
+    ))
+
+    # --- Parada temprana (con --parada): enjambre colapsado o 100 iteraciones sin mejorar.
+    # Viaja en cada tarea, así todos los trabajadores usan la del coordinador
+    parada = CriteriosParada(tol_diametro=1e-10, ventana_estancamiento=100, tol_estancamiento=1e-9) if args.parada else None
+
+    semilla = semilla_raiz(args.semilla)
+    tareas = [(i, params, semilla, parada) for i, params in enumerate(todas_combinaciones)]
+
+    print("Iniciando búsqueda exhaustiva (grid search) con PSO repartida por TCP...\n")
+    inicio = time.time()
+
+    procesos = lanzar_trabajadores(args.procesos, args.host, args.puerto, clave, args.plazo) if args.modo == "local" else []
+    resultados, resumen = coordinar(tareas, clave, args.host, args.puerto, args.plazo)
+    for p in procesos:
+        p.join()
+
+    fin = time.time()
+    duracion = fin - inicio
+
+    mejor = min(range(len(resultados)), key=lambda i: resultados[i][0])
+    mejor_puntaje, mejor_solucion = resultados[mejor]
+    mejores_parametros = list(todas_combinaciones[mejor])
+    reencoladas = resumen.pop("reencoladas")
+    num_procesos = len(resumen)
+
+    print("\nTareas por trabajador:")
+    for nombre, hechas in sorted(resumen.items()):
+        print(f"  {nombre}: {hechas}")
+    print(f"Tareas reencoladas por trabajadores caídos: {reencoladas}")
+
+    print("\nResultados finales:")
+    print(f"Tiempo total: {duracion:.2f} segundos")
+    print(f"Mejor puntaje obtenido: {mejor_puntaje}")
+    print(f"Semilla: {semilla}")
+    print("Mejores hiperparámetros encontrados:")
+    for i, p in enumerate(mejores_parametros):
+        print(f"  Parámetro {i+1}: {p}")
+    print("Variables óptimas encontradas:")
+    for i, val in enumerate(mejor_solucion):
+        print(f"  x{i+1} = {val}")
+
+    # --- Guardar en CSV (num_procesos = trabajadores que entregaron resultados) ---
+    nombre_csv = args.csv
+    existe = os.path.exists(nombre_csv)
+
+    with open(nombre_csv, mode='a', newline='') as archivo:
+        writer = csv.writer(archivo)
+        if not existe:
+            writer.writerow(["num_procesos", "tiempo", "puntaje", "param_num_particulas", "param_w", "param_c1", "param_c2"])
+        writer.writerow([
+            num_procesos,
+            round(duracion, 4),
+            mejor_puntaje,
+            *mejores_parametros
+        ])
+
+    print(f"\nResultado agregado a: {nombre_csv}")
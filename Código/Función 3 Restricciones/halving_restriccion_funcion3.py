@@ -0,0 +1,176 @@
+from multiprocessing import Lock
+import numpy as np
+import argparse
+import time
+import itertools
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.motor import EnjambresMulticonfig
+from pso_paralelo.planificador import PoolRondas
+from pso_paralelo.halving import plan_halving
+from pso_paralelo.semillas import semilla_raiz, generador_ensayo
+from pso_paralelo.registro import extender_csv
+
+# La función objetivo es la del grid search (mismo directorio)
+from grid_restriccion_funcion3 import funcion_objetivo_con_restricciones_lote
+
+# --- Función que corre en cada proceso: avanza cada bloque de la ronda como un tensor.
+# Cada tarea es (índice de la combinación, parámetros, estado guardado o None, iteraciones
+# a correr) y vuelve como (puntaje, solución, estado) para que la siguiente ronda la reanude
+# donde quedó. El estado incluye el generador del ensayo, que sigue su mismo flujo aleatorio.
+def busqueda_halving(id_proceso, cola, resultados, lock, dimensiones, limites, semilla):
+    limites_inf = [lim[0] for lim in limites]
+    limites_sup = [lim[1] for lim in limites]
+
+    for indices, tareas in cola.bloques(id_proceso):
+        combinaciones = [params for _, params, _, _ in tareas]
+        estados = [estado for _, _, estado, _ in tareas]
+        generadores = [generador_ensayo(semilla, i) if estado is None else None for i, _, estado, _ in tareas]
+        iteraciones = tareas[0][3]
+        try:
+            enjambres = EnjambresMulticonfig(funcion_objetivo_con_restricciones_lote, limites_inf, limites_sup, dimensiones, combinaciones, estados, generadores)
+            enjambres.avanzar(iteraciones)
+            puntajes, soluciones, _, _ = enjambres.resultados()
+            resultados.put(list(zip(indices, zip(puntajes, soluciones, enjambres.estados()))))
+        except Exception as e:
+            with lock:
+                print(f"[Proceso {id_proceso}] Error en el bloque: {e}")
+            # La ronda espera todas sus tareas: las que fallaron vuelven descartadas
+            resultados.put([(indice, (np.inf, None, None)) for indice in indices])
+
+# --- Programa principal
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser()
+    argumentos.add_argument("--semilla", type=int, default=None, help="semilla raíz (por defecto una nueva)")
+    argumentos.add_argument("--procesos", type=int, default=6, help="número de procesos")
+    argumentos.add_argument("--csv", default="resultados_pso_halving_funcion3.csv", help="archivo CSV al que se agrega el resultado")
+    args = argumentos.parse_args()
+
+    dimensiones = 5
+    limites = [
+    (78, 102),  # x1
+    (33, 45),   # x2
+    (27, 45),   # x3
+    (27, 45),   # x4
+    (27, 45)    # x5
+]
+
+    # Mismo espacio que el grid search
+    espacio_parametros = {
+        'num_particulas': [10, 20, 30, 40, 50],
+        'w': [0.1, 0.3, 0.5, 0.7, 0.9],
+        'c1': [0.5, 1.0, 1.5, 2.0, 2.5],
+        'c2': [0.5, 1.0, 1.5, 2.0, 2.5]
+    }
+
+    todas_combinaciones = list(itertools.product(
+        espacio_parametros['num_particulas'],
+        espacio_parametros['w'],
+        espacio_parametros['c1'],
+        espacio_parametros['c2']
+    ))
+
+    num_procesos = args.procesos
+
+    # --- Semilla raíz: cada combinación saca su generador de ella y de su índice (None = semilla nueva)
+    semilla = semilla_raiz(args.semilla)
+
+    # --- Successive halving: 20 iteraciones para todas, luego sigue el mejor tercio
+    # con el triple de iteraciones, hasta llegar a las 500 del grid search
+    eta = 3
+    plan = plan_halving(len(todas_combinaciones), eta, iteraciones_iniciales=20, max_iteraciones=500)
+
+    lock = Lock()
+
+    print("Iniciando búsqueda por successive halving con PSO en paralelo...\n")
+    inicio = time.time()
+
+    # Los mismos procesos atienden todas las rondas
+    pool = PoolRondas(num_procesos, busqueda_halving, (lock, dimensiones, limites, semilla))
+
+    vivas = [(i, params, None) for i, params in enumerate(todas_combinaciones)]
+    iteraciones_hechas = 0
+    mejor_puntaje, mejores_parametros, mejor_solucion = np.inf, None, None
+    # Trabajo hecho, contado como en grid search: partículas por iteración, más la
+    # evaluación inicial de cada combinación (solo las tareas que terminaron bien)
+    evaluaciones = iteraciones = 0
+
+    for ronda, (_, iteraciones_ronda) in enumerate(plan):
+        extra = iteraciones_ronda - iteraciones_hechas
+        tareas = [(i, params, estado, extra) for i, params, estado in vivas]
+        costos = [params[0] * extra for _, params, _ in vivas]
+        resultados = pool.ejecutar(tareas, costos)
+        iteraciones_hechas = iteraciones_ronda
+        for (_, params, estado), (_, _, nuevo_estado) in zip(vivas, resultados):
+            if nuevo_estado is not None:
+                evaluaciones += int(params[0]) * (extra + (estado is None))
+                iteraciones += extra
+
+        puntajes = np.array([puntaje for puntaje, _, _ in resultados])
+        orden = np.argsort(puntajes, kind="stable")
+        mejor = orden[0]
+        if puntajes[mejor] < mejor_puntaje:
+            mejor_puntaje = float(puntajes[mejor])
+            mejores_parametros = list(vivas[mejor][1])
+            mejor_solucion = resultados[mejor][1]
+
+        print(f"Ronda {ronda + 1}: {len(vivas)} combinaciones hasta {iteraciones_ronda} iteraciones, "
+              f"mejor puntaje {puntajes[mejor]}")
+
+        # Siguen las mejores de la ronda, con su enjambre tal como quedó
+        if ronda + 1 < len(plan):
+            siguientes = plan[ronda + 1][0]
+            vivas = [(*vivas[i][:2], resultados[i][2]) for i in orden[:siguientes] if resultados[i][2] is not None]
+            if not vivas:
+                break
+
+    pool.cerrar()
+    fin = time.time()
+    pool.imprimir_resumen(inicio, fin)
+
+    if mejor_solucion is None:
+        print("\nNinguna corrida terminó sin errores: no hay resultado que guardar")
+        sys.exit(1)
+
+    mejores_parametros[0] = int(mejores_parametros[0])
+    duracion = fin - inicio
+    por_segundo = evaluaciones / duracion if duracion > 0 else 0.0
+
+    print("\nResultados finales:")
+    print(f"Tiempo total: {duracion:.2f} segundos")
+    print(f"Mejor puntaje obtenido: {mejor_puntaje}")
+    print(f"Evaluaciones de la función objetivo: {evaluaciones} ({por_segundo:.0f} por segundo), iteraciones: {iteraciones}")
+    print(f"Semilla: {semilla}")
+    print("Mejores hiperparámetros encontrados:")
+    for i, p in enumerate(mejores_parametros):
+        print(f"  Parámetro {i+1}: {p}")
+    print("Variables óptimas encontradas:")
+    for i, val in enumerate(mejor_solucion):
+        print(f"  x{i+1} = {val}")
+
+    # --- Guardar en CSV (mismas columnas que grid y random search) ---
+    nombre_csv = args.csv
+    encabezado = ["num_procesos", "tiempo", "puntaje", "param_num_particulas", "param_w", "param_c1", "param_c2", "evaluaciones", "iteraciones", "evaluaciones_por_segundo", "ensayos_cache"]
+    # Un CSV de una versión anterior se completa con las columnas nuevas
+    extender_csv(nombre_csv, encabezado)
+    existe = os.path.exists(nombre_csv)
+
+    with open(nombre_csv, mode='a', newline='') as archivo:
+        writer = csv.writer(archivo)
+        if not existe:
+            writer.writerow(encabezado)
+        writer.writerow([
+            num_procesos,
+            round(duracion, 4),
+            mejor_puntaje,
+            *mejores_parametros,
+            evaluaciones,
+            iteraciones,
+            round(por_segundo, 1),
+            0
+        ])
+
+    print(f"\nResultado agregado a: {nombre_csv}")
@@ -0,0 +1,83 @@
+import numpy as np
+import argparse
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.islas import ejecutar_islas
+from pso_paralelo.semillas import semilla_raiz
+
+# La función objetivo es la del grid search (mismo directorio)
+from grid_restriccion_funcion3 import funcion_objetivo_con_restricciones_lote
+
+# --- Programa principal
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser()
+    argumentos.add_argument("--semilla", type=int, default=None, help="semilla raíz (por defecto una nueva)")
+    argumentos.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 6], help="números de islas (un proceso cada una) a comparar")
+    argumentos.add_argument("--repeticiones", type=int, default=3)
+    argumentos.add_argument("--csv", default="resultados_pso_islas_funcion3.csv", help="archivo CSV al que se agrega el resultado")
+    args = argumentos.parse_args()
+
+    dimensiones = 5
+    limites = [
+    (78, 102),  # x1
+    (33, 45),   # x2
+    (27, 45),   # x3
+    (27, 45),   # x4
+    (27, 45)    # x5
+]
+    limites_inf = [lim[0] for lim in limites]
+    limites_sup = [lim[1] for lim in limites]
+
+    # --- Una sola optimización de F3 repartida en islas (un sub-enjambre por proceso) que
+    # intercambian sus mejores partículas cada `intervalo` iteraciones
+    parametros = (20, 0.7, 1.5, 1.5)
+    max_iteraciones = 500
+    valor_objetivo = -30667.5
+    topologia = "anillo"      # "anillo" o "completa"
+    intervalo = 10
+    num_migrantes = 2
+    lista_islas = args.procesos
+    repeticiones = args.repeticiones
+    semilla = semilla_raiz(args.semilla)
+
+    print(f"Modelo de islas ({topologia}, migración cada {intervalo} iteraciones): tiempo hasta f(x) <= {valor_objetivo}\n")
+
+    filas = []
+    for num_islas in lista_islas:
+        for repeticion in range(repeticiones):
+            # La isla i de cada repetición usa el flujo (repetición, i) de la semilla
+            r = ejecutar_islas(funcion_objetivo_con_restricciones_lote, limites_inf, limites_sup, dimensiones, parametros,
+                               num_islas, max_iteraciones, intervalo, topologia, num_migrantes, valor_objetivo,
+                               semilla=semilla, repeticion=repeticion)
+            filas.append([num_islas, repeticion, topologia, intervalo, round(r["tiempo"], 4),
+                          round(r["tiempo_objetivo"], 4) if r["tiempo_objetivo"] is not None else "", r["puntaje"]])
+            objetivo_txt = f"{r['tiempo_objetivo']:.3f} s" if r["tiempo_objetivo"] is not None else "no se alcanzó"
+            print(f"  {num_islas} islas #{repeticion + 1}: objetivo {objetivo_txt}, mejor puntaje {r['puntaje']}, "
+                  f"iteraciones por isla {r['iteraciones']}")
+
+    # --- Aceleración para llegar al objetivo respecto a una sola isla (medianas; las corridas
+    # que no llegaron cuentan con su tiempo total)
+    medianas = {}
+    for num_islas in lista_islas:
+        tiempos = [f[5] if f[5] != "" else f[4] for f in filas if f[0] == num_islas]
+        medianas[num_islas] = float(np.median(tiempos))
+
+    print("\nIslas  Tiempo al objetivo (s)  Aceleración")
+    for num_islas in lista_islas:
+        print(f"{num_islas:>5}  {medianas[num_islas]:>22.3f}  {medianas[lista_islas[0]] / medianas[num_islas]:>10.2f}x")
+    print(f"Semilla: {semilla}")
+
+    # --- Guardar en CSV ---
+    nombre_csv = args.csv
+    existe = os.path.exists(nombre_csv)
+
+    with open(nombre_csv, mode='a', newline='') as archivo:
+        writer = csv.writer(archivo)
+        if not existe:
+            writer.writerow(["num_procesos", "repeticion", "topologia", "intervalo", "tiempo", "tiempo_objetivo", "puntaje"])
+        writer.writerows(filas)
+
+    print(f"\nResultado agregado a: {nombre_csv}")
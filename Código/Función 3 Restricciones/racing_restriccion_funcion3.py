@@ -0,0 +1,196 @@
+from multiprocessing import Lock
+import numpy as np
+import argparse
+import time
+import itertools
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.motor import ejecutar_pso_multiconfig
+from pso_paralelo.planificador import PoolRondas
+from pso_paralelo.racing import prueba_friedman
+from pso_paralelo.parada import CriteriosParada
+from pso_paralelo.semillas import semilla_raiz, generador_ensayo, GeneradorComun
+from pso_paralelo.registro import extender_csv
+
+# La función objetivo es la del grid search (mismo directorio)
+from grid_restriccion_funcion3 import funcion_objetivo_con_restricciones_lote
+
+# --- Función que corre en cada proceso: una corrida de cada combinación del bloque.
+# Cada tarea es (índice de la combinación, parámetros, ronda). Con flujos comunes, todas
+# las combinaciones de una ronda usan los mismos números aleatorios (reconstruidos aquí con
+# la semilla y la ronda); si no, cada una tiene su propio flujo por índice y ronda.
+# Vuelve como (puntaje, solución, iteraciones); un bloque que falló, como (inf, None, 0).
+def busqueda_racing(id_proceso, cola, resultados, lock, dimensiones, limites, max_iteraciones, semilla, parada, flujos_comunes, max_particulas):
+    limites_inf = [lim[0] for lim in limites]
+    limites_sup = [lim[1] for lim in limites]
+
+    for indices, tareas in cola.bloques(id_proceso):
+        combinaciones = [params for _, params, _ in tareas]
+        if flujos_comunes:
+            generadores = [GeneradorComun(semilla, max_particulas, ronda) for _, _, ronda in tareas]
+        else:
+            generadores = [generador_ensayo(semilla, i, ronda) for i, _, ronda in tareas]
+        try:
+            puntajes, soluciones, _, iteraciones = ejecutar_pso_multiconfig(funcion_objetivo_con_restricciones_lote, limites_inf, limites_sup, dimensiones, combinaciones, max_iteraciones=max_iteraciones, parada=parada, generadores=generadores)
+            resultados.put(list(zip(indices, zip(puntajes, soluciones, iteraciones))))
+        except Exception as e:
+            with lock:
+                print(f"[Proceso {id_proceso}] Error en el bloque: {e}")
+            resultados.put([(indice, (np.inf, None, 0)) for indice in indices])
+
+# --- Programa principal
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser()
+    argumentos.add_argument("--semilla", type=int, default=None, help="semilla raíz (por defecto una nueva)")
+    argumentos.add_argument("--procesos", type=int, default=6, help="número de procesos")
+    argumentos.add_argument("--parada", action="store_true", help="parada temprana de cada corrida (enjambre colapsado, estancamiento)")
+    argumentos.add_argument("--csv", default="resultados_pso_racing_funcion3.csv", help="archivo CSV al que se agrega el resultado")
+    flujos = argumentos.add_mutually_exclusive_group()
+    flujos.add_argument("--flujos-comunes", dest="flujos_comunes", action="store_true", default=True,
+                        help="en cada ronda todas las combinaciones usan los mismos números aleatorios (por defecto)")
+    flujos.add_argument("--independientes", dest="flujos_comunes", action="store_false",
+                        help="cada combinación con su propio flujo aleatorio en cada ronda")
+    args = argumentos.parse_args()
+
+    dimensiones = 5
+    limites = [
+    (78, 102),  # x1
+    (33, 45),   # x2
+    (27, 45),   # x3
+    (27, 45),   # x4
+    (27, 45)    # x5
+]
+
+    # Mismo espacio que el grid search
+    espacio_parametros = {
+        'num_particulas': [10, 20, 30, 40, 50],
+        'w': [0.1, 0.3, 0.5, 0.7, 0.9],
+        'c1': [0.5, 1.0, 1.5, 2.0, 2.5],
+        'c2': [0.5, 1.0, 1.5, 2.0, 2.5]
+    }
+
+    todas_combinaciones = list(itertools.product(
+        espacio_parametros['num_particulas'],
+        espacio_parametros['w'],
+        espacio_parametros['c1'],
+        espacio_parametros['c2']
+    ))
+
+    num_procesos = args.procesos
+    max_iteraciones = 500
+
+    # --- Racing (F-Race): en cada ronda todas las combinaciones vivas corren una vez más con
+    # una semilla nueva; desde la ronda `rondas_minimas` una prueba de Friedman descarta las
+    # que son significativamente peores. Termina con una sola viva o en `max_rondas`.
+    alfa = 0.05
+    rondas_minimas = 5
+    max_rondas = 30
+    semilla = semilla_raiz(args.semilla)
+
+    # --- Números aleatorios comunes (por defecto): en cada ronda todas las combinaciones parten
+    # del mismo enjambre inicial y reciben los mismos r1/r2, así las diferencias entre ellas se
+    # deben a los hiperparámetros y no al azar (ver pso_paralelo/semillas.py). Con
+    # --independientes cada combinación usa su propio flujo por índice y ronda.
+    flujos_comunes = args.flujos_comunes
+    max_particulas = max(espacio_parametros['num_particulas'])
+
+    # --- Parada temprana (con --parada): enjambre colapsado o 100 iteraciones sin mejorar
+    parada = CriteriosParada(tol_diametro=1e-10, ventana_estancamiento=100, tol_estancamiento=1e-9) if args.parada else None
+
+    lock = Lock()
+
+    print("Iniciando búsqueda por racing (F-Race) con PSO en paralelo...\n")
+    inicio = time.time()
+
+    pool = PoolRondas(num_procesos, busqueda_racing, (lock, dimensiones, limites, max_iteraciones, semilla, parada, flujos_comunes, max_particulas))
+
+    # vivas: índices en todas_combinaciones; historial: puntajes (ronda, viva) de las vivas
+    vivas = np.arange(len(todas_combinaciones))
+    historial = np.empty((0, len(vivas)))
+    soluciones = {}
+    corridas = 0
+    # Trabajo hecho, contado como en grid search: partículas por iteración más la evaluación inicial
+    evaluaciones = iteraciones = 0
+
+    for ronda in range(max_rondas):
+        tareas = [(i, todas_combinaciones[i], ronda) for i in vivas]
+        resultados = pool.ejecutar(tareas, [todas_combinaciones[i][0] for i in vivas])
+        corridas += len(tareas)
+
+        puntajes = np.array([puntaje for puntaje, _, _ in resultados])
+        historial = np.vstack([historial, puntajes])
+        for i, (puntaje, solucion, iteraciones_corrida) in zip(vivas, resultados):
+            if solucion is not None:
+                evaluaciones += int(todas_combinaciones[i][0]) * (int(iteraciones_corrida) + 1)
+                iteraciones += int(iteraciones_corrida)
+            if puntaje < soluciones.get(i, (np.inf, None))[0]:
+                soluciones[i] = (puntaje, solucion)
+
+        mensaje = f"Ronda {ronda + 1}: {len(vivas)} combinaciones"
+        if ronda + 1 >= rondas_minimas:
+            estadistico, p, siguen = prueba_friedman(historial, alfa)
+            vivas, historial = vivas[siguen], historial[:, siguen]
+            mensaje += f", Friedman p = {p:.3g}, siguen {len(vivas)}"
+        print(mensaje)
+        if len(vivas) == 1:
+            break
+
+    pool.cerrar()
+    fin = time.time()
+    pool.imprimir_resumen(inicio, fin)
+
+    # Ganadora: mejor puntaje medio entre las que siguen. Una corrida que falló puntúa inf,
+    # así que una media finita asegura que la ganadora tiene solución
+    medias = historial.mean(axis=0)
+    if not np.isfinite(medias.min()):
+        print("\nNinguna combinación terminó todas sus corridas sin errores: no hay resultado que guardar")
+        sys.exit(1)
+    ganadora = vivas[np.argmin(medias)]
+    mejor_puntaje = float(medias.min())
+    mejores_parametros = list(todas_combinaciones[ganadora])
+    mejor_solucion = soluciones[ganadora][1]
+    duracion = fin - inicio
+    por_segundo = evaluaciones / duracion if duracion > 0 else 0.0
+
+    print("\nResultados finales:")
+    print(f"Tiempo total: {duracion:.2f} segundos")
+    print(f"Corridas de PSO: {corridas} (30 repeticiones de todas serían {30 * len(todas_combinaciones)})")
+    print(f"Evaluaciones de la función objetivo: {evaluaciones} ({por_segundo:.0f} por segundo), iteraciones: {iteraciones}")
+    print(f"Puntaje medio de la ganadora en {len(historial)} corridas: {mejor_puntaje} "
+          f"(desviación {historial[:, np.argmin(medias)].std():.3g}, {len(vivas)} combinaciones sin diferencia significativa)")
+    print(f"Semilla: {semilla}, flujos {'comunes' if flujos_comunes else 'independientes'}")
+    print("Mejores hiperparámetros encontrados:")
+    for i, p in enumerate(mejores_parametros):
+        print(f"  Parámetro {i+1}: {p}")
+    print("Variables óptimas encontradas (mejor corrida de la ganadora):")
+    for i, val in enumerate(mejor_solucion):
+        print(f"  x{i+1} = {val}")
+
+    # --- Guardar en CSV (mismas columnas que grid y random search más los flujos usados; el
+    # puntaje es la media de la ganadora en todas sus corridas) ---
+    nombre_csv = args.csv
+    encabezado = ["num_procesos", "tiempo", "puntaje", "param_num_particulas", "param_w", "param_c1", "param_c2", "evaluaciones", "iteraciones", "evaluaciones_por_segundo", "ensayos_cache", "flujos"]
+    # Un CSV de una versión anterior se completa con las columnas nuevas
+    extender_csv(nombre_csv, encabezado)
+    existe = os.path.exists(nombre_csv)
+
+    with open(nombre_csv, mode='a', newline='') as archivo:
+        writer = csv.writer(archivo)
+        if not existe:
+            writer.writerow(encabezado)
+        writer.writerow([
+            num_procesos,
+            round(duracion, 4),
+            mejor_puntaje,
+            *mejores_parametros,
+            evaluaciones,
+            iteraciones,
+            round(por_segundo, 1),
+            0,
+            "comunes" if flujos_comunes else "independientes"
+        ])
+
+    print(f"\nResultado agregado a: {nombre_csv}")
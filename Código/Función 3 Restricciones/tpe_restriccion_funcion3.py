@@ -0,0 +1,149 @@
+from multiprocessing import Lock
+import numpy as np
+import argparse
+import time
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pso_paralelo.motor import ejecutar_pso_multiconfig
+from pso_paralelo.planificador import PoolRondas
+from pso_paralelo.tpe import BuscadorTPE
+from pso_paralelo.semillas import semilla_raiz, generadores_ensayos
+from pso_paralelo.registro import extender_csv
+
+# La función objetivo es la del grid search (mismo directorio)
+from grid_restriccion_funcion3 import funcion_objetivo_con_restricciones_lote
+
+# --- Función que corre en cada proceso: evalúa las combinaciones propuestas de cada bloque.
+# Cada tarea es (número de ensayo, parámetros); el número fija el generador del ensayo.
+# Vuelve como (puntaje, solución, iteraciones); un bloque que falló, como (inf, None, 0).
+def busqueda_tpe(id_proceso, cola, resultados, lock, dimensiones, limites, max_iteraciones, semilla):
+    limites_inf = [lim[0] for lim in limites]
+    limites_sup = [lim[1] for lim in limites]
+
+    for indices, tareas in cola.bloques(id_proceso):
+        ensayos = [ensayo for ensayo, _ in tareas]
+        combinaciones = [params for _, params in tareas]
+        try:
+            puntajes, soluciones, _, iteraciones = ejecutar_pso_multiconfig(funcion_objetivo_con_restricciones_lote, limites_inf, limites_sup, dimensiones, combinaciones, max_iteraciones=max_iteraciones, generadores=generadores_ensayos(semilla, ensayos))
+            resultados.put(list(zip(indices, zip(puntajes, soluciones, iteraciones))))
+        except Exception as e:
+            with lock:
+                print(f"[Proceso {id_proceso}] Error en el bloque: {e}")
+            resultados.put([(indice, (np.inf, None, 0)) for indice in indices])
+
+# --- Programa principal
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser()
+    argumentos.add_argument("--semilla", type=int, default=None, help="semilla raíz (por defecto una nueva)")
+    argumentos.add_argument("--procesos", type=int, default=6, help="número de procesos")
+    argumentos.add_argument("--ensayos", type=int, default=60, help="número de ensayos (combinaciones evaluadas)")
+    argumentos.add_argument("--csv", default="resultados_pso_tpe_funcion3.csv", help="archivo CSV al que se agrega el resultado")
+    args = argumentos.parse_args()
+
+    dimensiones = 5
+    limites = [
+    (78, 102),  # x1
+    (33, 45),   # x2
+    (27, 45),   # x3
+    (27, 45),   # x4
+    (27, 45)    # x5
+]
+
+    # Rangos continuos que cubren el espacio del grid search (num_particulas se redondea)
+    rangos_parametros = {
+        'num_particulas': (10, 50),
+        'w': (0.1, 0.9),
+        'c1': (0.5, 2.5),
+        'c2': (0.5, 2.5)
+    }
+
+    num_procesos = args.procesos
+    max_iteraciones = 500
+
+    # --- Búsqueda secuencial basada en modelo: cada lote tiene una propuesta por proceso
+    # y el modelo se vuelve a ajustar con los resultados antes de proponer el siguiente
+    num_ensayos = args.ensayos
+    semilla = semilla_raiz(args.semilla)
+    buscador = BuscadorTPE(rangos_parametros, enteros=('num_particulas',), iniciales=2 * num_procesos, semilla=semilla)
+
+    lock = Lock()
+
+    print("Iniciando búsqueda basada en modelo (TPE) con PSO en paralelo...\n")
+    inicio = time.time()
+
+    pool = PoolRondas(num_procesos, busqueda_tpe, (lock, dimensiones, limites, max_iteraciones, semilla))
+
+    mejor_puntaje, mejores_parametros, mejor_solucion = np.inf, None, None
+    ensayos_hechos = 0
+    ensayo_mejor = 0
+    # Trabajo hecho, contado como en grid search: partículas por iteración más la evaluación inicial
+    evaluaciones = iteraciones = 0
+
+    while ensayos_hechos < num_ensayos:
+        lote = buscador.proponer(min(num_procesos, num_ensayos - ensayos_hechos))
+        tareas = [(ensayos_hechos + j, params) for j, params in enumerate(lote)]
+        resultados = pool.ejecutar(tareas, [params[0] for params in lote])
+        puntajes = [puntaje for puntaje, _, _ in resultados]
+        buscador.registrar(lote, puntajes)
+
+        for params, (puntaje, solucion, iteraciones_ensayo) in zip(lote, resultados):
+            ensayos_hechos += 1
+            if solucion is not None:
+                evaluaciones += int(params[0]) * (int(iteraciones_ensayo) + 1)
+                iteraciones += int(iteraciones_ensayo)
+            if puntaje < mejor_puntaje:
+                mejor_puntaje, mejores_parametros, mejor_solucion = float(puntaje), list(params), solucion
+                ensayo_mejor = ensayos_hechos
+
+        print(f"Ensayos: {ensayos_hechos}/{num_ensayos}, mejor del lote {min(puntajes)}, mejor global {mejor_puntaje}")
+
+    pool.cerrar()
+    fin = time.time()
+    pool.imprimir_resumen(inicio, fin)
+
+    if mejor_solucion is None:
+        print("\nNinguna corrida terminó sin errores: no hay resultado que guardar")
+        sys.exit(1)
+
+    mejores_parametros[0] = int(mejores_parametros[0])
+    duracion = fin - inicio
+    por_segundo = evaluaciones / duracion if duracion > 0 else 0.0
+
+    print("\nResultados finales:")
+    print(f"Tiempo total: {duracion:.2f} segundos")
+    print(f"Mejor puntaje obtenido: {mejor_puntaje} (ensayo {ensayo_mejor} de {num_ensayos})")
+    print(f"Evaluaciones de la función objetivo: {evaluaciones} ({por_segundo:.0f} por segundo), iteraciones: {iteraciones}")
+    print(f"Semilla: {semilla}")
+    print("Mejores hiperparámetros encontrados:")
+    for i, p in enumerate(mejores_parametros):
+        print(f"  Parámetro {i+1}: {p}")
+    print("Variables óptimas encontradas:")
+    for i, val in enumerate(mejor_solucion):
+        print(f"  x{i+1} = {val}")
+
+    # --- Guardar en CSV (mismas columnas que grid y random search) ---
+    nombre_csv = args.csv
+    encabezado = ["num_procesos", "tiempo", "puntaje", "param_num_particulas", "param_w", "param_c1", "param_c2", "evaluaciones", "iteraciones", "evaluaciones_por_segundo", "ensayos_cache"]
+    # Un CSV de una versión anterior se completa con las columnas nuevas
+    extender_csv(nombre_csv, encabezado)
+    existe = os.path.exists(nombre_csv)
+
+    with open(nombre_csv, mode='a', newline='') as archivo:
+        writer = csv.writer(archivo)
+        if not existe:
+            writer.writerow(encabezado)
+        writer.writerow([
+            num_procesos,
+            round(duracion, 4),
+            mejor_puntaje,
+            *mejores_parametros,
+            evaluaciones,
+            iteraciones,
+            round(por_segundo, 1),
+            0
+        ])
+
+    print(f"\nResultado agregado a: {nombre_csv}")
@@ -1,53 +1,181 @@
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
 from datetime import datetime
 
-# --- Cargar archivo CSV ---
-archivo = "resultados_pso_gridsearch.csv"
+# --- Ajustes de escalamiento
+#
+# Fuerte (Amdahl):   T(p) = T1 (f + (1 - f) / p)  ->  S(p) = 1 / (f + (1 - f) / p)
+#                    f es la fracción serial: lo que no baja al agregar procesos (lanzar
+#                    procesos, armar la cola, fusionar registros...). S nunca pasa de 1 / f.
+# Débil (Gustafson): el trabajo crece con p; S(p) = (W(p) / W1) T1 / T(p) = p - s (p - 1)
+#                    s es la fracción serial de la corrida paralela. W es el trabajo que
+#                    hizo cada corrida (columna trabajo: evaluaciones de la función
+#                    objetivo); sin esa columna se supone W(p) = p W1.
+#
+# Los dos se ajustan por mínimos cuadrados con todas las corridas. Las bandas de confianza
+# (95 %) salen de remuestrear las repeticiones de cada número de procesos (bootstrap);
+# sin repeticiones no hay banda.
+
+def ajustar_amdahl(p, t):
+    # T(p) = a + b / p, con a = T1 f y b = T1 (1 - f)
+    (a, b), *_ = np.linalg.lstsq(np.column_stack([np.ones_like(p), 1 / p]), t, rcond=None)
+    return float(np.clip(a / (a + b), 0, 1)), float(a + b)
+
+def ajustar_gustafson(p, t, t1, w, w1):
+    escalado = (w / w1) * t1 / t
+    if not np.any(p > 1):
+        return 0.0
+    return float(np.clip(np.sum((p - escalado) * (p - 1)) / np.sum((p - 1) ** 2), 0, 1))
+
+# T1 medido si hay corridas con un proceso; si no, extrapolado (Amdahl en fuerte, una
+# recta T(p) en débil)
+def tiempo_un_proceso(p, t, modo):
+    if np.any(p == 1):
+        return float(np.median(t[p == 1])), True
+    if modo == "fuerte":
+        return ajustar_amdahl(p, t)[1], False
+    (a, b), *_ = np.linalg.lstsq(np.column_stack([np.ones_like(p), p]), t, rcond=None)
+    return float(a + b), False
+
+# Trabajo de un proceso: el medido con p = 1 o, si no hay, el de la menor p repartido
+def trabajo_un_proceso(p, w):
+    base = 1 if np.any(p == 1) else p.min()
+    return float(np.median(w[p == base])) / base
+
+def ajustar(p, t, modo, w=None):
+    if modo == "fuerte":
+        return ajustar_amdahl(p, t)[0]
+    w = p if w is None else w
+    t1, _ = tiempo_un_proceso(p, t, modo)
+    return ajustar_gustafson(p, t, t1, w, trabajo_un_proceso(p, w))
+
+def modelo(fraccion, p, modo):
+    return 1 / (fraccion + (1 - fraccion) / p) if modo == "fuerte" else p - fraccion * (p - 1)
+
+# Fracciones ajustadas con las repeticiones remuestreadas dentro de cada número de procesos
+def bootstrap(p, t, modo, w=None, num_muestras=1000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    grupos = [np.flatnonzero(p == n) for n in np.unique(p)]
+    if all(len(g) == 1 for g in grupos):
+        return None
+    w = p if w is None else w
+    fracciones = []
+    for _ in range(num_muestras):
+        indices = np.concatenate([rng.choice(g, len(g)) for g in grupos])
+        fracciones.append(ajustar(p[indices], t[indices], modo, w[indices]))
+    return np.array(fracciones)
+
+# --- Cargar archivo CSV (por defecto el de grid search; también sirve el que deja
+# Benchmarks/escalamiento.py, con varias repeticiones por número de procesos) ---
+archivo = sys.argv[1] if len(sys.argv) > 1 else "resultados_pso_gridsearch.csv"
 df = pd.read_csv(archivo)
+# Las corridas con ensayos servidos desde la caché (--cache) no miden el tiempo de la búsqueda
+if "ensayos_cache" in df.columns:
+    con_cache = df["ensayos_cache"].fillna(0) > 0
+    if con_cache.any():
+        print(f"Se descartan {int(con_cache.sum())} corridas con ensayos de la caché")
+        df = df[~con_cache]
+modo = df["modo"].iloc[0] if "modo" in df.columns else "fuerte"
+
+p = df["num_procesos"].to_numpy(dtype=float)
+t = df["tiempo"].to_numpy(dtype=float)
+# Trabajo real de cada corrida en débil (el script puede topar el pedido, p. ej. la grilla)
+if modo == "debil" and "trabajo" in df.columns and df["trabajo"].notna().all():
+    w = df["trabajo"].to_numpy(dtype=float)
+else:
+    w = p.copy()
+df = df.assign(trabajo_real=w)
 
 # --- Agrupar por número de procesos (núcleos) y calcular estadísticas ---
-agrupado = df.groupby("num_procesos")["tiempo"].mean().reset_index()
+# (la mediana: con repeticiones, una corrida perturbada no mueve la curva)
+agrupado = df.groupby("num_procesos")[["tiempo", "trabajo_real"]].median().reset_index()
 agrupado = agrupado.sort_values("num_procesos")
 
 # --- Calcular speed-up y eficiencia ---
-t1 = agrupado[agrupado["num_procesos"] == 1]["tiempo"].values[0]
-agrupado["speed_up"] = t1 / agrupado["tiempo"]
+t1, medido = tiempo_un_proceso(p, t, modo)
+if not medido:
+    print(f"No hay corridas con un proceso: T1 = {t1:.3f} s sale del ajuste")
+if modo == "fuerte":
+    agrupado["speed_up"] = t1 / agrupado["tiempo"]
+else:
+    agrupado["speed_up"] = agrupado["trabajo_real"] / trabajo_un_proceso(p, w) * t1 / agrupado["tiempo"]
 agrupado["eficiencia"] = agrupado["speed_up"] / agrupado["num_procesos"]
 
+# --- Ajuste de Amdahl o Gustafson, con banda de confianza ---
+nombre_fraccion = "fracción serial (Amdahl)" if modo == "fuerte" else "fracción serial (Gustafson)"
+fraccion = ajustar(p, t, modo, w)
+fracciones = bootstrap(p, t, modo, w)
+procesos_modelo = np.arange(1, max(64, int(p.max())) + 1)
+curva = modelo(fraccion, procesos_modelo, modo)
+if fracciones is not None:
+    curvas = np.array([modelo(f, procesos_modelo, modo) for f in fracciones])
+    banda = np.percentile(curvas, [2.5, 97.5], axis=0)
+    inf, sup = np.percentile(fracciones, [2.5, 97.5])
+    print(f"{nombre_fraccion}: {fraccion:.4f} (IC 95 %: {inf:.4f} - {sup:.4f})")
+else:
+    banda = None
+    print(f"{nombre_fraccion}: {fraccion:.4f} (sin repeticiones no hay intervalo de confianza)")
+if modo == "fuerte":
+    print(f"Serial: {fraccion * t1:.3f} s de {t1:.3f} s; speed-up máximo 1/f = {1 / fraccion if fraccion > 0 else np.inf:.1f}")
+for n in (32, 64):
+    rango = f" ({banda[0][n - 1]:.1f} - {banda[1][n - 1]:.1f})" if banda is not None else ""
+    print(f"Speed-up esperado con {n} núcleos: {curva[n - 1]:.1f}{rango}")
+
 # --- Graficar ---
-plt.figure(figsize=(16, 5))
+plt.figure(figsize=(21, 5))
+titulo_speed_up = "Speed-up" if modo == "fuerte" else "Speed-up escalado"
 
 # Gráfica 1: Tiempo
-plt.subplot(1, 3, 1)
+plt.subplot(1, 4, 1)
+plt.scatter(df["num_procesos"], df["tiempo"], color="gray", alpha=0.4, s=12)
 plt.plot(agrupado["num_procesos"], agrupado["tiempo"], marker="o")
-plt.title("Tiempo de ejecución")
+plt.title("Tiempo de ejecución" if modo == "fuerte" else "Tiempo de ejecución (trabajo ∝ núcleos)")
 plt.xlabel("Núcleos")
 plt.ylabel("Tiempo (s)")
 plt.grid(True)
 
 # Gráfica 2: Speed-up
-plt.subplot(1, 3, 2)
-plt.plot(agrupado["num_procesos"], agrupado["speed_up"], marker="o", color="green")
-plt.title("Speed-up")
+plt.subplot(1, 4, 2)
+plt.plot(agrupado["num_procesos"], agrupado["speed_up"], marker="o", color="green", label="Medido")
+medidos = procesos_modelo <= agrupado["num_procesos"].max()
+plt.plot(procesos_modelo[medidos], curva[medidos], color="black", linestyle="--", label=f"Ajuste (f = {fraccion:.3f})")
+if banda is not None:
+    plt.fill_between(procesos_modelo[medidos], banda[0][medidos], banda[1][medidos], color="black", alpha=0.15)
+plt.title(titulo_speed_up)
 plt.xlabel("Núcleos")
-plt.ylabel("Speed-up")
+plt.ylabel(titulo_speed_up)
+plt.legend()
 plt.grid(True)
 
 # Gráfica 3: Eficiencia
-plt.subplot(1, 3, 3)
+plt.subplot(1, 4, 3)
 plt.plot(agrupado["num_procesos"], agrupado["eficiencia"], marker="o", color="orange")
 plt.title("Eficiencia")
 plt.xlabel("Núcleos")
 plt.ylabel("Eficiencia")
 plt.grid(True)
 
+# Gráfica 4: Proyección del ajuste
+plt.subplot(1, 4, 4)
+plt.plot(procesos_modelo, procesos_modelo, color="gray", linestyle=":", label="Ideal")
+plt.plot(procesos_modelo, curva, color="black", linestyle="--", label="Amdahl" if modo == "fuerte" else "Gustafson")
+if banda is not None:
+    plt.fill_between(procesos_modelo, banda[0], banda[1], color="black", alpha=0.15, label="IC 95 %")
+plt.plot(agrupado["num_procesos"], agrupado["speed_up"], "o", color="green", label="Medido")
+plt.title(f"Proyección ({titulo_speed_up.lower()})")
+plt.xlabel("Núcleos")
+plt.ylabel(titulo_speed_up)
+plt.legend()
+plt.grid(True)
+
 plt.tight_layout()
 
 # Guardar la figura
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-nombre_archivo = f"graf_grid.png"
+nombre_archivo = f"graf_grid.png" if len(sys.argv) < 2 else os.path.splitext(archivo)[0] + ".png"
 plt.savefig(nombre_archivo, dpi=300)
 
 print(f"Gráficas guardadas como: {nombre_archivo}")
@@ -0,0 +1,60 @@
+import glob
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# --- Cargar el registro de ensayos (.npz) de una búsqueda ---
+# Por defecto toma el más reciente de la carpeta actual; también se puede pasar la ruta
+if len(sys.argv) > 1:
+    archivo = sys.argv[1]
+else:
+    archivo = max(glob.glob("ensayos_*.npz"), key=os.path.getmtime)
+
+with np.load(archivo) as datos:
+    df = pd.DataFrame({
+        col: datos[col]
+        for col in ["indice", "num_particulas", "w", "c1", "c2", "puntaje", "tiempo", "evaluaciones", "proceso"]
+    })
+
+print(f"{archivo}: {len(df)} ensayos")
+print(df.sort_values("puntaje").head(10).to_string(index=False))
+
+param_cols = ["num_particulas", "w", "c1", "c2"]
+
+# --- Puntaje según cada hiperparámetro (mediana y mejor valor) ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 8))
+for i, col in enumerate(param_cols):
+    ax = axs[i // 2, i % 2]
+    agrupado = df.groupby(col)["puntaje"]
+    ax.scatter(df[col], df["puntaje"], alpha=0.3, s=10, label="Ensayos")
+    ax.plot(agrupado.median().index, agrupado.median().values, marker="o", color="orange", label="Mediana")
+    ax.plot(agrupado.min().index, agrupado.min().values, marker="o", color="green", label="Mejor")
+    ax.set_title(f"Puntaje según {col}")
+    ax.set_xlabel(col)
+    ax.set_ylabel("f(x)")
+    ax.grid(True)
+    ax.legend()
+
+plt.tight_layout()
+nombre_grafico = "paisaje_params.png"
+plt.savefig(nombre_grafico, dpi=300)
+print(f"\nGráfico guardado como: {nombre_grafico}")
+
+# --- Mapa de calor w × c1 (mediana del puntaje sobre las demás variables) ---
+tabla = df.pivot_table(index="w", columns="c1", values="puntaje", aggfunc="median")
+plt.figure(figsize=(8, 6))
+plt.imshow(tabla.values, origin="lower", aspect="auto", cmap="viridis")
+plt.colorbar(label="Mediana de f(x)")
+plt.xticks(range(len(tabla.columns)), tabla.columns)
+plt.yticks(range(len(tabla.index)), tabla.index)
+plt.xlabel("c1")
+plt.ylabel("w")
+plt.title("Paisaje de hiperparámetros")
+
+nombre_grafico = "paisaje_w_c1.png"
+plt.savefig(nombre_grafico, dpi=300)
+print(f"Gráfico guardado como: {nombre_grafico}")
+plt.show()
@@ -27,16 +27,43 @@ def funcion_objetivo_con_restricciones(x, r=1e5):
     
     return f + penalizacion
 
+# --- Versión por lotes: recibe (num_particulas, dimensiones) y devuelve (num_particulas,)
+def funcion_objetivo_con_restricciones_lote(posiciones, r=1e5):
+    x1, x2, x3, x4, x5 = posiciones.T
+
+    f = 5.3578547 * x3**2 + 0.8356891 * x1 * x5 + 37.293239 * x1 - 40792.141
+
+    g1 = 85.334407 + 0.0056858*x2*x5 + 0.0006262*x1*x4 - 0.0022053*x3*x5 - 92
+    g2 = -85.334407 - 0.0056858*x2*x5 - 0.0006262*x1*x4 + 0.0022053*x3*x5
+    g3 = 80.51249 + 0.0071317*x2*x5 + 0.0029955*x1*x2 + 0.0021813*x3**2 - 110
+    g4 = -80.51249 - 0.0071317*x2*x5 - 0.0029955*x1*x2 - 0.0021813*x3**2 + 90
+    g5 = 9.300961 + 0.0047026*x3*x5 + 0.0012547*x1*x3 + 0.0019085*x3*x4 - 25
+    g6 = -9.300961 - 0.0047026*x3*x5 - 0.0012547*x1*x3 - 0.0019085*x3*x4 + 20
+
+    restricciones = cp.stack([g1, g2, g3, g4, g5, g6])
+
+    # max(0, g)**2 para todas las partículas a la vez, sin salir de la GPU
+    penalizacion = r * cp.sum(cp.maximum(0, restricciones)**2, axis=0)
+
+    return f + penalizacion
+
+funcion_objetivo_con_restricciones.lote = funcion_objetivo_con_restricciones_lote
+
 # --- Algoritmo PSO
 def ejecutar_pso(funcion, limite_inferior, limite_superior, dimensiones, parametros, max_iteraciones=500):
     num_particulas, w, c1, c2 = parametros
     num_particulas = int(num_particulas)
 
+    # Usa la versión por lotes de la función si existe
+    evaluar = getattr(funcion, "lote", None)
+    if evaluar is None:
+        evaluar = lambda X: cp.array([funcion(p) for p in cp.asnumpy(X)])
+
     posiciones = cp.random.uniform(limite_inferior, limite_superior, (num_particulas, dimensiones))
     velocidades = cp.random.uniform(-1, 1, (num_particulas, dimensiones))
 
     mejor_personal = posiciones.copy()
-    puntajes_personales = cp.array([funcion(p) for p in posiciones])
+    puntajes_personales = evaluar(posiciones)
     mejor_global = mejor_personal[cp.argmin(puntajes_personales)]
     puntaje_global = cp.min(puntajes_personales)
 
@@ -48,7 +75,7 @@ def ejecutar_pso(funcion, limite_inferior, limite_superior, dimensiones, paramet
         posiciones += velocidades
         posiciones = cp.clip(posiciones, limite_inferior, limite_superior)
 
-        nuevos_puntajes = cp.array([funcion(p) for p in posiciones])
+        nuevos_puntajes = evaluar(posiciones)
         mejora = nuevos_puntajes < puntajes_personales
         mejor_personal[mejora] = posiciones[mejora]
         puntajes_personales[mejora] = nuevos_puntajes[mejora]
@@ -12,16 +12,31 @@ def funcion_objetivo_con_restriccion(x, r=1e5):
     penalizacion = r * (h**2)
     return f + penalizacion
 
+# --- Versión por lotes: recibe (num_particulas, dimensiones) y devuelve (num_particulas,)
+def funcion_objetivo_con_restriccion_lote(posiciones, r=1e5):
+    x = posiciones.T
+    f = x[0]**2 + (x[1] - 1)**2
+    h = x[1] - x[0]**2
+    penalizacion = r * (h**2)
+    return f + penalizacion
+
+funcion_objetivo_con_restriccion.lote = funcion_objetivo_con_restriccion_lote
+
 # --- Algoritmo PSO
 def ejecutar_pso(funcion, limite_inferior, limite_superior, dimensiones, parametros, max_iteraciones=1500):
     num_particulas, w, c1, c2 = parametros
     num_particulas = int(num_particulas)
 
+    # Usa la versión por lotes de la función si existe
+    evaluar = getattr(funcion, "lote", None)
+    if evaluar is None:
+        evaluar = lambda X: cp.array([funcion(p) for p in cp.asnumpy(X)])
+
     posiciones = cp.random.uniform(limite_inferior, limite_superior, (num_particulas, dimensiones))
     velocidades = cp.random.uniform(-1, 1, (num_particulas, dimensiones))
 
     mejor_personal = posiciones.copy()
-    puntajes_personales = cp.array([funcion(p) for p in cp.asnumpy(posiciones)])
+    puntajes_personales = evaluar(posiciones)
     mejor_global = mejor_personal[cp.argmin(puntajes_personales)]
     puntaje_global = cp.min(puntajes_personales)
 
@@ -33,7 +48,7 @@ def ejecutar_pso(funcion, limite_inferior, limite_superior, dimensiones, paramet
         posiciones += velocidades
         posiciones = cp.clip(posiciones, limite_inferior, limite_superior)
 
-        nuevos_puntajes = cp.array([funcion(p) for p in cp.asnumpy(posiciones)])
+        nuevos_puntajes = evaluar(posiciones)
         mejora = nuevos_puntajes < puntajes_personales
         mejor_personal[mejora] = posiciones[mejora]
         puntajes_personales[mejora] = nuevos_puntajes[mejora]
@@ -0,0 +1,2 @@
+# Utilidades compartidas por los scripts de búsqueda de hiperparámetros con PSO.
+# Cada script agrega la carpeta "Código" a sys.path e importa los módulos que necesita.
@@ -0,0 +1,127 @@
+from multiprocessing import Process, Queue
+import time
+
+import numpy as np
+
+# --- PSO con evaluaciones repartidas en procesos, síncrono o asíncrono
+#
+# Los procesos solo evalúan la función objetivo: reciben (partícula, posición) por una cola
+# y devuelven (partícula, puntaje) por otra. El proceso principal lleva el enjambre.
+#
+#   síncrono   cada iteración manda todas las partículas y espera a que vuelvan todas
+#              (barrera) antes de actualizar, como ejecutar_pso
+#   asíncrono  cada partícula se actualiza con el mejor global más reciente y se vuelve a
+#              mandar en cuanto llega su puntaje; ningún proceso espera a los demás
+#
+# Sirve cuando la función es cara (un simulador, por ejemplo): con funciones baratas el
+# costo de las colas domina.
+
+def _evaluador(funcion, tareas, resultados, id_proceso, inicializar):
+    if inicializar is not None:
+        inicializar(id_proceso)
+    while True:
+        tarea = tareas.get()
+        if tarea is None:
+            break
+        particula, posicion = tarea
+        resultados.put((particula, funcion(posicion)))
+
+# inicializar(id_proceso), si se da, corre una vez en cada proceso antes de evaluar (p. ej.
+# para crear el generador propio del proceso, ver semillas.py)
+class PoolEvaluacion:
+    def __init__(self, funcion, num_procesos, inicializar=None):
+        self.tareas = Queue()
+        self.resultados = Queue()
+        self.procesos = [Process(target=_evaluador, args=(funcion, self.tareas, self.resultados, n, inicializar)) for n in range(num_procesos)]
+        for p in self.procesos:
+            p.start()
+
+    def cerrar(self):
+        for _ in self.procesos:
+            self.tareas.put(None)
+        for p in self.procesos:
+            p.join()
+
+# Devuelve un diccionario con puntaje, solucion, evaluaciones, tiempo,
+# evaluaciones_por_segundo y tiempo_objetivo (None si no se llegó a valor_objetivo)
+def ejecutar_pso_distribuido(pool, limites_inf, limites_sup, dimensiones, parametros, max_evaluaciones,
+                             asincrono=True, valor_objetivo=None, rng=None):
+    num_particulas, w, c1, c2 = parametros
+    num_particulas = int(num_particulas)
+    if rng is None:
+        rng = np.random.default_rng()
+    limites_inf = np.broadcast_to(np.asarray(limites_inf, dtype=float), (dimensiones,))
+    limites_sup = np.broadcast_to(np.asarray(limites_sup, dtype=float), (dimensiones,))
+
+    posiciones = rng.uniform(limites_inf, limites_sup, (num_particulas, dimensiones))
+    velocidades = rng.uniform(-1, 1, (num_particulas, dimensiones))
+    mejor_personal = posiciones.copy()
+    puntajes_personales = np.full(num_particulas, np.inf)
+    mejor_global = posiciones[0].copy()
+    puntaje_global = np.inf
+
+    evaluaciones = 0
+    enviadas = 0
+    tiempo_objetivo = None
+    inicio = time.perf_counter()
+
+    def enviar(i):
+        nonlocal enviadas
+        pool.tareas.put((i, posiciones[i].copy()))
+        enviadas += 1
+
+    def registrar(i, puntaje):
+        nonlocal puntaje_global, tiempo_objetivo
+        if puntaje < puntajes_personales[i]:
+            puntajes_personales[i] = puntaje
+            mejor_personal[i] = posiciones[i]
+            if puntaje < puntaje_global:
+                puntaje_global = puntaje
+                mejor_global[:] = posiciones[i]
+                if tiempo_objetivo is None and valor_objetivo is not None and puntaje_global <= valor_objetivo:
+                    tiempo_objetivo = time.perf_counter() - inicio
+
+    def mover(i):
+        r1 = rng.random(dimensiones)
+        r2 = rng.random(dimensiones)
+        velocidades[i] = w * velocidades[i] + c1 * r1 * (mejor_personal[i] - posiciones[i]) + c2 * r2 * (mejor_global - posiciones[i])
+        posiciones[i] = np.clip(posiciones[i] + velocidades[i], limites_inf, limites_sup)
+
+    def terminado():
+        return evaluaciones >= max_evaluaciones or tiempo_objetivo is not None
+
+    if asincrono:
+        for i in range(num_particulas):
+            enviar(i)
+        # Al terminar se dejan de mandar partículas y se recogen las que siguen en vuelo
+        while evaluaciones < enviadas:
+            i, puntaje = pool.resultados.get()
+            evaluaciones += 1
+            registrar(i, puntaje)
+            if not terminado():
+                mover(i)
+                enviar(i)
+    else:
+        while not terminado():
+            for i in range(num_particulas):
+                enviar(i)
+            puntajes = np.empty(num_particulas)
+            for _ in range(num_particulas):
+                i, puntaje = pool.resultados.get()
+                puntajes[i] = puntaje
+                evaluaciones += 1
+            for i in range(num_particulas):
+                registrar(i, puntajes[i])
+            if not terminado():
+                for i in range(num_particulas):
+                    mover(i)
+
+    tiempo = time.perf_counter() - inicio
+    return {
+        "puntaje": float(puntaje_global),
+        "solucion": mejor_global,
+        "evaluaciones": evaluaciones,
+        "tiempo": tiempo,
+        "evaluaciones_por_segundo": evaluaciones / tiempo,
+        "tiempo_objetivo": tiempo_objetivo,
+    }
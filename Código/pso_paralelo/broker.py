@@ -0,0 +1,193 @@
+from multiprocessing.managers import BaseManager
+from collections import deque
+import ipaddress
+import threading
+import secrets
+import socket
+import time
+import os
+
+# --- Reparto de ensayos entre máquinas por TCP
+#
+# El coordinador guarda la lista de tareas y sirve un objeto Coordinador con un
+# BaseManager; los trabajadores (en la misma máquina o en otras) se conectan a
+# (host, puerto) con la misma clave (ver resolver_clave) y piden tareas de a una. Cada trabajador manda un
+# latido cada `plazo / 3` segundos desde un hilo aparte; si el coordinador deja de
+# recibirlos por más de `plazo` segundos da al trabajador por caído y vuelve a encolar
+# las tareas que tenía. Si después llega el resultado de una tarea que ya se entregó,
+# se descarta, así cada tarea cuenta una sola vez.
+#
+#   tomar(trabajador)    (indice, tarea); (None, None) si hay que esperar (quedan
+#                        tareas en otros trabajadores); None si ya no hay trabajo
+
+# --- Clave de autenticación de la conexión
+#
+# El BaseManager intercambia objetos con pickle: quien conozca la clave puede ejecutar
+# código en el coordinador o en los trabajadores, así que no hay clave por defecto.
+# Se toma de `clave` (--clave) o de la variable de entorno PSO_CLAVE. Si no hay ninguna y
+# la dirección es local (127.0.0.1, localhost) el coordinador genera una al azar y la
+# imprime, para pasarla a trabajadores de la misma máquina; en cualquier otra dirección
+# es obligatoria.
+VARIABLE_CLAVE = "PSO_CLAVE"
+
+def es_local(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+def resolver_clave(clave, host, generar=True):
+    clave = clave or os.environ.get(VARIABLE_CLAVE)
+    if clave:
+        return clave.encode() if isinstance(clave, str) else clave
+    if generar and es_local(host):
+        clave = secrets.token_hex(16)
+        print(f"Clave generada para esta corrida (--clave o {VARIABLE_CLAVE}): {clave}")
+        return clave.encode()
+    raise ValueError(f"Falta la clave de la conexión a {host}: pasar --clave o definir {VARIABLE_CLAVE}")
+
+class Coordinador:
+    def __init__(self, tareas, plazo=10.0):
+        self.tareas = list(tareas)
+        self.plazo = plazo
+        self.pendientes = deque(range(len(self.tareas)))
+        self.asignadas = {}
+        self.latidos = {}
+        self.resultados = {}
+        self.autores = {}
+        self.reencoladas = 0
+        self.despedidos = set()
+        self.lock = threading.Lock()
+
+    # Vuelve a encolar las tareas de los trabajadores sin latido reciente (con el lock tomado)
+    def _revisar_caidos(self):
+        ahora = time.time()
+        for indice, trabajador in list(self.asignadas.items()):
+            if ahora - self.latidos.get(trabajador, 0.0) > self.plazo:
+                del self.asignadas[indice]
+                self.pendientes.appendleft(indice)
+                self.reencoladas += 1
+                print(f"[Coordinador] Trabajador {trabajador} sin latido: tarea {indice} vuelve a la cola")
+
+    def latido(self, trabajador):
+        with self.lock:
+            self.latidos[trabajador] = time.time()
+
+    def tomar(self, trabajador):
+        with self.lock:
+            self.latidos[trabajador] = time.time()
+            self._revisar_caidos()
+            while self.pendientes:
+                indice = self.pendientes.popleft()
+                if indice not in self.resultados:
+                    self.asignadas[indice] = trabajador
+                    return indice, self.tareas[indice]
+            if len(self.resultados) < len(self.tareas):
+                return None, None
+            self.despedidos.add(trabajador)
+            return None
+
+    def entregar(self, trabajador, indice, resultado):
+        with self.lock:
+            self.latidos[trabajador] = time.time()
+            if self.asignadas.get(indice) == trabajador:
+                del self.asignadas[indice]
+            if indice not in self.resultados:
+                self.resultados[indice] = resultado
+                self.autores[indice] = trabajador
+
+    def progreso(self):
+        with self.lock:
+            self._revisar_caidos()
+            return len(self.resultados), len(self.tareas)
+
+    # Terminó el trabajo y todos los trabajadores vivos ya recibieron el aviso de fin
+    def cerrado(self):
+        with self.lock:
+            if len(self.resultados) < len(self.tareas):
+                return False
+            ahora = time.time()
+            vivos = {t for t, instante in self.latidos.items() if ahora - instante <= self.plazo}
+            return vivos <= self.despedidos
+
+class _Manager(BaseManager):
+    pass
+
+# --- Lado del coordinador: sirve las tareas en (host, puerto) desde un hilo y espera a que
+# lleguen todos los resultados. Devuelve la lista de resultados en el orden de las tareas y
+# un resumen {trabajador: tareas entregadas, "reencoladas": n}.
+def coordinar(tareas, clave, host="127.0.0.1", puerto=50000, plazo=10.0, intervalo_reporte=5.0):
+    coordinador = Coordinador(tareas, plazo)
+    _Manager.register("coordinador", callable=lambda: coordinador)
+    servidor = _Manager(address=(host, puerto), authkey=clave).get_server()
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    print(f"[Coordinador] Sirviendo {len(coordinador.tareas)} tareas en {host}:{puerto}")
+
+    ultimo_reporte = time.time()
+    while True:
+        hechas, total = coordinador.progreso()
+        if hechas == total:
+            break
+        if time.time() - ultimo_reporte >= intervalo_reporte:
+            print(f"[Coordinador] {hechas}/{total} tareas terminadas")
+            ultimo_reporte = time.time()
+        time.sleep(0.05)
+
+    # Da a los trabajadores vivos un plazo para recibir el aviso de fin antes de apagar el servidor
+    limite = time.time() + plazo
+    while not coordinador.cerrado() and time.time() < limite:
+        time.sleep(0.05)
+
+    resumen = {}
+    for trabajador in coordinador.autores.values():
+        resumen[trabajador] = resumen.get(trabajador, 0) + 1
+    resumen["reencoladas"] = coordinador.reencoladas
+    return [coordinador.resultados[i] for i in range(total)], resumen
+
+# --- Lado del trabajador: pide tareas a (host, puerto) y aplica funcion(tarea) hasta que el
+# coordinador avisa que no queda trabajo (o deja de responder). Devuelve cuántas tareas hizo.
+def trabajar(funcion, trabajador, clave, host="127.0.0.1", puerto=50000, plazo=10.0, espera=0.1):
+    _Manager.register("coordinador")
+    manager = _Manager(address=(host, puerto), authkey=clave)
+
+    # El trabajador puede arrancar antes que el coordinador: reintenta durante `plazo` segundos
+    limite = time.time() + plazo
+    while True:
+        try:
+            manager.connect()
+            break
+        except ConnectionError:
+            if time.time() > limite:
+                raise
+            time.sleep(espera)
+    coordinador = manager.coordinador()
+
+    # Los latidos van por su propio hilo (y su propia conexión), así una tarea larga no
+    # hace que el coordinador dé al trabajador por caído
+    detener = threading.Event()
+    def latir():
+        while not detener.wait(plazo / 3):
+            try:
+                coordinador.latido(trabajador)
+            except (EOFError, ConnectionError):
+                break
+    threading.Thread(target=latir, daemon=True).start()
+
+    hechas = 0
+    try:
+        while True:
+            tarea = coordinador.tomar(trabajador)
+            if tarea is None:
+                break
+            indice, datos = tarea
+            if indice is None:
+                time.sleep(espera)
+                continue
+            coordinador.entregar(trabajador, indice, funcion(datos))
+            hechas += 1
+    except (EOFError, ConnectionError):
+        print(f"[Trabajador {trabajador}] El coordinador ya no responde")
+    finally:
+        detener.set()
+    return hechas
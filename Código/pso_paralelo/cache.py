@@ -0,0 +1,109 @@
+import hashlib
+import inspect
+import json
+import sqlite3
+
+import numpy as np
+
+from .registro import RegistroEnsayos, cargar_ensayos
+
+# --- Caché de ensayos en disco (SQLite)
+#
+# Un ensayo queda identificado por
+#   objetivo         hash de la fuente de la función, los límites, los criterios de parada
+#                    y el backend y el motor que corrieron el ensayo (numpy multiconfig,
+#                    numpy secuencial o numba no se mezclan)
+#   semilla          semilla raíz: el flujo del ensayo sale de ella y de sus hiperparámetros
+#                    (ver semillas.generador_parametros)
+#   hiperparámetros  (num_particulas, w, c1, c2)
+#   max_iteraciones  presupuesto de iteraciones
+#
+# Con la misma clave el resultado es el mismo, así que una búsqueda repetida (la misma
+# grilla con otro num_procesos) o extendida (un valor más de w) solo corre los ensayos que
+# faltan. Los ensayos en caché no cuestan nada, por eso los scripts solo la usan con
+# --cache y anotan los aciertos en el CSV (ensayos_cache).
+
+def identificador_objetivo(funcion, limites, parada=None, backend="numpy", motor="multiconfig"):
+    partes = {
+        "funcion": funcion.__name__,
+        "fuente": inspect.getsource(funcion),
+        "limites": [[float(l) for l in lim] for lim in limites],
+        "parada": vars(parada) if parada is not None else None,
+        "backend": backend,
+        "motor": motor,
+    }
+    return hashlib.sha256(json.dumps(partes, sort_keys=True).encode()).hexdigest()[:16]
+
+class CacheEnsayos:
+    def __init__(self, ruta, objetivo, semilla, max_iteraciones):
+        self.objetivo = objetivo
+        self.semilla = str(semilla)
+        self.max_iteraciones = int(max_iteraciones)
+        self.aciertos = 0
+        self.fallos = 0
+        self.guardados = 0
+        self.conexion = sqlite3.connect(ruta, timeout=60)
+        with self.conexion:
+            self.conexion.execute("""CREATE TABLE IF NOT EXISTS ensayos (
+                objetivo TEXT, semilla TEXT, max_iteraciones INTEGER,
+                num_particulas REAL, w REAL, c1 REAL, c2 REAL,
+                puntaje REAL, solucion BLOB, tiempo REAL, evaluaciones INTEGER, iteraciones INTEGER, motivo TEXT,
+                PRIMARY KEY (objetivo, semilla, max_iteraciones, num_particulas, w, c1, c2))""")
+
+    # {indice: (puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo)} de los que están
+    def buscar(self, combinaciones, indices):
+        cursor = self.conexion.execute(
+            "SELECT num_particulas, w, c1, c2, puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo "
+            "FROM ensayos WHERE objetivo = ? AND semilla = ? AND max_iteraciones = ?",
+            (self.objetivo, self.semilla, self.max_iteraciones))
+        guardados = {tuple(fila[:4]): fila[4:] for fila in cursor}
+
+        encontrados = {}
+        for i in indices:
+            fila = guardados.get(tuple(float(p) for p in combinaciones[i]))
+            if fila is not None:
+                puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo = fila
+                encontrados[i] = (puntaje, np.frombuffer(solucion, dtype=np.float64), tiempo, evaluaciones, iteraciones, motivo)
+        self.aciertos += len(encontrados)
+        self.fallos += len(indices) - len(encontrados)
+        return encontrados
+
+    # --- Saca de los grupos pendientes los ensayos que ya están en la caché: los anota en un
+    # fragmento del registro (con `escribir`; bajo MPI solo un rango) y publica el mejor en el
+    # tablero. Devuelve los grupos con lo que falta correr.
+    def aplicar(self, combinaciones, grupos, tablero, carpeta, id_registro, escribir=True):
+        encontrados = self.buscar(combinaciones, [i for grupo in grupos for i in grupo])
+        if encontrados:
+            if escribir:
+                registro = RegistroEnsayos(carpeta, id_registro)
+                for i, (puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo) in sorted(encontrados.items()):
+                    registro.agregar(i, combinaciones[i], puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo)
+                registro.cerrar()
+            mejor = min(encontrados, key=lambda i: (encontrados[i][0], i))
+            tablero.publicar(encontrados[mejor][0], combinaciones[mejor], encontrados[mejor][1], mejor)
+        if escribir:
+            print(f"Caché de ensayos: {self.aciertos} aciertos, {self.fallos} fallos")
+        return [[i for i in grupo if i not in encontrados] for grupo in grupos]
+
+    # --- Guarda los ensayos de un registro fusionado (los que ya estaban se ignoran)
+    def guardar(self, ruta_ensayos):
+        if ruta_ensayos is None:
+            return
+        datos = cargar_ensayos(ruta_ensayos)
+        filas = [(self.objetivo, self.semilla, self.max_iteraciones,
+                  float(datos["num_particulas"][k]), float(datos["w"][k]), float(datos["c1"][k]), float(datos["c2"][k]),
+                  float(datos["puntaje"][k]), np.asarray(datos["solucion"][k], dtype=np.float64).tobytes(), float(datos["tiempo"][k]),
+                  int(datos["evaluaciones"][k]), int(datos["iteraciones"][k]), str(datos["motivo"][k]))
+                 for k in range(len(datos["indice"]))]
+        with self.conexion:
+            antes = self.conexion.total_changes
+            self.conexion.executemany("INSERT OR IGNORE INTO ensayos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas)
+            self.guardados += self.conexion.total_changes - antes
+
+    def imprimir_resumen(self):
+        total = self.aciertos + self.fallos
+        tasa = self.aciertos / total if total else 0.0
+        print(f"Caché de ensayos: {self.aciertos} aciertos, {self.fallos} fallos ({tasa:.0%}), {self.guardados} ensayos nuevos guardados")
+
+    def cerrar(self):
+        self.conexion.close()
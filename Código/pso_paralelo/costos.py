@@ -0,0 +1,76 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import numpy as np
+
+# --- Modelo de costo de una corrida de PSO:
+#     tiempo ≈ fijo + por_particula_iteracion * num_particulas * max_iteraciones
+# "fijo" es el overhead por llamada (inicialización, arreglos, Python) y el otro término
+# el trabajo real del enjambre, que crece lineal con partículas × iteraciones.
+class ModeloCosto:
+    def __init__(self, fijo, por_particula_iteracion, equipo=None, fecha=None):
+        self.fijo = fijo
+        self.por_particula_iteracion = por_particula_iteracion
+        self.equipo = equipo if equipo is not None else platform.node()
+        self.fecha = fecha if fecha is not None else datetime.now().isoformat(timespec="seconds")
+
+    def estimar(self, params, max_iteraciones):
+        return self.fijo + self.por_particula_iteracion * int(params[0]) * max_iteraciones
+
+    def guardar(self, ruta):
+        with open(ruta, "w") as archivo:
+            json.dump({
+                "fijo": self.fijo,
+                "por_particula_iteracion": self.por_particula_iteracion,
+                "equipo": self.equipo,
+                "fecha": self.fecha,
+            }, archivo, indent=2)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta) as archivo:
+            datos = json.load(archivo)
+        return cls(datos["fijo"], datos["por_particula_iteracion"], datos.get("equipo"), datos.get("fecha"))
+
+# --- Mide corridas cortas y ajusta el modelo por mínimos cuadrados.
+# ejecutar(params, iteraciones) debe correr PSO igual que lo hacen los procesos de la búsqueda.
+# Se prueba cada número de partículas con dos presupuestos de iteraciones para poder separar
+# el costo fijo del costo por partícula-iteración; de cada medición se toma el mínimo de
+# varias repeticiones para quitar ruido.
+def calibrar(ejecutar, valores_particulas, max_iteraciones, repeticiones=3):
+    presupuestos = sorted({max(1, max_iteraciones // 10), max(2, max_iteraciones // 4)})
+    filas = []
+    tiempos = []
+    for num_particulas in sorted(set(int(p) for p in valores_particulas)):
+        for iteraciones in presupuestos:
+            params = (num_particulas, 0.5, 1.5, 1.5)
+            mediciones = []
+            for _ in range(repeticiones):
+                t0 = time.perf_counter()
+                ejecutar(params, iteraciones)
+                mediciones.append(time.perf_counter() - t0)
+            filas.append([1.0, num_particulas * iteraciones])
+            tiempos.append(min(mediciones))
+
+    (fijo, pendiente), *_ = np.linalg.lstsq(np.array(filas), np.array(tiempos), rcond=None)
+    # Un ajuste con ruido puede dar coeficientes negativos; el costo nunca lo es
+    return ModeloCosto(max(float(fijo), 0.0), max(float(pendiente), 1e-12))
+
+# --- Reutiliza el modelo guardado si fue medido en este mismo equipo; si no, calibra y lo guarda
+def obtener_modelo_costos(ruta, ejecutar, valores_particulas, max_iteraciones):
+    if os.path.exists(ruta):
+        modelo = ModeloCosto.cargar(ruta)
+        if modelo.equipo == platform.node():
+            print(f"Modelo de costos cargado de {ruta} (medido el {modelo.fecha})")
+            return modelo
+        print(f"El modelo de costos de {ruta} se midió en otro equipo ({modelo.equipo}); se recalibra")
+
+    print("Calibrando modelo de costos...")
+    modelo = calibrar(ejecutar, valores_particulas, max_iteraciones)
+    modelo.guardar(ruta)
+    print(f"  costo ≈ {modelo.fijo * 1e3:.3f} ms + {modelo.por_particula_iteracion * 1e6:.3f} µs × partículas × iteraciones")
+    print(f"  Guardado en {ruta}")
+    return modelo
@@ -0,0 +1,252 @@
+from multiprocessing import Array
+from contextlib import contextmanager
+import csv
+import glob
+import json
+import os
+import time
+
+from .registro import extender_csv
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# --- Tiempos por fase de cada proceso de la búsqueda
+#
+#   arranque      desde que el programa lanza los procesos hasta que este toma su primer bloque
+#   pso           dentro de ejecutar_pso / ejecutar_pso_multiconfig
+#   evaluacion    dentro de la función objetivo (parte de pso; el resto es la actualización
+#                 del enjambre). Con el backend numba todo el ciclo está compilado y no se separa.
+#   candado       esperando el lock compartido
+#   tablero       publicando en el tablero del mejor global (memoria compartida)
+#   cpu           tiempo de CPU (usuario + sistema, getrusage) del proceso entre que empieza y
+#                 termina su parte; cpu / pared muy por debajo de 1 indica más procesos que núcleos
+#
+# y el trabajo hecho: evaluaciones de la función objetivo (partículas por iteración, más la
+# evaluación inicial) e iteraciones de PSO. evaluaciones / pso es el rendimiento del proceso
+# (eval/s), comparable entre corridas con distinto max_iteraciones o número de partículas.
+#
+# Cada proceso acumula en variables locales (FasesProceso) y escribe su fila en el arreglo
+# compartido una sola vez, al terminar.
+#
+# --- Traza (opcional, con carpeta_traza)
+#
+# Cada proceso además guarda en memoria un evento por bloque o ensayo, por espera en la
+# cola, por espera y uso del candado y por publicación en el tablero, y al terminar escribe
+# su lista en carpeta_traza/traza_pNNN.json. escribir_traza() las junta en un archivo en
+# formato Chrome Trace Event (se abre en https://ui.perfetto.dev o chrome://tracing), con
+# una fila por proceso: ahí se ven directamente los procesos que terminan tarde.
+
+_ARRANQUE, _PSO, _EVALUACION, _CANDADO, _TABLERO, _CPU_USUARIO, _CPU_SISTEMA, _PARED, _EVALUACIONES, _ITERACIONES = range(10)
+_CAMPOS = 10
+
+def _uso_cpu():
+    if resource is not None:
+        uso = resource.getrusage(resource.RUSAGE_SELF)
+        return uso.ru_utime, uso.ru_stime
+    tiempos = os.times()
+    return tiempos.user, tiempos.system
+
+class TiemposFases:
+    # Crearlo justo antes de lanzar los procesos: el arranque se mide desde aquí
+    def __init__(self, num_procesos, carpeta_traza=None):
+        self.num_procesos = num_procesos
+        self.carpeta_traza = carpeta_traza
+        self.datos = Array('d', _CAMPOS * num_procesos)
+        self.lanzamiento = time.time()
+
+    # Con MPI cada rango llenó solo su fila: se juntan en el rango 0
+    def juntar(self, comm):
+        base = _CAMPOS * comm.rank
+        filas = comm.gather(list(self.datos[base:base + _CAMPOS]), root=0)
+        if filas is not None:
+            self.datos = [valor for fila in filas for valor in fila]
+
+    def resumen(self):
+        filas = []
+        for n in range(self.num_procesos):
+            valores = self.datos[_CAMPOS * n:_CAMPOS * (n + 1)]
+            cpu = valores[_CPU_USUARIO] + valores[_CPU_SISTEMA]
+            filas.append({
+                "proceso": n,
+                "arranque": valores[_ARRANQUE],
+                "pso": valores[_PSO],
+                "evaluacion": valores[_EVALUACION],
+                "actualizacion": max(0.0, valores[_PSO] - valores[_EVALUACION]) if valores[_EVALUACION] else 0.0,
+                "candado": valores[_CANDADO],
+                "tablero": valores[_TABLERO],
+                "cpu_usuario": valores[_CPU_USUARIO],
+                "cpu_sistema": valores[_CPU_SISTEMA],
+                "pared": valores[_PARED],
+                "cpu_pared": cpu / valores[_PARED] if valores[_PARED] > 0 else 0.0,
+                "evaluaciones": int(valores[_EVALUACIONES]),
+                "iteraciones": int(valores[_ITERACIONES]),
+                "evaluaciones_por_segundo": valores[_EVALUACIONES] / valores[_PSO] if valores[_PSO] > 0 else 0.0,
+            })
+        return filas
+
+    # (evaluaciones, iteraciones) de todos los procesos
+    def totales(self):
+        filas = self.resumen()
+        return sum(f["evaluaciones"] for f in filas), sum(f["iteraciones"] for f in filas)
+
+    def imprimir_resumen(self):
+        filas = self.resumen()
+        print("\nTiempos por fase (s):")
+        print(f"  {'Proceso':>7} {'Arranque':>8} {'PSO':>8} {'Evaluación':>10} {'Actualización':>13} {'Candado':>8} "
+              f"{'Tablero':>8} {'CPU':>8} {'Pared':>8} {'CPU/pared':>9} {'Evaluaciones':>12} {'Eval/s':>10}")
+        for f in filas:
+            print(f"  {f['proceso']:>7} {f['arranque']:>8.3f} {f['pso']:>8.3f} {f['evaluacion']:>10.3f} {f['actualizacion']:>13.3f} "
+                  f"{f['candado']:>8.4f} {f['tablero']:>8.4f} {f['cpu_usuario'] + f['cpu_sistema']:>8.3f} {f['pared']:>8.3f} {f['cpu_pared']:>9.2f} "
+                  f"{f['evaluaciones']:>12} {f['evaluaciones_por_segundo']:>10.0f}")
+        activas = [f for f in filas if f["pared"] > 0]
+        if activas and min(f["cpu_pared"] for f in activas) < 0.8:
+            print(f"  CPU/pared bajo: {self.num_procesos} procesos para {os.cpu_count()} núcleos, probablemente sobresuscritos")
+        return filas
+
+    # --- Agrega las filas a un CSV junto al de resultados (<nombre>_fases.csv); `corrida`
+    # identifica la ejecución (la carpeta de ensayos)
+    def guardar(self, nombre_csv, corrida):
+        ruta = os.path.splitext(nombre_csv)[0] + "_fases.csv"
+        filas = self.resumen()
+        encabezado = ["corrida", "num_procesos", *filas[0]]
+        extender_csv(ruta, encabezado)
+        existe = os.path.exists(ruta)
+        with open(ruta, mode='a', newline='') as archivo:
+            writer = csv.DictWriter(archivo, fieldnames=encabezado)
+            if not existe:
+                writer.writeheader()
+            for fila in filas:
+                writer.writerow({"corrida": corrida, "num_procesos": self.num_procesos, **{c: round(v, 6) for c, v in fila.items()}})
+        return ruta
+
+    # --- Junta las trazas de los procesos en `ruta` (y borra las partes); None sin traza
+    def escribir_traza(self, ruta):
+        if self.carpeta_traza is None:
+            return None
+        eventos = []
+        for parte in sorted(glob.glob(os.path.join(self.carpeta_traza, "traza_p*.json"))):
+            with open(parte) as archivo:
+                eventos.extend(json.load(archivo))
+            os.remove(parte)
+        # Tiempos relativos al lanzamiento de los procesos
+        for evento in eventos:
+            if "ts" in evento:
+                evento["ts"] = round(evento["ts"] - self.lanzamiento * 1e6, 1)
+        with open(ruta, "w") as archivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo)
+        return ruta
+
+# --- Lo usa cada proceso; con fases=None mide igual pero no publica nada
+class FasesProceso:
+    def __init__(self, fases, id_proceso):
+        self.fases = fases
+        self.id_proceso = id_proceso
+        self.arranque = None
+        self.pso = 0.0
+        self.evaluacion = 0.0
+        self.candado_espera = 0.0
+        self.tablero = 0.0
+        self.evaluaciones = 0
+        self.iteraciones = 0
+        self._inicio = time.time()
+        self._cpu = _uso_cpu()
+        # Eventos de la traza; los instantes se toman con perf_counter y se pasan a reloj de pared
+        self.eventos = [] if fases is not None and fases.carpeta_traza is not None else None
+        self._desfase = time.time() - time.perf_counter()
+        self._ultimo = None
+        if self.eventos is not None:
+            self.eventos.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": id_proceso, "args": {"name": f"Proceso {id_proceso}"}})
+
+    def evento(self, nombre, inicio, duracion, categoria="busqueda", **args):
+        if self.eventos is not None:
+            self.eventos.append({"name": nombre, "cat": categoria, "ph": "X", "pid": 0, "tid": self.id_proceso,
+                                 "ts": (inicio + self._desfase) * 1e6, "dur": duracion * 1e6, "args": args})
+
+    # Al empezar cada bloque: la primera vez cuenta el arranque; después, lo que esperó la cola
+    def tomar_bloque(self):
+        ahora = time.perf_counter()
+        if self.arranque is None and self.fases is not None:
+            self.arranque = time.time() - self.fases.lanzamiento
+            self.evento("arranque", self.fases.lanzamiento - self._desfase, self.arranque, "cola")
+        elif self._ultimo is not None:
+            self.evento("espera cola", self._ultimo, ahora - self._ultimo, "cola")
+
+    # --- Un bloque del motor multiconfiguración (sus ensayos corren a la vez) o un ensayo suelto,
+    # con las evaluaciones e iteraciones que hizo
+    def bloque(self, indices, combinaciones, inicio, duracion, evaluaciones, iteraciones):
+        self.pso += duracion
+        self.evaluaciones += evaluaciones
+        self.iteraciones += iteraciones
+        self._ultimo = inicio + duracion
+        if self.eventos is not None:
+            self.evento(f"bloque ({len(indices)} ensayos)", inicio, duracion, indices=[int(i) for i in indices],
+                        parametros=[[float(p) for p in params] for params in combinaciones])
+
+    def ensayo(self, indice, params, inicio, duracion, evaluaciones, iteraciones):
+        self.pso += duracion
+        self.evaluaciones += evaluaciones
+        self.iteraciones += iteraciones
+        self._ultimo = inicio + duracion
+        self.evento(f"ensayo {indice}", inicio, duracion, indice=int(indice), parametros=[float(p) for p in params])
+
+    # La función objetivo con su tiempo contado en `evaluacion`; conserva sus versiones
+    # por lotes (medida también) y compilada (ver jit.py)
+    def cronometrar(self, funcion):
+        def medida(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self.evaluacion += time.perf_counter() - t0
+        medida.__name__ = funcion.__name__
+        if getattr(funcion, "lote", None) is not None:
+            medida.lote = self.cronometrar(funcion.lote)
+        if getattr(funcion, "jit", None) is not None:
+            medida.jit = funcion.jit
+        return medida
+
+    @contextmanager
+    def candado(self, lock):
+        t0 = time.perf_counter()
+        with lock:
+            t1 = time.perf_counter()
+            self.candado_espera += t1 - t0
+            try:
+                yield
+            finally:
+                self.evento("espera candado", t0, t1 - t0, "candado")
+                self.evento("candado", t1, time.perf_counter() - t1, "candado")
+
+    def publicar(self, tablero, *mejor):
+        t0 = time.perf_counter()
+        mejoro = tablero.publicar(*mejor)
+        duracion = time.perf_counter() - t0
+        self.tablero += duracion
+        self.evento("tablero", t0, duracion, "candado", mejoro=bool(mejoro), puntaje=float(mejor[0]))
+        return mejoro
+
+    def cerrar(self):
+        if self.fases is None:
+            return
+        if self.eventos is not None:
+            if self._ultimo is not None:
+                self.evento("espera cola", self._ultimo, time.perf_counter() - self._ultimo, "cola")
+            with open(os.path.join(self.fases.carpeta_traza, f"traza_p{self.id_proceso:03d}.json"), "w") as archivo:
+                json.dump(self.eventos, archivo)
+        usuario, sistema = _uso_cpu()
+        fila = [0.0] * _CAMPOS
+        fila[_ARRANQUE] = self.arranque or 0.0
+        fila[_PSO] = self.pso
+        fila[_EVALUACION] = self.evaluacion
+        fila[_CANDADO] = self.candado_espera
+        fila[_TABLERO] = self.tablero
+        fila[_CPU_USUARIO] = usuario - self._cpu[0]
+        fila[_CPU_SISTEMA] = sistema - self._cpu[1]
+        fila[_PARED] = time.time() - self._inicio
+        fila[_EVALUACIONES] = self.evaluaciones
+        fila[_ITERACIONES] = self.iteraciones
+        base = _CAMPOS * self.id_proceso
+        self.fases.datos[base:base + _CAMPOS] = fila
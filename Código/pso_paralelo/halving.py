@@ -0,0 +1,18 @@
+import math
+
+# --- Rondas de successive halving: todas las combinaciones empiezan con pocas iteraciones
+# y en cada ronda sigue solo la mejor 1/eta, con eta veces más iteraciones acumuladas
+# (la última ronda llega justo a max_iteraciones).
+# Devuelve una lista de (combinaciones que corren, iteraciones acumuladas al terminar).
+def plan_halving(num_combinaciones, eta=3, iteraciones_iniciales=20, max_iteraciones=500):
+    plan = []
+    n = num_combinaciones
+    iteraciones = iteraciones_iniciales
+    while True:
+        iteraciones = min(iteraciones, max_iteraciones)
+        plan.append((n, iteraciones))
+        if iteraciones >= max_iteraciones:
+            break
+        n = max(1, math.ceil(n / eta))
+        iteraciones *= eta
+    return plan
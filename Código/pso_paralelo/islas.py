@@ -0,0 +1,112 @@
+from multiprocessing import Process, Queue, Array, Value, Event
+import time
+
+import numpy as np
+
+from .motor import EnjambresMulticonfig
+from .parada import CriteriosParada
+from .semillas import generador_ensayo
+
+# --- Modelo de islas: una sola optimización repartida en varios procesos
+#
+# Cada proceso corre un sub-enjambre (el mismo motor que ejecutar_pso_multiconfig con una
+# sola combinación) y cada `intervalo` iteraciones publica sus `num_migrantes` mejores
+# partículas en su casilla de memoria compartida y lee las de sus vecinas. Los migrantes
+# reemplazan a las peores partículas de la isla si son mejores que ellas. La migración no
+# espera a nadie: cada isla lee lo último que publicó cada vecina, así una isla que terminó
+# antes no deja bloqueadas a las demás.
+#
+#   topologia "anillo"    la isla i recibe de la i - 1
+#             "completa"  cada isla recibe de todas las demás
+#
+# La isla i de la repetición r usa el flujo generador_ensayo(semilla, r, i): con una sola
+# semilla raíz, las repeticiones y las islas nunca comparten números aleatorios.
+
+def vecinas(isla, num_islas, topologia):
+    if num_islas == 1:
+        return []
+    if topologia == "anillo":
+        return [(isla - 1) % num_islas]
+    if topologia == "completa":
+        return [j for j in range(num_islas) if j != isla]
+    raise ValueError(f"Topología desconocida: {topologia}")
+
+# Reemplaza las peores partículas (por mejor personal) por los migrantes que las mejoran
+def recibir_migrantes(enjambres, posiciones, puntajes):
+    p = enjambres.num_particulas[0]
+    peores = np.argsort(enjambres.puntajes_personales[0, :p])[::-1]
+    for j, x, puntaje in zip(peores, posiciones, puntajes):
+        if puntaje < enjambres.puntajes_personales[0, j]:
+            enjambres.posiciones[0, j] = x
+            enjambres.mejor_personal[0, j] = x
+            enjambres.puntajes_personales[0, j] = puntaje
+    mejor = np.argmin(puntajes)
+    if puntajes[mejor] < enjambres.puntaje_global[0]:
+        enjambres.fijar_mejor_global(0, puntajes[mejor], posiciones[mejor])
+
+def _isla(isla, num_islas, funcion_lote, limites_inf, limites_sup, dimensiones, parametros, max_iteraciones,
+          intervalo, topologia, num_migrantes, valor_objetivo, semilla, repeticion, casillas, terminado, instante_objetivo, resultados):
+    ancho = num_migrantes * (dimensiones + 1)
+    parada = CriteriosParada(valor_objetivo=valor_objetivo) if valor_objetivo is not None else None
+    enjambres = EnjambresMulticonfig(funcion_lote, limites_inf, limites_sup, dimensiones, [parametros],
+                                     generadores=[generador_ensayo(semilla, repeticion, isla)])
+    origenes = vecinas(isla, num_islas, topologia)
+    iteraciones = 0
+
+    while iteraciones < max_iteraciones and not terminado.is_set():
+        enjambres.avanzar(min(intervalo, max_iteraciones - iteraciones), parada)
+        iteraciones = int(enjambres.iteraciones[0])
+
+        # El motor retira la combinación cuando llega al valor objetivo
+        if len(enjambres.ids) == 0:
+            with instante_objetivo.get_lock():
+                if instante_objetivo.value == 0:
+                    instante_objetivo.value = time.time()
+            terminado.set()
+            break
+
+        # Publicar los mejores de la isla: [puntaje, x...] por migrante
+        p = enjambres.num_particulas[0]
+        mejores = np.argsort(enjambres.puntajes_personales[0, :p])[:num_migrantes]
+        bloque = np.column_stack([enjambres.puntajes_personales[0, mejores], enjambres.mejor_personal[0, mejores]])
+        with casillas.get_lock():
+            casillas[isla * ancho:(isla + 1) * ancho] = bloque.ravel().tolist()
+            llegadas = [np.array(casillas[j * ancho:(j + 1) * ancho]).reshape(num_migrantes, dimensiones + 1) for j in origenes]
+        for llegada in llegadas:
+            recibir_migrantes(enjambres, llegada[:, 1:], llegada[:, 0])
+
+    puntajes, soluciones, _, iteraciones = enjambres.resultados()
+    resultados.put((isla, float(puntajes[0]), soluciones[0], int(iteraciones[0])))
+
+# --- Corre la optimización en `num_islas` procesos. Devuelve un diccionario con puntaje,
+# solucion, tiempo, tiempo_objetivo (None si ninguna isla llegó) e iteraciones por isla.
+def ejecutar_islas(funcion_lote, limites_inf, limites_sup, dimensiones, parametros, num_islas, max_iteraciones,
+                   intervalo=10, topologia="anillo", num_migrantes=1, valor_objetivo=None, semilla=None, repeticion=0):
+    ancho = num_migrantes * (dimensiones + 1)
+    casillas = Array('d', [np.inf] * (num_islas * ancho))
+    terminado = Event()
+    instante_objetivo = Value('d', 0.0)
+    resultados = Queue()
+
+    inicio = time.time()
+    procesos = []
+    for isla in range(num_islas):
+        p = Process(target=_isla, args=(isla, num_islas, funcion_lote, limites_inf, limites_sup, dimensiones, parametros,
+                                         max_iteraciones, intervalo, topologia, num_migrantes, valor_objetivo, semilla,
+                                         repeticion, casillas, terminado, instante_objetivo, resultados))
+        p.start()
+        procesos.append(p)
+
+    por_isla = sorted(resultados.get() for _ in range(num_islas))
+    for p in procesos:
+        p.join()
+    fin = time.time()
+
+    _, puntaje, solucion, _ = min(por_isla, key=lambda r: r[1])
+    return {
+        "puntaje": puntaje,
+        "solucion": solucion,
+        "tiempo": fin - inicio,
+        "tiempo_objetivo": instante_objetivo.value - inicio if instante_objetivo.value else None,
+        "iteraciones": [r[3] for r in por_isla],
+    }
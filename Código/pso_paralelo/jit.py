@@ -0,0 +1,152 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_DISPONIBLE = numba is not None
+
+# Motivos de parada en el mismo orden que los códigos que devuelve _pso_nucleo
+_MOTIVOS = ("max_iteraciones", "estancamiento", "diametro", "objetivo")
+
+# --- Backend Numba opcional
+#
+# compilar(funcion) devuelve la función objetivo compilada en modo nopython (o None si
+# Numba no está instalado); los scripts la cuelgan como funcion.jit, igual que funcion.lote.
+# ejecutar_pso_jit corre el mismo algoritmo que ejecutar_pso en un solo ciclo compilado
+# que llama a la función objetivo sin pasar por Python.
+#
+# cache=True guarda la función objetivo compilada en el __pycache__ de su script, así las
+# corridas siguientes la cargan del disco. El ciclo (_pso_nucleo) no se guarda: recibe la
+# función objetivo como argumento y su caché, compartida por todos los scripts, haría
+# referencia al módulo del primero que lo compiló, que los demás no pueden importar. Se
+# compila una vez por proceso y función objetivo (preparar_backend lo hace antes de lanzar
+# los procesos, que lo heredan).
+def compilar(funcion):
+    if numba is None:
+        return None
+    return numba.njit(cache=True)(funcion)
+
+# Mismo orden de operaciones y de sorteos que ejecutar_pso + kernel.py, así con el mismo
+# generador los dos backends dan el mismo resultado
+def _pso_nucleo(objetivo, limites_inf, limites_sup, num_particulas, w, c1, c2, max_iteraciones, rng,
+                valor_objetivo, tol_diametro, ventana_estancamiento, tol_estancamiento):
+    dimensiones = limites_inf.shape[0]
+    posiciones = np.empty((num_particulas, dimensiones))
+    velocidades = np.empty((num_particulas, dimensiones))
+    for i in range(num_particulas):
+        for d in range(dimensiones):
+            posiciones[i, d] = rng.uniform(limites_inf[d], limites_sup[d])
+    for i in range(num_particulas):
+        for d in range(dimensiones):
+            velocidades[i, d] = rng.uniform(-1.0, 1.0)
+
+    mejor_personal = posiciones.copy()
+    puntajes_personales = np.empty(num_particulas)
+    for i in range(num_particulas):
+        puntajes_personales[i] = objetivo(posiciones[i])
+    mejor = np.argmin(puntajes_personales)
+    mejor_global = mejor_personal[mejor].copy()
+    puntaje_global = puntajes_personales[mejor]
+
+    r1 = np.empty((num_particulas, dimensiones))
+    r2 = np.empty((num_particulas, dimensiones))
+    nuevos_puntajes = np.empty(num_particulas)
+    referencia = puntaje_global
+    sin_mejora = 0
+    codigo = 0
+    iteraciones = 0
+
+    for iteraciones in range(1, max_iteraciones + 1):
+        for i in range(num_particulas):
+            for d in range(dimensiones):
+                r1[i, d] = rng.random()
+        for i in range(num_particulas):
+            for d in range(dimensiones):
+                r2[i, d] = rng.random()
+
+        for i in range(num_particulas):
+            for d in range(dimensiones):
+                v = velocidades[i, d] * w
+                v = v + (mejor_personal[i, d] - posiciones[i, d]) * r1[i, d] * c1
+                v = v + (mejor_global[d] - posiciones[i, d]) * r2[i, d] * c2
+                velocidades[i, d] = v
+                posiciones[i, d] = min(max(posiciones[i, d] + v, limites_inf[d]), limites_sup[d])
+
+        for i in range(num_particulas):
+            nuevos_puntajes[i] = objetivo(posiciones[i])
+            if nuevos_puntajes[i] < puntajes_personales[i]:
+                puntajes_personales[i] = nuevos_puntajes[i]
+                mejor_personal[i] = posiciones[i]
+
+        mejor = np.argmin(nuevos_puntajes)
+        if nuevos_puntajes[mejor] < puntaje_global:
+            mejor_global[:] = posiciones[mejor]
+            puntaje_global = nuevos_puntajes[mejor]
+
+        # Criterios de parada (ver parada.py); los desactivados llegan como nan / 0
+        if ventana_estancamiento > 0:
+            if puntaje_global < referencia - tol_estancamiento:
+                referencia = puntaje_global
+                sin_mejora = 0
+            else:
+                sin_mejora += 1
+            if sin_mejora >= ventana_estancamiento:
+                codigo = 1
+        if not np.isnan(tol_diametro):
+            diametro = 0.0
+            for d in range(dimensiones):
+                diametro = max(diametro, np.max(posiciones[:, d]) - np.min(posiciones[:, d]))
+            if diametro < tol_diametro:
+                codigo = 2
+        if not np.isnan(valor_objetivo) and puntaje_global <= valor_objetivo:
+            codigo = 3
+        if codigo != 0:
+            break
+
+    return puntaje_global, mejor_global, codigo, iteraciones
+
+if numba is not None:
+    _pso_nucleo = numba.njit(_pso_nucleo)
+
+# --- Misma firma y resultado que ejecutar_pso de los scripts:
+# (puntaje, mejor solución, motivo de parada, iteraciones)
+def ejecutar_pso_jit(objetivo, limites_inf, limites_sup, dimensiones, parametros, max_iteraciones, parada=None, rng=None):
+    num_particulas, w, c1, c2 = parametros
+    if rng is None:
+        rng = np.random.default_rng()
+    limites_inf = np.ascontiguousarray(np.broadcast_to(np.asarray(limites_inf, dtype=float), (dimensiones,)))
+    limites_sup = np.ascontiguousarray(np.broadcast_to(np.asarray(limites_sup, dtype=float), (dimensiones,)))
+
+    valor_objetivo = tol_diametro = np.nan
+    ventana_estancamiento, tol_estancamiento = 0, 0.0
+    if parada is not None:
+        if parada.valor_objetivo is not None:
+            valor_objetivo = parada.valor_objetivo
+        if parada.tol_diametro is not None:
+            tol_diametro = parada.tol_diametro
+        if parada.ventana_estancamiento is not None:
+            ventana_estancamiento = parada.ventana_estancamiento
+        tol_estancamiento = parada.tol_estancamiento
+
+    puntaje, mejor_global, codigo, iteraciones = _pso_nucleo(
+        objetivo, limites_inf, limites_sup, int(num_particulas), float(w), float(c1), float(c2), int(max_iteraciones), rng,
+        float(valor_objetivo), float(tol_diametro), int(ventana_estancamiento), float(tol_estancamiento))
+    return puntaje, mejor_global, _MOTIVOS[codigo], iteraciones
+
+# --- Backend que se va a usar: "numba" solo si se pidió, está instalado y la función tiene
+# versión compilada y compila sin errores; si no, "numpy". Con "numba" compila antes de
+# lanzar los procesos, para que no compile cada uno por su cuenta.
+def preparar_backend(backend, funcion, dimensiones):
+    if backend != "numba":
+        return "numpy"
+    if getattr(funcion, "jit", None) is None:
+        print("Numba no está disponible: se usa el backend numpy")
+        return "numpy"
+    try:
+        ejecutar_pso_jit(funcion.jit, np.zeros(dimensiones), np.ones(dimensiones), dimensiones, (2, 0.5, 1.0, 1.0), 1)
+    except Exception as error:
+        print(f"No se pudo compilar con Numba ({type(error).__name__}: {error}): se usa el backend numpy")
+        return "numpy"
+    return "numba"
@@ -0,0 +1,46 @@
+import numpy as np
+
+# --- Paso de PSO sin reservar memoria
+#
+# Todas las operaciones escriben en arreglos que ya existen: las velocidades y posiciones
+# se actualizan en su lugar y los productos intermedios usan un solo arreglo `temporal`
+# de la misma forma que el enjambre. Sirve igual para un enjambre (P, D) que para K
+# enjambres (K, P, D), siempre que w, c1, c2, mejor_global y los límites se puedan
+# difundir contra esa forma. Para que de verdad no reserve nada, los que no son escalares
+# tienen que venir ya con la forma del enjambre (ver expandir).
+#
+#   velocidades = w * velocidades + c1 * r1 * (mejor_personal - posiciones)
+#                                 + c2 * r2 * (mejor_global - posiciones)
+#   posiciones  = clip(posiciones + velocidades, limites_inf, limites_sup)
+def actualizar_enjambre(posiciones, velocidades, mejor_personal, mejor_global, w, c1, c2, r1, r2, temporal, limites_inf, limites_sup):
+    np.multiply(velocidades, w, out=velocidades)
+
+    np.subtract(mejor_personal, posiciones, out=temporal)
+    np.multiply(temporal, r1, out=temporal)
+    np.multiply(temporal, c1, out=temporal)
+    np.add(velocidades, temporal, out=velocidades)
+
+    np.subtract(mejor_global, posiciones, out=temporal)
+    np.multiply(temporal, r2, out=temporal)
+    np.multiply(temporal, c2, out=temporal)
+    np.add(velocidades, temporal, out=velocidades)
+
+    np.add(posiciones, velocidades, out=posiciones)
+    np.clip(posiciones, limites_inf, limites_sup, out=posiciones)
+
+# --- Copia de `arreglo` con la forma completa del enjambre
+#
+# Cuando un operando se difunde (límites (D,), mejor global (D,) o (K, 1, D), w (K, 1, 1))
+# NumPy recorre la operación por partes y reserva un buffer propio para ese operando en
+# cada llamada, unos 64 KB por operando con enjambres grandes. Con operandos contiguos de
+# la misma forma no reserva nada: se expanden una vez al crear el enjambre y el mejor
+# global se copia al suyo solo cuando cambia.
+def expandir(arreglo, forma):
+    return np.broadcast_to(np.asarray(arreglo, dtype=float), forma).copy()
+
+# --- Actualiza el mejor personal de las partículas que mejoraron (mejora es un buffer bool
+# con la forma de los puntajes)
+def actualizar_mejores(posiciones, puntajes, mejor_personal, puntajes_personales, mejora):
+    np.less(puntajes, puntajes_personales, out=mejora)
+    np.copyto(puntajes_personales, puntajes, where=mejora)
+    np.copyto(mejor_personal, posiciones, where=mejora[..., None])
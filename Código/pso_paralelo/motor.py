@@ -0,0 +1,250 @@
+import numpy as np
+
+from .kernel import actualizar_enjambre, actualizar_mejores, expandir
+
+# --- K enjambres (uno por combinación de hiperparámetros) avanzando como un solo tensor
+#
+# Las posiciones viven en un arreglo (K, max_particulas, dimensiones). Las combinaciones
+# con menos partículas se rellenan hasta max_particulas y la máscara marca qué filas son
+# partículas reales; las de relleno siempre puntúan inf, así que nunca son mejor personal
+# ni mejor global.
+#
+# Con criterios de parada, las combinaciones que terminan se retiran del tensor (su
+# resultado se guarda aparte) para que el resto de la corrida no gaste tiempo en ellas.
+#
+# Cada combinación sortea con su propio Generator (ver semillas.py) y en el mismo orden
+# que ejecutar_pso, así su resultado no depende de con qué otras combinaciones comparte
+# el tensor. Las combinaciones sin generador (None o sin lista) reciben uno nuevo.
+class EnjambresMulticonfig:
+    def __init__(self, funcion_lote, limites_inf, limites_sup, dimensiones, configuraciones, estados=None, generadores=None):
+        configuraciones = np.asarray(configuraciones, dtype=float).reshape(-1, 4)
+        self.funcion_lote = funcion_lote
+        self.dimensiones = dimensiones
+        self.limites_inf = np.broadcast_to(np.asarray(limites_inf, dtype=float), (dimensiones,))
+        self.limites_sup = np.broadcast_to(np.asarray(limites_sup, dtype=float), (dimensiones,))
+
+        self.num_particulas = configuraciones[:, 0].astype(int)
+        K = len(configuraciones)
+        P = int(self.num_particulas.max())
+        self.forma = (K, P, dimensiones)
+        # w, c1 y c2 de cada combinación repetidos sobre sus (P, D), así el paso no
+        # difunde ningún operando (ver expandir en kernel.py)
+        self.w = expandir(configuraciones[:, 1][:, None, None], self.forma)
+        self.c1 = expandir(configuraciones[:, 2][:, None, None], self.forma)
+        self.c2 = expandir(configuraciones[:, 3][:, None, None], self.forma)
+        self.mascara = np.arange(P)[None, :] < self.num_particulas[:, None]
+        self.indices = np.arange(K)
+
+        # Posición de cada fila activa en la lista original de configuraciones
+        self.ids = np.arange(K)
+        self.iteraciones = np.zeros(K, dtype=int)
+        self.motivos = np.full(K, "max_iteraciones", dtype=object)
+        self.puntajes_finales = np.full(K, np.inf)
+        self.soluciones_finales = np.zeros((K, dimensiones))
+        self.seguimiento = None
+
+        self.generadores = np.empty(K, dtype=object)
+        for k in range(K):
+            rng = generadores[k] if generadores is not None else None
+            self.generadores[k] = rng if rng is not None else np.random.default_rng()
+
+        # Las partículas de relleno quedan en el límite inferior con velocidad 0
+        self.posiciones = np.broadcast_to(self.limites_inf, self.forma).copy()
+        self.velocidades = np.zeros(self.forma)
+        for k, rng in enumerate(self.generadores):
+            p = self.num_particulas[k]
+            self.posiciones[k, :p] = rng.uniform(self.limites_inf, self.limites_sup, (p, dimensiones))
+            self.velocidades[k, :p] = rng.uniform(-1, 1, (p, dimensiones))
+        self.mejor_personal = self.posiciones.copy()
+        self.puntajes_personales = np.full((K, P), np.inf)
+
+        # Buffers del paso de PSO (ver kernel.py); en el relleno r1 = r2 = 0, así esas
+        # partículas no se mueven
+        self.r1 = np.zeros(self.forma)
+        self.r2 = np.zeros(self.forma)
+        self.temporal = np.empty(self.forma)
+        self.mejora = np.empty((K, P), dtype=bool)
+        self.inferior = expandir(self.limites_inf, self.forma)
+        self.superior = expandir(self.limites_sup, self.forma)
+
+        # Las combinaciones con estado guardado (ver estados()) continúan donde quedaron;
+        # solo se evalúan las posiciones iniciales de las nuevas
+        nuevas = np.ones(K, dtype=bool)
+        for k, estado in enumerate(estados if estados is not None else []):
+            if estado is None:
+                continue
+            p = self.num_particulas[k]
+            self.posiciones[k, :p] = estado["posiciones"]
+            self.velocidades[k, :p] = estado["velocidades"]
+            self.mejor_personal[k, :p] = estado["mejor_personal"]
+            self.puntajes_personales[k, :p] = estado["puntajes_personales"]
+            self.iteraciones[k] = estado["iteraciones"]
+            self.generadores[k] = estado["generador"]
+            nuevas[k] = False
+        if nuevas.any():
+            self.puntajes_personales[nuevas] = self.evaluar(self.posiciones[nuevas], self.mascara[nuevas])
+
+        mejores = np.argmin(self.puntajes_personales, axis=1)
+        self.mejor_global = self.mejor_personal[self.indices, mejores]
+        self.puntaje_global = self.puntajes_personales[self.indices, mejores]
+        # El mejor global de cada combinación repetido sobre sus partículas
+        self.atractor = expandir(self.mejor_global[:, None, :], self.forma)
+
+    # --- Evalúa todas las partículas de todas las combinaciones en una sola llamada
+    def evaluar(self, posiciones, mascara=None):
+        mascara = self.mascara if mascara is None else mascara
+        K, P, D = posiciones.shape
+        puntajes = np.asarray(self.funcion_lote(posiciones.reshape(K * P, D)), dtype=float).reshape(K, P)
+        puntajes[~mascara] = np.inf
+        return puntajes
+
+    # --- Misma actualización que ejecutar_pso, aplicada a las K combinaciones a la vez
+    def avanzar(self, iteraciones, parada=None):
+        # El seguimiento de la parada se conserva entre llamadas con los mismos criterios,
+        # así avanzar por tramos da lo mismo que avanzar de una vez
+        seguimiento = None
+        if parada is not None:
+            if self.seguimiento is None or self.seguimiento.criterios is not parada:
+                self.seguimiento = parada.seguimiento(self.puntaje_global)
+            seguimiento = self.seguimiento
+
+        for _ in range(iteraciones):
+            if len(self.ids) == 0:
+                break
+
+            for fila, rng in enumerate(self.generadores):
+                p = self.num_particulas[fila]
+                rng.random(out=self.r1[fila, :p])
+                rng.random(out=self.r2[fila, :p])
+            actualizar_enjambre(self.posiciones, self.velocidades, self.mejor_personal, self.atractor,
+                                self.w, self.c1, self.c2, self.r1, self.r2, self.temporal, self.inferior, self.superior)
+
+            nuevos_puntajes = self.evaluar(self.posiciones)
+            actualizar_mejores(self.posiciones, nuevos_puntajes, self.mejor_personal, self.puntajes_personales, self.mejora)
+
+            mejores = np.argmin(nuevos_puntajes, axis=1)
+            minimos = nuevos_puntajes[self.indices, mejores]
+            mejora_global = minimos < self.puntaje_global
+            self.puntaje_global[mejora_global] = minimos[mejora_global]
+            self.mejor_global[mejora_global] = self.posiciones[self.indices[mejora_global], mejores[mejora_global]]
+            np.copyto(self.atractor, self.mejor_global[:, None, :], where=mejora_global[:, None, None])
+            self.iteraciones[self.ids] += 1
+
+            if seguimiento is not None:
+                motivos = seguimiento.revisar(self.puntaje_global, self.posiciones, self.mascara)
+                terminados = motivos != ""
+                if terminados.any():
+                    self.retirar(terminados, motivos[terminados])
+                    seguimiento.filtrar(~terminados)
+
+    # --- Cambia el mejor global de una fila desde afuera (p. ej. un migrante, ver islas.py);
+    # el atractor es lo que usa el paso de PSO, así que se actualiza junto con él
+    def fijar_mejor_global(self, fila, puntaje, posicion):
+        self.puntaje_global[fila] = puntaje
+        self.mejor_global[fila] = posicion
+        self.atractor[fila] = posicion
+
+    # --- Guarda el resultado de las combinaciones terminadas y las saca del tensor
+    def retirar(self, terminados, motivos):
+        ids = self.ids[terminados]
+        self.puntajes_finales[ids] = self.puntaje_global[terminados]
+        self.soluciones_finales[ids] = self.mejor_global[terminados]
+        self.motivos[ids] = motivos
+
+        siguen = ~terminados
+        for nombre in ("ids", "num_particulas", "w", "c1", "c2", "generadores", "mascara", "posiciones", "velocidades",
+                       "mejor_personal", "puntajes_personales", "mejor_global", "puntaje_global", "r1", "r2", "temporal", "mejora",
+                       "inferior", "superior", "atractor"):
+            setattr(self, nombre, getattr(self, nombre)[siguen])
+
+        # Si se fueron los enjambres más grandes, también sobra relleno
+        K = len(self.ids)
+        P = int(self.num_particulas.max()) if K else 0
+        if P < self.forma[1]:
+            for nombre in ("mascara", "posiciones", "velocidades", "mejor_personal", "puntajes_personales", "w", "c1", "c2",
+                           "r1", "r2", "temporal", "mejora", "inferior", "superior", "atractor"):
+                setattr(self, nombre, np.ascontiguousarray(getattr(self, nombre)[:, :P]))
+        self.forma = (K, P, self.dimensiones)
+        self.indices = np.arange(K)
+
+    # --- Resultados en el orden original: (puntajes, soluciones, motivos, iteraciones)
+    def resultados(self):
+        puntajes = self.puntajes_finales.copy()
+        soluciones = self.soluciones_finales.copy()
+        puntajes[self.ids] = self.puntaje_global
+        soluciones[self.ids] = self.mejor_global
+        return puntajes, soluciones, self.motivos.copy(), self.iteraciones.copy()
+
+    # --- Estado de cada combinación (sin relleno) para reanudarla después con
+    # EnjambresMulticonfig(..., estados=...). Las combinaciones ya retiradas por la
+    # parada temprana no tienen estado (None).
+    def estados(self):
+        estados = [None] * len(self.iteraciones)
+        for fila, k in enumerate(self.ids):
+            p = self.num_particulas[fila]
+            estados[k] = {
+                "posiciones": self.posiciones[fila, :p].copy(),
+                "velocidades": self.velocidades[fila, :p].copy(),
+                "mejor_personal": self.mejor_personal[fila, :p].copy(),
+                "puntajes_personales": self.puntajes_personales[fila, :p].copy(),
+                "iteraciones": int(self.iteraciones[k]),
+                "generador": self.generadores[fila],
+            }
+        return estados
+
+    # --- Todo lo necesario para continuar la corrida, por combinación y en el orden original
+    # (ver punto_control.py): el estado de las activas, el resultado de las ya retiradas y
+    # el avance de la parada temprana
+    def instantanea(self):
+        puntajes, soluciones, motivos, iteraciones = self.resultados()
+        filas = []
+        for k, estado in enumerate(self.estados()):
+            filas.append({"estado": estado, "puntaje": float(puntajes[k]), "solucion": soluciones[k],
+                          "motivo": motivos[k], "iteraciones": int(iteraciones[k]), "seguimiento": None})
+        if self.seguimiento is not None:
+            for fila, k in enumerate(self.ids):
+                filas[k]["seguimiento"] = (float(self.seguimiento.referencia[fila]), int(self.seguimiento.sin_mejora[fila]))
+        return filas
+
+    # Continúa desde instantanea() en un motor creado con estados=[fila["estado"] ...]:
+    # retira otra vez las combinaciones que ya habían terminado y recupera la parada
+    def restaurar(self, filas, parada=None):
+        retiradas = np.array([fila is not None and fila["estado"] is None for fila in filas])
+        if retiradas.any():
+            self.retirar(retiradas, np.array([fila["motivo"] for fila, r in zip(filas, retiradas) if r], dtype=object))
+        for k, fila in enumerate(filas):
+            if fila is not None and fila["estado"] is None:
+                self.puntajes_finales[k] = fila["puntaje"]
+                self.soluciones_finales[k] = fila["solucion"]
+                self.iteraciones[k] = fila["iteraciones"]
+        if parada is not None and len(self.ids):
+            self.seguimiento = parada.seguimiento(self.puntaje_global)
+            for fila, k in enumerate(self.ids):
+                if filas[k] is not None and filas[k]["seguimiento"] is not None:
+                    self.seguimiento.referencia[fila], self.seguimiento.sin_mejora[fila] = filas[k]["seguimiento"]
+
+# --- Ejecuta PSO para todas las combinaciones.
+# Devuelve (puntajes (K,), soluciones (K, D), motivos de parada (K,), iteraciones usadas (K,))
+#
+# Puntos de control opcionales: con `guardar` avanza por tramos de `paso` iteraciones y
+# llama guardar(enjambres) después de cada uno; con `instantanea` (filas de
+# EnjambresMulticonfig.instantanea(), todas con el mismo avance) sigue desde ahí hasta
+# completar max_iteraciones.
+def ejecutar_pso_multiconfig(funcion_lote, limites_inf, limites_sup, dimensiones, configuraciones, max_iteraciones=50, parada=None, generadores=None,
+                             instantanea=None, guardar=None, paso=50):
+    if len(configuraciones) == 0:
+        return np.empty(0), np.empty((0, dimensiones)), np.empty(0, dtype=object), np.empty(0, dtype=int)
+
+    estados = [fila["estado"] if fila is not None else None for fila in instantanea] if instantanea is not None else None
+    enjambres = EnjambresMulticonfig(funcion_lote, limites_inf, limites_sup, dimensiones, configuraciones, estados=estados, generadores=generadores)
+    if instantanea is not None:
+        enjambres.restaurar(instantanea, parada)
+
+    restantes = max_iteraciones - (int(enjambres.iteraciones[enjambres.ids].max()) if len(enjambres.ids) else max_iteraciones)
+    while restantes > 0 and len(enjambres.ids):
+        tramo = restantes if guardar is None else min(paso, restantes)
+        enjambres.avanzar(tramo, parada)
+        restantes -= tramo
+        if guardar is not None:
+            guardar(enjambres)
+    return enjambres.resultados()
@@ -0,0 +1,172 @@
+import os
+import time
+
+from .tablero import es_mejor
+from .planificador import ColaTareas, bloques_guiados, _CAMPOS, _INICIO, _FIN, _OCUPADO, _ESPERA, _BLOQUES, _TAREAS
+
+# --- Backend MPI (mpi4py) para los scripts de grid y random search
+#
+# Con `mpirun -n N python grid_....py` cada rango corre el script completo. En lugar de
+# lanzar procesos con multiprocessing, cada rango llama una vez a la función de búsqueda
+# con ColaMPI y TableroMPI, que tienen la misma interfaz que ColaTareas y TableroMejor:
+#
+#   dinamico  el rango 0 solo reparte bloques guiados (bloques_guiados) a quien los pide;
+#             los rangos 1..N-1 buscan. Balancea bien cuando los costos varían.
+#   estatico  todos los rangos buscan; el rango 0 reparte los bloques una vez (bcast) y
+#             cada rango se queda con los suyos por turnos. Sin mensajes durante la búsqueda.
+#
+# Al final el mejor (puntaje, parámetros, solución) se junta en el rango 0 con una
+# reducción propia al estilo MPI.MINLOC, y el rango 0 escribe el CSV como siempre
+# (num_procesos = tamaño del comunicador).
+
+_PEDIR, _BLOQUE = 1, 2
+_op_mejor = None
+
+# --- COMM_WORLD si el script se lanzó con mpirun/mpiexec y mpi4py está instalado; si no, None
+# (se mira el entorno antes de importar mpi4py para no inicializar MPI en corridas normales)
+def comunicador():
+    if not any(v in os.environ for v in ("OMPI_COMM_WORLD_SIZE", "PMI_SIZE", "PMIX_RANK")):
+        return None
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        print("mpi4py no está instalado: se usa multiprocessing")
+        return None
+    return MPI.COMM_WORLD
+
+# MINLOC sobre (puntaje, parámetros, solución, índice): se queda con el de menor puntaje y,
+# si empatan, con el de menor índice de ensayo (como TableroMejor)
+def _menor(a, b, tipo=None):
+    return b if es_mejor(b[0], b[3], a[0], a[3]) else a
+
+def operacion_mejor():
+    global _op_mejor
+    if _op_mejor is None:
+        from mpi4py import MPI
+        _op_mejor = MPI.Op.Create(_menor, commute=True)
+    return _op_mejor
+
+class ColaMPI:
+    def __init__(self, comm, modo="dinamico", factor=2, bloque_min=1):
+        self.comm = comm
+        self.num_procesos = comm.size
+        self.modo = modo if comm.size > 1 else "estatico"
+        self.factor = factor
+        self.bloque_min = bloque_min
+        self.maestro = self.modo == "dinamico" and comm.rank == 0
+        self._bloques = []
+        self._propias = [0.0] * _CAMPOS
+
+    # Cuentan las tareas y los costos del rango 0 (los demás pueden pasar costos=None);
+    # indices como en ColaTareas.encolar
+    def encolar(self, tareas, costos=None, indices=None):
+        bloques = None
+        if self.comm.rank == 0:
+            tareas = list(tareas)
+            indices = list(range(len(tareas)) if indices is None else indices)
+            costos = [1] * len(indices) if costos is None else [costos[i] for i in indices]
+            buscadores = self.num_procesos - 1 if self.modo == "dinamico" else self.num_procesos
+            bloques = [[(indices[j], tareas[indices[j]]) for j in bloque]
+                       for bloque in bloques_guiados(costos, buscadores, self.factor, self.bloque_min)]
+        if self.modo == "estatico":
+            bloques = self.comm.bcast(bloques, root=0)
+            self._bloques += bloques[self.comm.rank::self.num_procesos]
+        else:
+            self._bloques += bloques or []
+
+    def cerrar(self):
+        pass
+
+    # --- Rango 0 en modo dinámico: entrega un bloque a cada pedido y después un None por rango
+    def servir(self):
+        from mpi4py import MPI
+        estado = MPI.Status()
+        self._propias[_INICIO] = time.time()
+        pendientes = self._bloques + [None] * (self.num_procesos - 1)
+        for bloque in pendientes:
+            self.comm.recv(source=MPI.ANY_SOURCE, tag=_PEDIR, status=estado)
+            self.comm.send(bloque, dest=estado.Get_source(), tag=_BLOQUE)
+        # El maestro no busca: todo su tiempo cuenta como espera
+        self._propias[_FIN] = time.time()
+        self._propias[_ESPERA] = self._propias[_FIN] - self._propias[_INICIO]
+
+    def _siguiente(self):
+        if self.modo == "estatico":
+            return self._bloques.pop(0) if self._bloques else None
+        self.comm.send(None, dest=0, tag=_PEDIR)
+        return self.comm.recv(source=0, tag=_BLOQUE)
+
+    # Misma interfaz y estadísticas que ColaTareas.bloques
+    def bloques(self, id_proceso):
+        ocupado = espera = 0.0
+        num_bloques = num_tareas = 0
+        self._propias[_INICIO] = time.time()
+        try:
+            while True:
+                t0 = time.perf_counter()
+                bloque = self._siguiente()
+                espera += time.perf_counter() - t0
+                if bloque is None:
+                    break
+
+                t0 = time.perf_counter()
+                yield [i for i, _ in bloque], [tarea for _, tarea in bloque]
+                ocupado += time.perf_counter() - t0
+                num_bloques += 1
+                num_tareas += len(bloque)
+        finally:
+            self._propias[_FIN] = time.time()
+            self._propias[_OCUPADO] = ocupado
+            self._propias[_ESPERA] = espera
+            self._propias[_BLOQUES] = num_bloques
+            self._propias[_TAREAS] = num_tareas
+
+    # Junta en el rango 0 las estadísticas de todos los rangos, con la disposición de ColaTareas
+    def juntar(self):
+        filas = self.comm.gather(self._propias, root=0)
+        if filas is not None:
+            self.estadisticas = [valor for fila in filas for valor in fila]
+
+    resumen = ColaTareas.resumen
+    imprimir_resumen = ColaTareas.imprimir_resumen
+
+# --- Mejor resultado de cada rango; reducir() lo junta en el rango 0
+class TableroMPI:
+    def __init__(self, comm, dimensiones, num_parametros=4):
+        self.comm = comm
+        self.mejor = (float("inf"), [0.0] * num_parametros, [0.0] * dimensiones, float("inf"))
+
+    @property
+    def puntaje(self):
+        return self.mejor[0]
+
+    def leer(self):
+        puntaje, parametros, solucion, _ = self.mejor
+        return float(puntaje), [float(p) for p in parametros], [float(x) for x in solucion]
+
+    def publicar(self, puntaje, parametros, solucion, indice=None):
+        if not es_mejor(puntaje, indice, self.mejor[0], self.mejor[3]):
+            return False
+        self.mejor = (float(puntaje), list(parametros), list(solucion), float("inf") if indice is None else indice)
+        return True
+
+    def reducir(self):
+        mejor = self.comm.reduce(self.mejor, op=operacion_mejor(), root=0)
+        if mejor is not None:
+            self.mejor = mejor
+
+    def liberar(self):
+        pass
+
+# --- Lo que hace cada rango en lugar de lanzar procesos: el maestro reparte, los demás buscan
+def correr_rango(cola, funcion, args):
+    if cola.maestro:
+        cola.servir()
+    else:
+        funcion(*args)
+
+# Junta estadísticas y mejor resultado en el rango 0; devuelve True solo en el rango 0
+def terminar_rango(cola, tablero):
+    cola.juntar()
+    tablero.reducir()
+    return cola.comm.rank == 0
@@ -0,0 +1,60 @@
+import numpy as np
+
+# --- Criterios opcionales de parada temprana para PSO
+#
+#   valor_objetivo         parar cuando el mejor puntaje llega a este valor (óptimo conocido)
+#   tol_diametro           parar cuando el enjambre colapsa: el rango de posiciones en cada
+#                          dimensión es menor que esta tolerancia
+#   ventana_estancamiento  parar si el mejor puntaje no mejora más de tol_estancamiento
+#                          durante tantas iteraciones seguidas
+#
+# Los criterios son solo configuración (se pasan a los procesos); el estado de cada corrida
+# vive en un SeguimientoParada, que funciona igual para 1 enjambre que para K a la vez.
+class CriteriosParada:
+    def __init__(self, valor_objetivo=None, tol_diametro=None, ventana_estancamiento=None, tol_estancamiento=0.0):
+        self.valor_objetivo = valor_objetivo
+        self.tol_diametro = tol_diametro
+        self.ventana_estancamiento = ventana_estancamiento
+        self.tol_estancamiento = tol_estancamiento
+
+    def seguimiento(self, puntajes_globales):
+        return SeguimientoParada(self, puntajes_globales)
+
+class SeguimientoParada:
+    def __init__(self, criterios, puntajes_globales):
+        self.criterios = criterios
+        self.referencia = np.array(puntajes_globales, dtype=float)
+        self.sin_mejora = np.zeros(len(self.referencia), dtype=int)
+
+    # puntajes_globales (K,), posiciones (K, P, D), mascara (K, P) de partículas reales.
+    # Devuelve un arreglo (K,) con el motivo de parada de cada enjambre ("" = seguir).
+    def revisar(self, puntajes_globales, posiciones, mascara=None):
+        c = self.criterios
+        motivos = np.full(len(puntajes_globales), "", dtype=object)
+
+        if c.ventana_estancamiento is not None:
+            mejora = puntajes_globales < self.referencia - c.tol_estancamiento
+            self.referencia[mejora] = puntajes_globales[mejora]
+            self.sin_mejora[mejora] = 0
+            self.sin_mejora[~mejora] += 1
+            motivos[self.sin_mejora >= c.ventana_estancamiento] = "estancamiento"
+
+        if c.tol_diametro is not None:
+            if mascara is None:
+                rango = np.ptp(posiciones, axis=1)
+            else:
+                # Las partículas de relleno no cuentan para el diámetro
+                reales = mascara[:, :, None]
+                rango = (np.max(np.where(reales, posiciones, -np.inf), axis=1)
+                         - np.min(np.where(reales, posiciones, np.inf), axis=1))
+            motivos[np.max(rango, axis=1) < c.tol_diametro] = "diametro"
+
+        if c.valor_objetivo is not None:
+            motivos[puntajes_globales <= c.valor_objetivo] = "objetivo"
+
+        return motivos
+
+    # Conserva solo los enjambres que siguen activos (mismo orden que en el motor)
+    def filtrar(self, siguen):
+        self.referencia = self.referencia[siguen]
+        self.sin_mejora = self.sin_mejora[siguen]
@@ -0,0 +1,152 @@
+from multiprocessing import Process, Queue, Array
+import time
+
+# Campos por proceso en ColaTareas.estadisticas
+_INICIO, _FIN, _OCUPADO, _ESPERA, _BLOQUES, _TAREAS = range(6)
+_CAMPOS = 6
+
+# --- Bloques guiados: cada bloque se lleva una fracción del costo que queda por repartir,
+# así los primeros bloques son grandes (poco overhead) y los últimos pequeños (poca cola).
+# Las tareas se reparten de la más cara a la más barata; sin costos todas valen 1 y se
+# conserva el orden original. Devuelve listas de índices.
+def bloques_guiados(costos, num_procesos, factor=2, bloque_min=1):
+    orden = sorted(range(len(costos)), key=lambda i: -costos[i])
+    restante = float(sum(costos))
+    bloques = []
+    actual = []
+    costo_actual = 0.0
+    for i in orden:
+        actual.append(i)
+        costo_actual += costos[i]
+        if costo_actual >= restante / (factor * num_procesos) and len(actual) >= bloque_min:
+            bloques.append(actual)
+            restante -= costo_actual
+            actual = []
+            costo_actual = 0.0
+    if actual:
+        bloques.append(actual)
+    return bloques
+
+# --- Cola de tareas compartida: los procesos toman bloques hasta que se vacía
+#
+# Cada bloque viaja como una lista de (indice, tarea), donde indice es la posición de
+# la tarea en la lista original. Después de los bloques se encola un None por proceso
+# para avisar que ya no hay trabajo.
+class ColaTareas:
+    def __init__(self, num_procesos, factor=2, bloque_min=1):
+        self.num_procesos = num_procesos
+        self.factor = factor
+        self.bloque_min = bloque_min
+        self.cola = Queue()
+        self.estadisticas = Array('d', _CAMPOS * num_procesos)
+
+    # costos: estimación por tarea (ver costos.ModeloCosto); None = todas cuestan lo mismo.
+    # indices: solo encola esas tareas de la lista (conservan su índice), p. ej. las que
+    # faltan al reanudar una búsqueda
+    def encolar(self, tareas, costos=None, indices=None):
+        tareas = list(tareas)
+        indices = list(range(len(tareas)) if indices is None else indices)
+        costos = [1] * len(indices) if costos is None else [costos[i] for i in indices]
+        for bloque in bloques_guiados(costos, self.num_procesos, self.factor, self.bloque_min):
+            self.cola.put([(indices[j], tareas[indices[j]]) for j in bloque])
+
+    def cerrar(self):
+        for _ in range(self.num_procesos):
+            self.cola.put(None)
+
+    # --- Lo usa cada proceso: entrega (indices, tareas) de cada bloque y mide el tiempo
+    # ocupado (procesando bloques) y el tiempo esperando la cola
+    def bloques(self, id_proceso):
+        base = _CAMPOS * id_proceso
+        ocupado = espera = 0.0
+        num_bloques = num_tareas = 0
+        self.estadisticas[base + _INICIO] = time.time()
+        try:
+            while True:
+                t0 = time.perf_counter()
+                bloque = self.cola.get()
+                espera += time.perf_counter() - t0
+                if bloque is None:
+                    break
+
+                t0 = time.perf_counter()
+                yield [i for i, _ in bloque], [tarea for _, tarea in bloque]
+                ocupado += time.perf_counter() - t0
+                num_bloques += 1
+                num_tareas += len(bloque)
+        finally:
+            self.estadisticas[base + _FIN] = time.time()
+            self.estadisticas[base + _OCUPADO] = ocupado
+            self.estadisticas[base + _ESPERA] = espera
+            self.estadisticas[base + _BLOQUES] = num_bloques
+            self.estadisticas[base + _TAREAS] = num_tareas
+
+    # --- Tiempo ocupado e inactivo de cada proceso respecto a [inicio, fin] de la búsqueda.
+    # Inactivo = arranque tardío + espera en la cola + tiempo parado al final de la búsqueda
+    def resumen(self, inicio, fin):
+        filas = []
+        for n in range(self.num_procesos):
+            base = _CAMPOS * n
+            inicio_n = self.estadisticas[base + _INICIO]
+            fin_n = self.estadisticas[base + _FIN]
+            arranque = max(0.0, inicio_n - inicio)
+            final = max(0.0, fin - fin_n)
+            espera = self.estadisticas[base + _ESPERA]
+            filas.append({
+                "proceso": n,
+                "bloques": int(self.estadisticas[base + _BLOQUES]),
+                "tareas": int(self.estadisticas[base + _TAREAS]),
+                "ocupado": self.estadisticas[base + _OCUPADO],
+                "inactivo": arranque + espera + final,
+                "inactivo_final": final,
+            })
+        return filas
+
+    def imprimir_resumen(self, inicio, fin):
+        filas = self.resumen(inicio, fin)
+        print("\nReparto dinámico de la cola:")
+        print(f"  {'Proceso':>7} {'Bloques':>7} {'Tareas':>6} {'Ocupado (s)':>11} {'Inactivo (s)':>12} {'Inactivo final (s)':>18}")
+        for fila in filas:
+            print(f"  {fila['proceso']:>7} {fila['bloques']:>7} {fila['tareas']:>6} {fila['ocupado']:>11.3f} "
+                  f"{fila['inactivo']:>12.3f} {fila['inactivo_final']:>18.3f}")
+        total = fin - inicio
+        if total > 0:
+            utilizacion = sum(f["ocupado"] for f in filas) / (total * self.num_procesos)
+            print(f"  Utilización: {utilizacion:.1%}")
+        return filas
+
+# --- Procesos persistentes para búsquedas por rondas (successive halving, racing, ...)
+#
+# Los procesos se lanzan una vez y toman bloques de la misma ColaTareas en todas las
+# rondas. El trabajador recibe (id_proceso, cola, resultados, *args), recorre
+# cola.bloques(id_proceso) y por cada bloque pone en `resultados` una lista de
+# (indice, resultado). ejecutar() encola una ronda y espera a que vuelvan todas sus tareas.
+class PoolRondas:
+    def __init__(self, num_procesos, trabajador, args=(), factor=2, bloque_min=1):
+        self.cola = ColaTareas(num_procesos, factor, bloque_min)
+        self.resultados = Queue()
+        self.procesos = []
+        for n in range(num_procesos):
+            p = Process(target=trabajador, args=(n, self.cola, self.resultados, *args))
+            p.start()
+            self.procesos.append(p)
+
+    # Devuelve los resultados en el orden de `tareas`
+    def ejecutar(self, tareas, costos=None):
+        tareas = list(tareas)
+        self.cola.encolar(tareas, costos)
+        salida = [None] * len(tareas)
+        pendientes = len(tareas)
+        while pendientes:
+            for indice, resultado in self.resultados.get():
+                salida[indice] = resultado
+                pendientes -= 1
+        return salida
+
+    def cerrar(self):
+        self.cola.cerrar()
+        for p in self.procesos:
+            p.join()
+
+    def imprimir_resumen(self, inicio, fin):
+        return self.cola.imprimir_resumen(inicio, fin)
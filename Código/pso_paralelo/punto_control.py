@@ -0,0 +1,117 @@
+import glob
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+from .registro import cargar_fragmentos
+
+# --- Puntos de control para reanudar búsquedas largas
+#
+# Los resultados de los ensayos ya quedan en disco en los fragmentos de RegistroEnsayos
+# (renombre atómico, a lo sumo cada `intervalo` segundos). PuntoControl agrega en la
+# misma carpeta:
+#
+#   meta.json         la semilla raíz, para que la corrida reanudada haga el mismo trabajo
+#   estado_pNNN.pkl   el bloque que el proceso NNN tiene a medio correr (motor
+#                     multiconfiguración): se guarda entre tramos de `paso` iteraciones y a
+#                     lo sumo cada `intervalo` segundos. Sirve cuando max_iteraciones es
+#                     grande y un bloque tarda mucho.
+#
+# Al reanudar sobre la misma carpeta se saltan los ensayos que ya están en los fragmentos,
+# el mejor global se reconstruye a partir de ellos y los ensayos con estado guardado siguen
+# desde ahí con su mismo generador, así el resultado es el mismo que sin interrupciones.
+
+def leer_semilla(carpeta):
+    with open(os.path.join(carpeta, "meta.json")) as archivo:
+        return int(json.load(archivo)["semilla"])
+
+# Escribe en un temporal propio del proceso y renombra: el archivo nunca queda a medias
+def _escribir_atomico(ruta, datos):
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(datos)
+    os.replace(temporal, ruta)
+
+class PuntoControl:
+    def __init__(self, carpeta, semilla, intervalo=30.0, estados=True, paso=50):
+        self.carpeta = carpeta
+        self.intervalo = intervalo
+        self.estados = estados
+        self.paso = paso
+        self._ultimo = time.monotonic()
+        os.makedirs(carpeta, exist_ok=True)
+        if not os.path.exists(os.path.join(carpeta, "meta.json")):
+            _escribir_atomico(os.path.join(carpeta, "meta.json"), json.dumps({"semilla": str(semilla)}).encode())
+
+        # Lo que dejó una corrida anterior: ensayos terminados y filas de bloques a medio correr.
+        # Si un ensayo aparece en más de un estado se usa el más avanzado.
+        self.hechos = cargar_fragmentos(carpeta)
+        terminados = set(self.hechos["indice"].tolist()) if self.hechos is not None else set()
+        self.filas = {}
+        for ruta in glob.glob(os.path.join(carpeta, "estado_p*.pkl")):
+            with open(ruta, "rb") as archivo:
+                guardado = pickle.load(archivo)
+            for indice, fila in zip(guardado["indices"], guardado["filas"]):
+                if indice in terminados:
+                    continue
+                if indice not in self.filas or fila["iteraciones"] > self.filas[indice]["iteraciones"]:
+                    self.filas[indice] = fila
+        self.num_hechos = len(terminados)
+
+    # --- Índices que faltan, en grupos que se encolan por separado (cada bloque sale de un
+    # solo grupo): primero los ya terminados dentro de un estado, después los activos
+    # agrupados por iteraciones hechas (del más avanzado al menos) y al final los nuevos
+    def pendientes(self, num_tareas):
+        terminados = set(self.hechos["indice"].tolist()) if self.hechos is not None else set()
+        finales = [i for i, fila in self.filas.items() if fila["estado"] is None]
+        activos = {}
+        for i, fila in self.filas.items():
+            if fila["estado"] is not None:
+                activos.setdefault(fila["iteraciones"], []).append(i)
+        nuevos = [i for i in range(num_tareas) if i not in terminados and i not in self.filas]
+        grupos = [sorted(finales)] + [sorted(activos[t]) for t in sorted(activos, reverse=True)] + [nuevos]
+        return [grupo for grupo in grupos if grupo]
+
+    # --- Publica en el tablero el mejor de los ensayos ya terminados; devuelve cuántos hay
+    def publicar_mejor(self, tablero):
+        if self.hechos is None:
+            return 0
+        # Los ensayos están ordenados por índice: argmin da el de menor índice entre los empatados
+        mejor = int(np.argmin(self.hechos["puntaje"]))
+        parametros = [self.hechos[nombre][mejor] for nombre in ("num_particulas", "w", "c1", "c2")]
+        tablero.publicar(float(self.hechos["puntaje"][mejor]), parametros, self.hechos["solucion"][mejor], int(self.hechos["indice"][mejor]))
+        print(f"Reanudando {self.carpeta}: {self.num_hechos} ensayos ya terminados, {len(self.filas)} a medio correr")
+        return self.num_hechos
+
+    # --- Argumentos extra de ejecutar_pso_multiconfig para un bloque de un proceso
+    def bloque(self, id_proceso, indices):
+        argumentos = {}
+        filas = [self.filas.get(i) for i in indices]
+        if any(fila is not None for fila in filas):
+            argumentos["instantanea"] = filas
+        if self.estados:
+            argumentos["guardar"] = lambda enjambres: self.guardar(id_proceso, indices, enjambres)
+            argumentos["paso"] = self.paso
+        return argumentos
+
+    def guardar(self, id_proceso, indices, enjambres):
+        if time.monotonic() - self._ultimo < self.intervalo:
+            return
+        datos = pickle.dumps({"indices": list(indices), "filas": enjambres.instantanea()})
+        _escribir_atomico(os.path.join(self.carpeta, f"estado_p{id_proceso:03d}.pkl"), datos)
+        self._ultimo = time.monotonic()
+
+    # El proceso ya cerró su registro: sus resultados están en los fragmentos
+    def terminar(self, id_proceso):
+        ruta = os.path.join(self.carpeta, f"estado_p{id_proceso:03d}.pkl")
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+    # Antes de fusionar: la búsqueda terminó y ya no hace falta reanudarla
+    def limpiar(self):
+        for ruta in glob.glob(os.path.join(self.carpeta, "estado_p*.pkl")) + [os.path.join(self.carpeta, "meta.json")]:
+            if os.path.exists(ruta):
+                os.remove(ruta)
@@ -0,0 +1,62 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+# --- F-Race: prueba de Friedman por bloques y descarte post hoc
+#
+# `puntajes` es una matriz (rondas, configuraciones): cada ronda es un bloque en el que
+# todas las configuraciones vivas corrieron una vez. Dentro de cada bloque se ordenan
+# los puntajes (menor = mejor, empates con rango promedio) y se compara la suma de rangos.
+
+def rangos(puntajes):
+    puntajes = np.asarray(puntajes, dtype=float)
+    salida = np.empty_like(puntajes)
+    for b, fila in enumerate(puntajes):
+        orden = np.argsort(fila, kind="stable")
+        valores = fila[orden]
+        i = 0
+        while i < len(fila):
+            j = i
+            while j + 1 < len(fila) and valores[j + 1] == valores[i]:
+                j += 1
+            salida[b, orden[i:j + 1]] = (i + j) / 2 + 1
+            i = j + 1
+    return salida
+
+# Cola superior de chi² con gl grados de libertad (aproximación de Wilson-Hilferty)
+def _chi2_cola(x, gl):
+    if x <= 0:
+        return 1.0
+    z = ((x / gl) ** (1 / 3) - (1 - 2 / (9 * gl))) / math.sqrt(2 / (9 * gl))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+# Cuantil de la t de Student (expansión de Cornish-Fisher sobre la normal)
+def _cuantil_t(p, gl):
+    z = NormalDist().inv_cdf(p)
+    return z + (z**3 + z) / (4 * gl) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * gl**2)
+
+# --- Devuelve (estadístico de Friedman, valor p, máscara de configuraciones que siguen)
+def prueba_friedman(puntajes, alfa=0.05):
+    R = rangos(puntajes)
+    b, k = R.shape
+    siguen = np.ones(k, dtype=bool)
+    if b < 2 or k < 2:
+        return 0.0, 1.0, siguen
+
+    suma_rangos = R.sum(axis=0)
+    A = np.sum(R**2)
+    C = b * k * (k + 1) ** 2 / 4
+    if A - C <= 0:
+        # Todo empatado en todos los bloques
+        return 0.0, 1.0, siguen
+
+    estadistico = (k - 1) * np.sum((suma_rangos - b * (k + 1) / 2) ** 2) / (A - C)
+    p = _chi2_cola(estadistico, k - 1)
+    if p < alfa:
+        # Post hoc de Conover: se descartan las que quedan a más de la diferencia crítica
+        # de la mejor suma de rangos
+        gl = (b - 1) * (k - 1)
+        diferencia = _cuantil_t(1 - alfa / 2, gl) * math.sqrt(2 * b * (A - np.sum(suma_rangos**2) / b) / gl)
+        siguen = suma_rangos - suma_rangos.min() < diferencia
+    return estadistico, p, siguen
@@ -0,0 +1,130 @@
+import csv
+import glob
+import os
+import time
+
+import numpy as np
+
+_COLUMNAS_PARAMS = ("num_particulas", "w", "c1", "c2")
+
+# --- Registro de todos los ensayos evaluados por un proceso
+#
+# Cada proceso junta filas en memoria y escribe un fragmento .npz propio en `carpeta`
+# (nombre de archivo único por proceso), así no hace falta ningún candado entre procesos.
+# Al final el proceso principal fusiona los fragmentos.
+#
+# Los fragmentos son también el punto de control de la búsqueda (ver punto_control.py):
+# se escriben cuando pasaron `intervalo` segundos desde el último, así el costo de
+# guardar queda acotado sin importar qué tan rápidos sean los ensayos, o antes si se
+# juntan `tamano_lote` filas. La numeración sigue la de los fragmentos que ya estén en
+# la carpeta, así una corrida reanudada no pisa los de la anterior.
+class RegistroEnsayos:
+    def __init__(self, carpeta, id_proceso, tamano_lote=4096, intervalo=10.0):
+        self.carpeta = carpeta
+        self.id_proceso = id_proceso
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self._filas = []
+        self._ultimo = time.monotonic()
+        os.makedirs(carpeta, exist_ok=True)
+        self.num_fragmentos = len(glob.glob(os.path.join(carpeta, f"p{id_proceso:03d}_*.npz")))
+
+    def agregar(self, indice, params, puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo):
+        self._filas.append((indice, params, puntaje, solucion, tiempo, evaluaciones, iteraciones, motivo))
+        if len(self._filas) >= self.tamano_lote or time.monotonic() - self._ultimo >= self.intervalo:
+            self.vaciar()
+
+    def vaciar(self):
+        if not self._filas:
+            return
+        indices, params, puntajes, soluciones, tiempos, evaluaciones, iteraciones, motivos = zip(*self._filas)
+        params = np.asarray(params, dtype=float)
+        columnas = {
+            "indice": np.asarray(indices, dtype=np.int64),
+            "puntaje": np.asarray(puntajes, dtype=float),
+            "solucion": np.asarray(soluciones, dtype=float),
+            "tiempo": np.asarray(tiempos, dtype=float),
+            "evaluaciones": np.asarray(evaluaciones, dtype=np.int64),
+            "iteraciones": np.asarray(iteraciones, dtype=np.int64),
+            "motivo": np.asarray(motivos, dtype=str),
+            "proceso": np.full(len(indices), self.id_proceso, dtype=np.int32),
+        }
+        for j, nombre in enumerate(_COLUMNAS_PARAMS):
+            columnas[nombre] = params[:, j]
+
+        # Se escribe a un temporal y se renombra: un fragmento nunca queda a medias
+        ruta = os.path.join(self.carpeta, f"p{self.id_proceso:03d}_{self.num_fragmentos:05d}.npz")
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            np.savez(archivo, **columnas)
+        os.replace(temporal, ruta)
+        self.num_fragmentos += 1
+        self._filas = []
+        self._ultimo = time.monotonic()
+
+    def cerrar(self):
+        self.vaciar()
+
+# --- Une los fragmentos de todos los procesos en un solo .npz ordenado por índice de ensayo
+# y borra la carpeta de fragmentos. Los metadatos (num_procesos, función, ...) se guardan
+# como columnas escalares.
+def fusionar_registros(carpeta, destino, **metadatos):
+    fragmentos = sorted(glob.glob(os.path.join(carpeta, "*.npz")))
+    columnas = cargar_fragmentos(carpeta)
+    if columnas is None:
+        return None
+
+    for nombre, valor in metadatos.items():
+        columnas["meta_" + nombre] = np.asarray(valor)
+
+    np.savez_compressed(destino, **columnas)
+    for ruta in fragmentos:
+        os.remove(ruta)
+    try:
+        os.rmdir(carpeta)
+    except OSError:
+        # Quedó algún temporal de un proceso que murió a mitad de escritura
+        pass
+    return destino
+
+# --- Columnas de todos los fragmentos que hay en la carpeta, ordenadas por índice de
+# ensayo (None si no hay ninguno). Sirve también a mitad de corrida: los fragmentos se
+# escriben con un renombre atómico, así nunca se lee uno a medias.
+def cargar_fragmentos(carpeta):
+    fragmentos = sorted(glob.glob(os.path.join(carpeta, "*.npz")))
+    if not fragmentos:
+        return None
+
+    partes = []
+    for ruta in fragmentos:
+        with np.load(ruta) as datos:
+            partes.append({nombre: datos[nombre] for nombre in datos.files})
+    columnas = {nombre: np.concatenate([p[nombre] for p in partes]) for nombre in partes[0]}
+    orden = np.argsort(columnas["indice"], kind="stable")
+    return {nombre: valores[orden] for nombre, valores in columnas.items()}
+
+# --- Carga un registro fusionado como diccionario de columnas
+def cargar_ensayos(ruta):
+    with np.load(ruta) as datos:
+        return {nombre: datos[nombre] for nombre in datos.files}
+
+# --- Prepara un CSV acumulativo para agregar filas con `encabezado`. Si el archivo existe
+# con un encabezado más corto (de una versión anterior), lo reescribe con las columnas
+# nuevas al final y vacías en las filas viejas, así los CSV siguen leyéndose con pandas.
+def extender_csv(ruta, encabezado):
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, newline='') as archivo:
+        filas = list(csv.reader(archivo))
+    if not filas or filas[0] == list(encabezado):
+        return
+    if list(encabezado[:len(filas[0])]) != filas[0]:
+        raise ValueError(f"{ruta} tiene otras columnas: {filas[0]}")
+
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, mode='w', newline='') as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow(encabezado)
+        for fila in filas[1:]:
+            writer.writerow(fila + [""] * (len(encabezado) - len(fila)))
+    os.replace(temporal, ruta)
@@ -0,0 +1,64 @@
+import numpy as np
+
+# --- Flujos aleatorios independientes por ensayo
+#
+# Regla: cada ensayo usa su propio Generator, derivado de la semilla raíz y de la clave
+# que identifica al ensayo en su búsqueda (como SeedSequence(semilla).spawn_key). Así el
+# resultado no depende de cuántos procesos hay ni de qué bloque lo tomó, y cualquier
+# ensayo se repite solo con la semilla y su clave, que quedan en el registro de ensayos.
+#
+#   generador_parametros(semilla, parametros)  la clave son los hiperparámetros. La usan
+#       grid y random search (y el broker): sus ensayos no tienen otro orden estable (una
+#       grilla con un valor más, otra muestra) y la caché de ensayos depende de ella.
+#   generador_ensayo(semilla, indice, *claves)  la clave es el índice del ensayo en la
+#       corrida (más repetición, ronda o isla). La usan halving, racing, TPE, islas y el
+#       modo asíncrono, donde la configuración se elige durante la corrida y el índice
+#       es lo que la identifica.
+#
+# Las dos dan flujos independientes para claves distintas; no hay que mezclarlas dentro
+# de una misma búsqueda.
+
+# Semilla raíz de la corrida: la dada o una nueva tomada de la entropía del sistema
+# (hay que imprimirla/guardarla para poder repetir la corrida)
+def semilla_raiz(semilla=None):
+    if semilla is None:
+        semilla = np.random.SeedSequence().entropy
+    return int(semilla)
+
+def generador_ensayo(semilla, indice, *claves):
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(int(indice), *map(int, claves))))
+
+def generadores_ensayos(semilla, indices):
+    return [generador_ensayo(semilla, indice) for indice in indices]
+
+# --- Flujo por hiperparámetros: la clave son los bits (float64) de cada parámetro, así un
+# ensayo tiene el mismo flujo aunque cambie su posición en la lista. Es lo que permite
+# reutilizar sus resultados desde la caché de ensayos (ver cache.py).
+def generador_parametros(semilla, parametros, *claves):
+    bits = np.asarray(parametros, dtype=np.float64).view(np.uint64)
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(*map(int, bits), *map(int, claves))))
+
+def generadores_parametros(semilla, lista_parametros):
+    return [generador_parametros(semilla, parametros) for parametros in lista_parametros]
+
+# --- Números aleatorios comunes (CRN) para comparar configuraciones
+#
+# Se usa en lugar de un Generator: cada sorteo se hace siempre para `max_particulas` filas
+# y se entregan solo las primeras, así la partícula i arranca en el mismo lugar, con la
+# misma velocidad y recibe los mismos r1/r2 en todas las configuraciones que comparten
+# las claves, tenga el enjambre el tamaño que tenga. Cada proceso lo reconstruye con la
+# semilla; los arreglos nunca viajan entre procesos.
+class GeneradorComun:
+    def __init__(self, semilla, max_particulas, *claves):
+        self.rng = generador_ensayo(semilla, *claves)
+        self.max_particulas = max_particulas
+
+    def uniform(self, low, high, size):
+        num_particulas, dimensiones = size
+        return self.rng.uniform(low, high, (self.max_particulas, dimensiones))[:num_particulas]
+
+    def random(self, size=None, out=None):
+        if out is None:
+            return self.uniform(0.0, 1.0, size)
+        out[...] = self.rng.random((self.max_particulas,) + out.shape[1:])[:len(out)]
+        return out
@@ -0,0 +1,83 @@
+from multiprocessing import Lock, shared_memory
+import numpy as np
+
+# --- Empates: con el mismo puntaje gana el ensayo de menor índice, así el mejor reportado
+# no depende de qué proceso publica primero (índice None = sin índice, pierde los empates)
+def es_mejor(puntaje, indice, puntaje_actual, indice_actual):
+    indice = np.inf if indice is None else indice
+    return puntaje < puntaje_actual or (puntaje == puntaje_actual and indice < indice_actual)
+
+# --- Mejor resultado global en memoria compartida (sin proceso Manager)
+#
+# Un solo bloque de float64: [versión, puntaje, índice, parámetros..., solución...]
+# Quien publica toma el candado solo si mejora el puntaje y marca la escritura con la
+# versión (impar mientras escribe, par al terminar). Quien lee no toma el candado:
+# copia el bloque y reintenta si la versión cambió o era impar, así nunca ve un
+# resultado a medio escribir.
+class TableroMejor:
+    def __init__(self, dimensiones, num_parametros=4, lock=None, nombre=None):
+        self.dimensiones = dimensiones
+        self.num_parametros = num_parametros
+        self.lock = lock if lock is not None else Lock()
+        tamano = 8 * (3 + num_parametros + dimensiones)
+        if nombre is None:
+            self._memoria = shared_memory.SharedMemory(create=True, size=tamano)
+            self._creador = True
+        else:
+            self._memoria = shared_memory.SharedMemory(name=nombre)
+            self._creador = False
+        self._datos = np.ndarray((3 + num_parametros + dimensiones,), dtype=np.float64, buffer=self._memoria.buf)
+        if self._creador:
+            self._datos[:] = 0.0
+            self._datos[1] = np.inf
+            self._datos[2] = np.inf
+
+    # Para pasarlo a un Process con "spawn": el hijo se vuelve a conectar al bloque por nombre
+    def __getstate__(self):
+        return (self.dimensiones, self.num_parametros, self.lock, self._memoria.name)
+
+    def __setstate__(self, estado):
+        dimensiones, num_parametros, lock, nombre = estado
+        self.__init__(dimensiones, num_parametros, lock, nombre)
+
+    @property
+    def puntaje(self):
+        return float(self._datos[1])
+
+    def leer(self):
+        while True:
+            version = self._datos[0]
+            copia = self._datos.copy()
+            if version % 2 == 0 and self._datos[0] == version:
+                break
+        k = 3 + self.num_parametros
+        return float(copia[1]), copia[3:k].tolist(), copia[k:].tolist()
+
+    # Devuelve True si el resultado pasó a ser el mejor global; `indice` (el del ensayo)
+    # decide los empates
+    def publicar(self, puntaje, parametros, solucion, indice=None):
+        # Descarte sin candado: la mayoría de las publicaciones no mejoran (los empates se
+        # deciden con el candado tomado)
+        if puntaje > self._datos[1]:
+            return False
+        with self.lock:
+            if not es_mejor(puntaje, indice, self._datos[1], self._datos[2]):
+                return False
+            k = 3 + self.num_parametros
+            self._datos[0] += 1
+            self._datos[1] = puntaje
+            self._datos[2] = np.inf if indice is None else indice
+            self._datos[3:k] = np.asarray(parametros, dtype=np.float64)
+            self._datos[k:] = np.asarray(solucion, dtype=np.float64)
+            self._datos[0] += 1
+        return True
+
+    def cerrar(self):
+        self._datos = None
+        self._memoria.close()
+
+    # Solo el proceso que lo creó debe liberarlo, después de que todos terminaron
+    def liberar(self):
+        self.cerrar()
+        if self._creador:
+            self._memoria.unlink()
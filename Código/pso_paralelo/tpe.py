@@ -0,0 +1,73 @@
+import numpy as np
+
+# --- Búsqueda basada en modelo: TPE (Tree-structured Parzen Estimator)
+#
+# Los ensayos hechos se separan en "buenos" (el mejor `gamma` de los puntajes) y "malos".
+# Cada grupo se modela con un KDE gaussiano l(x) y g(x) en el espacio normalizado [0, 1]^d
+# y se proponen los candidatos que maximizan l(x) / g(x). Cada propuesta del lote sale de
+# su propio grupo de candidatos muestreados de l(x), así el lote no se amontona en un punto.
+#
+#   rangos   {nombre: (mínimo, máximo)}, en el orden de los parámetros de PSO
+#   enteros  nombres que se redondean (p. ej. num_particulas)
+class BuscadorTPE:
+    def __init__(self, rangos, enteros=(), gamma=0.25, candidatos=24, iniciales=10, semilla=None):
+        self.nombres = list(rangos)
+        self.inf = np.array([rangos[n][0] for n in self.nombres], dtype=float)
+        self.sup = np.array([rangos[n][1] for n in self.nombres], dtype=float)
+        self.enteros = np.array([n in enteros for n in self.nombres])
+        self.gamma = gamma
+        self.candidatos = candidatos
+        self.iniciales = iniciales
+        self.rng = np.random.default_rng(semilla)
+        self.X = np.empty((0, len(self.nombres)))
+        self.y = np.empty(0)
+
+    # --- Conversión entre parámetros reales y el cubo [0, 1]^d (redondeando los enteros)
+    def _a_parametros(self, U):
+        P = self.inf + U * (self.sup - self.inf)
+        P[:, self.enteros] = np.round(P[:, self.enteros])
+        return P
+
+    def _a_cubo(self, P):
+        return (np.asarray(P, dtype=float) - self.inf) / (self.sup - self.inf)
+
+    # --- KDE con ancho de banda de Scott por dimensión y un componente uniforme como prior
+    def _ancho(self, centros):
+        n, d = centros.shape
+        sigma = centros.std(axis=0) * n ** (-1.0 / (d + 4)) if n > 1 else np.full(d, 0.25)
+        return np.clip(sigma, 0.05, 0.5)
+
+    def _log_densidad(self, U, centros):
+        sigma = self._ancho(centros)
+        z = (U[:, None, :] - centros[None, :, :]) / sigma
+        log_comp = -0.5 * np.sum(z**2, axis=2) - np.sum(np.log(sigma * np.sqrt(2 * np.pi)))
+        n = len(centros)
+        # Mezcla: n gaussianas + 1 uniforme (densidad 1 en el cubo), todas con el mismo peso
+        log_mezcla = np.logaddexp(np.logaddexp.reduce(log_comp, axis=1), 0.0)
+        return log_mezcla - np.log(n + 1)
+
+    def _muestrear(self, centros, n):
+        sigma = self._ancho(centros)
+        U = centros[self.rng.integers(len(centros), size=n)] + self.rng.normal(size=(n, centros.shape[1])) * sigma
+        return np.clip(U, 0.0, 1.0)
+
+    # --- Propone un lote de n combinaciones [num_particulas, w, c1, c2]
+    def proponer(self, n):
+        if len(self.y) < self.iniciales:
+            return self._a_parametros(self.rng.random((n, len(self.nombres)))).tolist()
+
+        orden = np.argsort(self.y)
+        num_buenos = max(1, int(np.ceil(self.gamma * len(self.y))))
+        buenos = self.X[orden[:num_buenos]]
+        malos = self.X[orden[num_buenos:]]
+
+        lote = []
+        for _ in range(n):
+            U = self._a_cubo(self._a_parametros(self._muestrear(buenos, self.candidatos)))
+            puntaje = self._log_densidad(U, buenos) - self._log_densidad(U, malos)
+            lote.append(U[np.argmax(puntaje)])
+        return self._a_parametros(np.array(lote)).tolist()
+
+    def registrar(self, parametros, puntajes):
+        self.X = np.vstack([self.X, self._a_cubo(parametros)])
+        self.y = np.concatenate([self.y, np.asarray(puntajes, dtype=float)])
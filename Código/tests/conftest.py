@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los scripts importan pso_paralelo desde la carpeta Código
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
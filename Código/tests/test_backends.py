@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Función 3 Restricciones"))
+from grid_restriccion_funcion3 import ejecutar_pso, funcion_objetivo_con_restricciones
+from pso_paralelo.jit import NUMBA_DISPONIBLE, preparar_backend
+from pso_paralelo.motor import ejecutar_pso_multiconfig
+from pso_paralelo.parada import CriteriosParada
+from pso_paralelo.semillas import generadores_parametros
+
+LIMITES_INF = [78, 33, 27, 27, 27]
+LIMITES_SUP = [102, 45, 45, 45, 45]
+COMBINACIONES = [(10, 0.5, 1.5, 1.5), (30, 0.9, 2.0, 1.0), (20, 0.7, 1.0, 2.5)]
+PARADAS = [None, CriteriosParada(tol_diametro=1e-6, ventana_estancamiento=30)]
+
+def _secuencial(backend, parada):
+    return [ejecutar_pso(funcion_objetivo_con_restricciones, LIMITES_INF, LIMITES_SUP, 5, params, max_iteraciones=200,
+                         parada=parada, rng=rng, backend=backend)
+            for params, rng in zip(COMBINACIONES, generadores_parametros(3, COMBINACIONES))]
+
+def _iguales(resultados, otros):
+    for (puntaje, solucion, motivo, iteraciones), (puntaje_b, solucion_b, motivo_b, iteraciones_b) in zip(resultados, otros):
+        assert puntaje == puntaje_b
+        assert np.array_equal(solucion, solucion_b)
+        assert (motivo, iteraciones) == (motivo_b, iteraciones_b)
+
+# Con la misma semilla el motor multiconfiguración da bit a bit lo mismo que ejecutar_pso
+@pytest.mark.parametrize("parada", PARADAS)
+def test_multiconfig_igual_a_secuencial(parada):
+    multiconfig = ejecutar_pso_multiconfig(funcion_objetivo_con_restricciones.lote, LIMITES_INF, LIMITES_SUP, 5, COMBINACIONES,
+                                           max_iteraciones=200, parada=parada, generadores=generadores_parametros(3, COMBINACIONES))
+    _iguales(_secuencial("numpy", parada), zip(*multiconfig))
+
+@pytest.mark.skipif(not NUMBA_DISPONIBLE, reason="Numba no está instalado")
+@pytest.mark.parametrize("parada", PARADAS)
+def test_numba_igual_a_numpy(parada):
+    _iguales(_secuencial("numpy", parada), _secuencial("numba", parada))
+
+# Cada script en su propio intérprete, como al correrlos uno tras otro: el ciclo compilado
+# para la función de un script no puede dejar en disco nada que otro script no pueda cargar
+_CORRER_NUMBA = """
+import sys
+sys.path[:0] = [{codigo!r}, {carpeta!r}]
+from {modulo} import {funcion} as funcion
+from pso_paralelo.jit import preparar_backend
+assert preparar_backend("numba", funcion, {dimensiones}) == "numba"
+"""
+
+@pytest.mark.skipif(not NUMBA_DISPONIBLE, reason="Numba no está instalado")
+def test_numba_en_scripts_distintos():
+    codigo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    for carpeta, modulo, funcion, dimensiones in [("Función 3 Restricciones", "grid_restriccion_funcion3", "funcion_objetivo_con_restricciones", 5),
+                                                   ("Funcion sin restricciones", "random_basic", "funcion_objetivo", 2),
+                                                   ("Función 1 Restricciones", "grid_restriccion_funcion1", "funcion_objetivo_con_restriccion", 2)]:
+        programa = _CORRER_NUMBA.format(codigo=codigo, carpeta=os.path.join(codigo, carpeta), modulo=modulo, funcion=funcion, dimensiones=dimensiones)
+        salida = subprocess.run([sys.executable, "-c", programa], capture_output=True, text=True)
+        assert salida.returncode == 0, salida.stderr
+        assert "se usa el backend numpy" not in salida.stdout
+
+# Si no compila, la búsqueda sigue con numpy en vez de caerse
+def test_numba_sin_compilar_usa_numpy():
+    def funcion(x):
+        return float(np.sum(x ** 2))
+    funcion.jit = lambda x: float(np.sum(x ** 2))
+    assert preparar_backend("numba", funcion, 2) == "numpy"
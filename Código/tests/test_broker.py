@@ -0,0 +1,70 @@
+from multiprocessing import Process
+from functools import partial
+import socket
+import threading
+import time
+import os
+
+import pytest
+
+from pso_paralelo.broker import coordinar, trabajar, resolver_clave
+
+CLAVE = b"prueba"
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _doble(x):
+    return 2 * x
+
+# Toma una tarea y se cuelga: avisa con un archivo para que la prueba lo mate
+def _colgarse(aviso, x):
+    with open(aviso, "w") as archivo:
+        archivo.write(str(x))
+    time.sleep(60)
+
+def _trabajador(funcion, nombre, puerto):
+    trabajar(funcion, nombre, CLAVE, "127.0.0.1", puerto, plazo=1.0, espera=0.02)
+
+def test_tarea_de_trabajador_caido_se_reencola(tmp_path):
+    puerto = _puerto_libre()
+    tareas = list(range(8))
+    salida = {}
+    hilo = threading.Thread(target=lambda: salida.update(zip(("resultados", "resumen"), coordinar(tareas, CLAVE, "127.0.0.1", puerto, plazo=1.0))))
+    hilo.start()
+
+    aviso = str(tmp_path / "tomada")
+    caido = Process(target=_trabajador, args=(partial(_colgarse, aviso), "caido", puerto))
+    caido.start()
+    limite = time.time() + 20
+    while not os.path.exists(aviso) and time.time() < limite:
+        time.sleep(0.02)
+    tomada = int(open(aviso).read())
+    caido.kill()
+    caido.join()
+
+    vivo = Process(target=_trabajador, args=(_doble, "vivo", puerto))
+    vivo.start()
+    hilo.join(60)
+    vivo.join(10)
+    assert not hilo.is_alive()
+
+    assert salida["resultados"] == [2 * x for x in tareas]
+    resumen = salida["resumen"]
+    assert resumen.pop("reencoladas") == 1
+    # Todo lo entregó el trabajador vivo, incluida la tarea que tenía el caído
+    assert resumen == {"vivo": len(tareas)}
+    assert salida["resultados"][tomada] == 2 * tomada
+
+def test_clave(monkeypatch):
+    monkeypatch.delenv("PSO_CLAVE", raising=False)
+    assert resolver_clave("abc", "10.0.0.1") == b"abc"
+    assert len(resolver_clave(None, "127.0.0.1")) == 32
+    with pytest.raises(ValueError):
+        resolver_clave(None, "10.0.0.1")
+    with pytest.raises(ValueError):
+        resolver_clave(None, "127.0.0.1", generar=False)
+    monkeypatch.setenv("PSO_CLAVE", "xyz")
+    assert resolver_clave(None, "10.0.0.1") == b"xyz"
@@ -0,0 +1,69 @@
+import numpy as np
+
+from pso_paralelo.cache import CacheEnsayos, identificador_objetivo
+from pso_paralelo.parada import CriteriosParada
+from pso_paralelo.registro import RegistroEnsayos, fusionar_registros
+from pso_paralelo.tablero import TableroMejor
+
+def esfera(x):
+    return np.sum(x ** 2, axis=1)
+
+def otra(x):
+    return np.sum(np.abs(x), axis=1)
+
+LIMITES = [(-5, 5), (-5, 5)]
+COMBINACIONES = [(10, 0.5, 1.0, 1.0), (20, 0.5, 1.0, 1.0), (10, 0.7, 1.0, 1.0), (20, 0.7, 1.0, 1.0)]
+
+def _guardar(cache, carpeta, indices, puntajes):
+    registro = RegistroEnsayos(str(carpeta), 0)
+    for i, puntaje in zip(indices, puntajes):
+        registro.agregar(i, COMBINACIONES[i], puntaje, [0.0, float(i)], 1.0, 100, 9, "max_iteraciones")
+    registro.cerrar()
+    cache.guardar(fusionar_registros(str(carpeta), str(carpeta) + ".npz"))
+
+def test_identificador():
+    base = identificador_objetivo(esfera, LIMITES)
+    assert base == identificador_objetivo(esfera, LIMITES, None, "numpy", "multiconfig")
+    distintos = {
+        identificador_objetivo(otra, LIMITES),
+        identificador_objetivo(esfera, [(-5, 5), (-5, 6)]),
+        identificador_objetivo(esfera, LIMITES, CriteriosParada(tol_diametro=1e-10)),
+        identificador_objetivo(esfera, LIMITES, backend="numba", motor="secuencial"),
+        identificador_objetivo(esfera, LIMITES, motor="secuencial"),
+    }
+    assert base not in distintos and len(distintos) == 5
+
+def test_aciertos_y_fallos(tmp_path):
+    objetivo = identificador_objetivo(esfera, LIMITES)
+    cache = CacheEnsayos(str(tmp_path / "cache.sqlite"), objetivo, 7, 50)
+    _guardar(cache, tmp_path / "a", [0, 2], [3.0, 1.0])
+    assert cache.guardados == 2
+
+    # En otra posición de la lista el ensayo se encuentra igual: la clave son los parámetros
+    encontrados = cache.buscar(COMBINACIONES[::-1], [0, 1, 2, 3])
+    assert sorted(encontrados) == [1, 3]
+    assert encontrados[3][0] == 3.0 and list(encontrados[3][1]) == [0.0, 0.0]
+    assert (cache.aciertos, cache.fallos) == (2, 2)
+
+    # Otra semilla, otro presupuesto u otro backend no comparten ensayos
+    for otra_cache in (CacheEnsayos(str(tmp_path / "cache.sqlite"), objetivo, 8, 50),
+                       CacheEnsayos(str(tmp_path / "cache.sqlite"), objetivo, 7, 500),
+                       CacheEnsayos(str(tmp_path / "cache.sqlite"), identificador_objetivo(esfera, LIMITES, backend="numba", motor="secuencial"), 7, 50)):
+        assert otra_cache.buscar(COMBINACIONES, [0, 1, 2, 3]) == {}
+        otra_cache.cerrar()
+    cache.cerrar()
+
+def test_aplicar_publica_el_mejor(tmp_path):
+    cache = CacheEnsayos(str(tmp_path / "cache.sqlite"), identificador_objetivo(esfera, LIMITES), 7, 50)
+    # Dos ensayos empatados: gana el de menor índice
+    _guardar(cache, tmp_path / "a", [1, 2, 3], [1.0, 5.0, 1.0])
+    tablero = TableroMejor(2)
+    try:
+        grupos = cache.aplicar(COMBINACIONES, [[0, 1], [2, 3]], tablero, str(tmp_path / "b"), 0)
+        assert grupos == [[0], []]
+        puntaje, parametros, solucion = tablero.leer()
+        assert (puntaje, solucion) == (1.0, [0.0, 1.0])
+        assert parametros == list(map(float, COMBINACIONES[1]))
+    finally:
+        tablero.liberar()
+        cache.cerrar()
@@ -0,0 +1,29 @@
+import numpy as np
+
+from pso_paralelo.islas import recibir_migrantes, vecinas
+from pso_paralelo.motor import EnjambresMulticonfig
+
+def esfera(x):
+    return np.sum(x ** 2, axis=1)
+
+def test_vecinas():
+    assert vecinas(0, 4, "anillo") == [3]
+    assert vecinas(2, 4, "completa") == [0, 1, 3]
+    assert vecinas(0, 1, "anillo") == []
+
+def test_migrante_atrae_al_enjambre():
+    # w = c1 = 0: la velocidad depende solo del mejor global
+    enjambres = EnjambresMulticonfig(esfera, [-5, -5], [5, 5], 2, [(8, 0.0, 0.0, 1.0)], generadores=[np.random.default_rng(4)])
+    migrante = np.array([3.0, -4.0])
+    recibir_migrantes(enjambres, migrante[None], np.array([-1.0]))
+    assert enjambres.puntaje_global[0] == -1.0
+    assert np.array_equal(enjambres.mejor_global[0], migrante)
+    assert np.array_equal(enjambres.atractor[0], np.broadcast_to(migrante, (8, 2)))
+
+    antes = enjambres.posiciones[0].copy()
+    enjambres.avanzar(1)
+    # Todas las partículas se movieron hacia el migrante y ninguna lo pasó
+    hacia = migrante - antes
+    assert np.all(enjambres.velocidades[0] * hacia >= 0)
+    assert np.all(np.abs(enjambres.posiciones[0] - migrante) <= np.abs(hacia))
+    assert np.linalg.norm(enjambres.posiciones[0] - migrante, axis=1).sum() < np.linalg.norm(hacia, axis=1).sum()
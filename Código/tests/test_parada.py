@@ -0,0 +1,39 @@
+import numpy as np
+
+from pso_paralelo.parada import CriteriosParada
+
+def _posiciones(*anchos):
+    # Un enjambre de 3 partículas en 2 dimensiones por cada ancho
+    return np.array([[[0.0, 0.0], [a, 0.0], [0.0, a]] for a in anchos])
+
+def test_sin_criterios_no_para():
+    seguimiento = CriteriosParada().seguimiento(np.array([1.0, 2.0]))
+    assert list(seguimiento.revisar(np.array([1.0, 2.0]), _posiciones(1.0, 1.0))) == ["", ""]
+
+def test_objetivo():
+    seguimiento = CriteriosParada(valor_objetivo=1e-12).seguimiento(np.array([1.0, 1.0]))
+    motivos = seguimiento.revisar(np.array([0.0, 0.5]), _posiciones(1.0, 1.0))
+    assert list(motivos) == ["objetivo", ""]
+
+def test_diametro_ignora_relleno():
+    seguimiento = CriteriosParada(tol_diametro=1e-6).seguimiento(np.array([1.0, 1.0]))
+    posiciones = _posiciones(1e-9, 1e-9)
+    posiciones[1, 2] = [5.0, 5.0]
+    assert list(seguimiento.revisar(np.array([1.0, 1.0]), posiciones)) == ["diametro", ""]
+    mascara = np.array([[True, True, True], [True, True, False]])
+    assert list(seguimiento.revisar(np.array([1.0, 1.0]), posiciones, mascara)) == ["diametro", "diametro"]
+
+def test_estancamiento():
+    seguimiento = CriteriosParada(ventana_estancamiento=3, tol_estancamiento=0.1).seguimiento(np.array([10.0, 10.0]))
+    posiciones = _posiciones(1.0, 1.0)
+    # El primero mejora menos que la tolerancia; el segundo mejora cada vez
+    for k, esperado in enumerate(["", "", "estancamiento"]):
+        motivos = seguimiento.revisar(np.array([9.95, 9.0 - k]), posiciones)
+        assert list(motivos) == [esperado, ""]
+    seguimiento.filtrar(np.array([False, True]))
+    assert list(seguimiento.revisar(np.array([5.0]), _posiciones(1.0))) == [""]
+
+def test_objetivo_tiene_prioridad():
+    criterios = CriteriosParada(valor_objetivo=0.0, tol_diametro=1e-6, ventana_estancamiento=1)
+    seguimiento = criterios.seguimiento(np.array([0.0]))
+    assert list(seguimiento.revisar(np.array([0.0]), _posiciones(0.0))) == ["objetivo"]
@@ -0,0 +1,42 @@
+import numpy as np
+
+from pso_paralelo.planificador import ColaTareas, bloques_guiados
+
+def _indices(bloques):
+    return sorted(i for bloque in bloques for i in bloque)
+
+def test_bloques_cubren_todo_una_vez():
+    rng = np.random.default_rng(0)
+    for n in [1, 2, 7, 50, 333]:
+        costos = rng.exponential(1.0, n)
+        for num_procesos in [1, 3, 16]:
+            for bloque_min in [1, 4]:
+                bloques = bloques_guiados(costos, num_procesos, bloque_min=bloque_min)
+                assert _indices(bloques) == list(range(n))
+                assert all(len(bloque) >= bloque_min for bloque in bloques[:-1])
+
+def test_bloques_sin_costos():
+    assert bloques_guiados([], 4) == []
+    bloques = bloques_guiados([1] * 100, 4)
+    # Sin costos se conserva el orden y los bloques se achican
+    assert [i for bloque in bloques for i in bloque] == list(range(100))
+    tamanos = [len(bloque) for bloque in bloques]
+    assert tamanos[0] > tamanos[-1] and tamanos == sorted(tamanos, reverse=True)
+
+def test_bloques_caros_primero():
+    costos = [1, 50, 3, 20, 2, 8]
+    bloques = bloques_guiados(costos, 2)
+    orden = [i for bloque in bloques for i in bloque]
+    assert [costos[i] for i in orden] == sorted(costos, reverse=True)
+
+def test_encolar_solo_indices():
+    cola = ColaTareas(3)
+    tareas = [f"t{i}" for i in range(20)]
+    faltan = [1, 4, 5, 11, 19]
+    cola.encolar(tareas, costos=np.arange(20.0), indices=faltan)
+    cola.cerrar()
+    vistos = []
+    for indices, bloque in cola.bloques(0):
+        assert bloque == [tareas[i] for i in indices]
+        vistos.extend(indices)
+    assert sorted(vistos) == faltan
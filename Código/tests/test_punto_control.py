@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from pso_paralelo.motor import ejecutar_pso_multiconfig
+from pso_paralelo.parada import CriteriosParada
+from pso_paralelo.punto_control import PuntoControl, leer_semilla
+from pso_paralelo.registro import RegistroEnsayos
+from pso_paralelo.semillas import generadores_parametros
+from pso_paralelo.tablero import TableroMejor
+
+def esfera(x):
+    return np.sum(x ** 2, axis=1)
+
+SEMILLA = 11
+COMBINACIONES = [(10, 0.5, 1.5, 1.5), (25, 0.7, 1.0, 2.0), (15, 0.9, 2.0, 1.0), (30, 0.4, 1.5, 1.5)]
+PARADA = CriteriosParada(ventana_estancamiento=15, tol_estancamiento=1e-12)
+
+class Interrupcion(Exception):
+    pass
+
+def _correr(combinaciones, **argumentos):
+    return ejecutar_pso_multiconfig(esfera, [-5, -5, -5], [5, 5, 5], 3, combinaciones, max_iteraciones=120, parada=PARADA,
+                                    generadores=generadores_parametros(SEMILLA, combinaciones), **argumentos)
+
+def test_reanudar_da_lo_mismo(tmp_path):
+    carpeta = str(tmp_path / "ensayos")
+    completo = _correr(COMBINACIONES)
+
+    # Primera corrida: el ensayo 0 ya terminó y quedó en un fragmento; el bloque con los
+    # otros tres se corta después de guardar su estado a mitad de camino
+    registro = RegistroEnsayos(carpeta, 0, tamano_lote=1)
+    registro.agregar(0, COMBINACIONES[0], float(completo[0][0]), completo[1][0], 0.1, 100, 120, completo[2][0])
+    control = PuntoControl(carpeta, SEMILLA, intervalo=0.0, paso=20)
+    argumentos = control.bloque(0, [1, 2, 3])
+    guardar = argumentos["guardar"]
+    def guardar_y_cortar(enjambres):
+        guardar(enjambres)
+        if enjambres.iteraciones.max() >= 40:
+            raise Interrupcion()
+    argumentos["guardar"] = guardar_y_cortar
+    with pytest.raises(Interrupcion):
+        _correr(COMBINACIONES[1:], **argumentos)
+
+    # Reanudación sobre la misma carpeta
+    control = PuntoControl(carpeta, None)
+    assert leer_semilla(carpeta) == SEMILLA
+    assert control.num_hechos == 1
+    pendientes = [i for grupo in control.pendientes(len(COMBINACIONES)) for i in grupo]
+    assert sorted(pendientes) == [1, 2, 3]
+    assert all(control.filas[i]["iteraciones"] == 40 or control.filas[i]["estado"] is None for i in pendientes)
+
+    tablero = TableroMejor(3)
+    try:
+        assert control.publicar_mejor(tablero) == 1
+        assert tablero.puntaje == completo[0][0]
+    finally:
+        tablero.liberar()
+
+    argumentos = control.bloque(0, [1, 2, 3])
+    assert "instantanea" in argumentos
+    reanudado = _correr(COMBINACIONES[1:], **argumentos)
+    assert np.array_equal(reanudado[0], completo[0][1:])
+    assert np.array_equal(reanudado[1], completo[1][1:])
+    assert list(reanudado[2]) == list(completo[2][1:])
+    assert np.array_equal(reanudado[3], completo[3][1:])
@@ -0,0 +1,53 @@
+import csv
+import os
+
+import numpy as np
+
+from pso_paralelo.registro import RegistroEnsayos, cargar_ensayos, cargar_fragmentos, extender_csv, fusionar_registros
+
+def _agregar(registro, indice):
+    registro.agregar(indice, (10 + indice, 0.5, 1.0, 2.0), float(-indice), [float(indice), 0.0], 0.1, 100, 9, "max_iteraciones")
+
+def test_fusion_ordenada_por_indice(tmp_path):
+    carpeta = str(tmp_path / "ensayos")
+    # Dos procesos con lotes chicos: varios fragmentos por proceso, índices intercalados
+    registros = [RegistroEnsayos(carpeta, n, tamano_lote=3) for n in range(2)]
+    for i in range(11):
+        _agregar(registros[i % 2], i)
+    for registro in registros:
+        registro.cerrar()
+    assert len(os.listdir(carpeta)) == 4
+
+    destino = fusionar_registros(carpeta, str(tmp_path / "ensayos.npz"), num_procesos=2, funcion="prueba")
+    datos = cargar_ensayos(destino)
+    assert datos["indice"].tolist() == list(range(11))
+    assert datos["proceso"].tolist() == [i % 2 for i in range(11)]
+    assert datos["num_particulas"].tolist() == [10.0 + i for i in range(11)]
+    assert np.array_equal(datos["solucion"][:, 0], np.arange(11.0))
+    assert datos["motivo"][0] == "max_iteraciones"
+    assert int(datos["meta_num_procesos"]) == 2 and str(datos["meta_funcion"]) == "prueba"
+    assert not os.path.exists(carpeta)
+
+def test_vaciado_parcial_y_numeracion(tmp_path):
+    carpeta = str(tmp_path / "ensayos")
+    registro = RegistroEnsayos(carpeta, 0, tamano_lote=4, intervalo=1e9)
+    for i in range(6):
+        _agregar(registro, i)
+    # Solo el primer lote llegó al disco; el resto sigue en memoria
+    assert cargar_fragmentos(carpeta)["indice"].tolist() == [0, 1, 2, 3]
+
+    # Un registro nuevo del mismo proceso (corrida reanudada) no pisa los fragmentos
+    otro = RegistroEnsayos(carpeta, 0)
+    assert otro.num_fragmentos == 1
+    _agregar(otro, 4)
+    otro.cerrar()
+    assert cargar_fragmentos(carpeta)["indice"].tolist() == [0, 1, 2, 3, 4]
+    assert cargar_fragmentos(str(tmp_path / "vacia")) is None
+
+def test_extender_csv(tmp_path):
+    ruta = str(tmp_path / "resultados.csv")
+    with open(ruta, mode='w', newline='') as archivo:
+        csv.writer(archivo).writerows([["a", "b"], ["1", "2"]])
+    extender_csv(ruta, ["a", "b", "c"])
+    with open(ruta, newline='') as archivo:
+        assert list(csv.reader(archivo)) == [["a", "b", "c"], ["1", "2", ""]]
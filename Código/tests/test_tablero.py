@@ -0,0 +1,56 @@
+from multiprocessing import Process
+
+from pso_paralelo.tablero import TableroMejor, es_mejor
+from pso_paralelo.mpi import TableroMPI, _menor
+
+def _publicar_varios(tablero, base):
+    for k in range(200):
+        tablero.publicar(float(base - k), [base, k, 0.0, 0.0], [float(base - k)] * tablero.dimensiones, base * 1000 + k)
+
+def test_publicar_y_leer():
+    tablero = TableroMejor(3)
+    try:
+        assert tablero.publicar(5.0, [10, 0.5, 1.0, 2.0], [1.0, 2.0, 3.0], 7)
+        assert not tablero.publicar(6.0, [20, 0.5, 1.0, 2.0], [0.0, 0.0, 0.0], 1)
+        assert tablero.leer() == (5.0, [10.0, 0.5, 1.0, 2.0], [1.0, 2.0, 3.0])
+    finally:
+        tablero.liberar()
+
+def test_lectura_consistente_entre_procesos():
+    tablero = TableroMejor(2)
+    try:
+        procesos = [Process(target=_publicar_varios, args=(tablero, base)) for base in (300, 500, 400)]
+        for proceso in procesos:
+            proceso.start()
+        for _ in range(500):
+            puntaje, parametros, solucion = tablero.leer()
+            # Nunca una escritura a medias: la solución corresponde siempre al puntaje leído
+            assert solucion == [puntaje] * 2 or puntaje == float("inf")
+        for proceso in procesos:
+            proceso.join()
+        assert tablero.leer() == (101.0, [300.0, 199.0, 0.0, 0.0], [101.0, 101.0])
+    finally:
+        tablero.liberar()
+
+def test_empate_gana_menor_indice():
+    assert es_mejor(1.0, 3, 1.0, 5)
+    assert not es_mejor(1.0, 5, 1.0, 3)
+    assert not es_mejor(1.0, None, 1.0, 3)
+    tablero = TableroMejor(1)
+    try:
+        # El orden de publicación no importa
+        tablero.publicar(-1.0, [1, 0, 0, 0], [0.0], 9)
+        assert tablero.publicar(-1.0, [2, 0, 0, 0], [0.0], 4)
+        assert not tablero.publicar(-1.0, [3, 0, 0, 0], [0.0], 6)
+        assert tablero.leer()[1][0] == 2.0
+    finally:
+        tablero.liberar()
+
+def test_empate_en_mpi():
+    tablero = TableroMPI(None, 1)
+    tablero.publicar(-1.0, [1, 0, 0, 0], [0.0], 9)
+    assert tablero.publicar(-1.0, [2, 0, 0, 0], [0.0], 4)
+    a = (-1.0, [1], [0.0], 9)
+    b = (-1.0, [2], [0.0], 4)
+    assert _menor(a, b) is b and _menor(b, a) is b
+    assert _menor((-2.0, [1], [0.0], 9), b)[0] == -2.0